@@ -0,0 +1,57 @@
+"""Measures reading and writing ComicInfo.xml
+
+Usage: python benchmarks/comicinfo_benchmark.py [ComicInfo.xml files, archives or folders of them]
+
+Without arguments a ComicInfo.xml is generated from the test metadata.
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import timeit
+
+from comicapi.comicarchive import ComicArchive
+from comicapi.comicinfoxml import ComicInfoXml
+from comicapi.genericmetadata import md_test
+
+
+def load_corpus(paths: list[str]) -> list[bytes]:
+    corpus = []
+    for path in paths:
+        files = sorted(pathlib.Path(path).rglob("*")) if pathlib.Path(path).is_dir() else [pathlib.Path(path)]
+        for file in files:
+            if file.name.casefold() == "comicinfo.xml":
+                corpus.append(file.read_bytes())
+            elif file.is_file():
+                ca = ComicArchive(file)
+                if ca.seems_to_be_a_comic_archive():
+                    raw_cix = ca.read_raw_cix()
+                    if raw_cix:
+                        corpus.append(raw_cix)
+    return corpus
+
+
+def main() -> None:
+    corpus = load_corpus(sys.argv[1:])
+    if not corpus:
+        md = md_test.copy()
+        md.pages = []
+        md.set_default_page_list(40)
+        corpus = [ComicInfoXml().string_from_metadata(md).encode("utf-8")] * 100
+    metadata = [ComicInfoXml().metadata_from_string(raw_cix) for raw_cix in corpus]
+
+    def read() -> None:
+        for raw_cix in corpus:
+            ComicInfoXml().metadata_from_string(raw_cix)
+
+    def write() -> None:
+        for md, raw_cix in zip(metadata, corpus):
+            ComicInfoXml().string_from_metadata(md, raw_cix)
+
+    for name, func in (("read", read), ("write", write)):
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        sys.stdout.write(f"{seconds / len(corpus) * 1e6:8.1f} µs/file  {name} ({len(corpus)} files)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Measures the throughput of parsing filenames with the lexer and parser
+
+Usage: python benchmarks/filename_benchmark.py [number of filenames] [workers]
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import time
+
+from comicapi.filenameparser import parse_filenames
+from testing.filenames import names
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    filenames = [name[0] for name in names]
+
+    for workers in sorted({1, max_workers}):
+        start = time.perf_counter()
+        for _ in parse_filenames(itertools.islice(itertools.cycle(filenames), count), workers=workers):
+            pass
+        seconds = time.perf_counter() - start
+        sys.stdout.write(f"{count / seconds:10.0f} filenames/s  {workers} workers\n")
+
+
+if __name__ == "__main__":
+    main()
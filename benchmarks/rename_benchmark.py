@@ -0,0 +1,45 @@
+"""Measures the cost of FileRenamer.determine_name per file
+
+Usage: python benchmarks/rename_benchmark.py [number of files]
+"""
+from __future__ import annotations
+
+import copy
+import sys
+import timeit
+
+from comicapi.genericmetadata import md_test
+from comictaggerlib.filerenamer import FileRenamer
+
+templates = [
+    "{series} #{issue} ({year})",
+    "{publisher}/{series}/{series} v{volume} #{issue} (of {issue_count}) ({year})",
+    "{series!t} {issue:0>3} - {title} ({month_name} {year}) [{writer}]",
+]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    # every file gets a different name, the series and creators are shared like they would be in a library
+    metadata = []
+    for i in range(count):
+        md = copy.copy(md_test)
+        md.issue = str(i)
+        metadata.append(md)
+
+    for template in templates:
+        renamer = FileRenamer(None, platform="universal")
+        renamer.set_template(template)
+        renamer.move = True
+
+        def rename() -> None:
+            for i in range(count):
+                renamer.set_metadata(metadata[i])
+                renamer.determine_name(".cbz")
+
+        seconds = min(timeit.repeat(rename, number=1, repeat=3))
+        sys.stdout.write(f"{seconds / count * 1e6:8.1f} µs/file  {template}\n")
+
+
+if __name__ == "__main__":
+    main()
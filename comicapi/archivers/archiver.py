@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import io
 import pathlib
-from typing import Protocol, runtime_checkable
+from collections.abc import Iterable, Iterator
+from typing import IO, Protocol, runtime_checkable
 
 
 @runtime_checkable
@@ -25,6 +27,13 @@ class Archiver(Protocol):
     """
     enabled: bool = True
 
+    """
+    Signatures found at the start of archives this archiver can open eg (b"PK\x03\x04",).
+    is_valid is only called for files that start with one of these, or when no archiver recognises the file.
+    If empty is_valid is always called, this should be empty if the format has no signature.
+    """
+    magic: tuple[bytes, ...] = ()
+
     def __init__(self) -> None:
         self.path = pathlib.Path()
 
@@ -57,6 +66,34 @@ class Archiver(Protocol):
         """
         raise NotImplementedError
 
+    def read_files(self, archive_files: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+        """
+        Reads the named files from the current archive, yields (filename, data) in the order given.
+        archive_files should always come from the output of get_filename_list.
+        Archivers that can read many files at once more efficiently than with read_file should override this.
+        Exceptions should be of the type OSError.
+        """
+        for archive_file in archive_files:
+            yield archive_file, self.read_file(archive_file)
+
+    def open_member(self, archive_file: str) -> IO[bytes]:
+        """
+        Opens the named file from the current archive for reading as a binary file object, it should be closed after use.
+        archive_file should always come from the output of get_filename_list.
+        Archivers that can read part of a file without reading all of it should override this.
+        Exceptions should be of the type OSError.
+        """
+        return io.BytesIO(self.read_file(archive_file))
+
+    def read_file_prefix(self, archive_file: str, size: int) -> bytes:
+        """
+        Reads at most size bytes from the start of the named file, useful for headers and magic numbers.
+        archive_file should always come from the output of get_filename_list.
+        Exceptions should be of the type OSError.
+        """
+        with self.open_member(archive_file) as f:
+            return f.read(size)
+
     def remove_file(self, archive_file: str) -> bool:
         """
         Removes the named file from the current archive.
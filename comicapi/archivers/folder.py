@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import os
 import pathlib
+from typing import IO
 
 from comicapi.archivers import Archiver
 
@@ -38,6 +39,13 @@ class FolderArchiver(Archiver):
 
         return data
 
+    def open_member(self, archive_file: str) -> IO[bytes]:
+        try:
+            return open(self.path / archive_file, mode="rb")
+        except OSError as e:
+            logger.error("Error reading folder archive [%s]: %s :: %s", e, self.path, archive_file)
+            raise
+
     def remove_file(self, archive_file: str) -> bool:
         try:
             (self.path / archive_file).unlink(missing_ok=True)
@@ -8,6 +8,7 @@ import shutil
 import subprocess
 import tempfile
 import time
+from collections.abc import Iterable, Iterator
 
 from comicapi.archivers import Archiver
 
@@ -30,6 +31,8 @@ class RarArchiver(Archiver):
 
     enabled = rar_support
     exe = "rar"
+    # RAR 1.5-4.x and RAR 5
+    magic = (b"Rar!\x1a\x07\x00", b"Rar!\x1a\x07\x01\x00")
 
     def __init__(self) -> None:
         super().__init__()
@@ -41,6 +44,10 @@ class RarArchiver(Archiver):
         else:
             self.startupinfo = None
 
+        # The parsed archive is kept until the file changes
+        self._rar_obj: rarfile.RarFile | None = None
+        self._rar_key: tuple[str, int, int] | None = None
+
     def get_comment(self) -> str:
         rarc = self.get_rar_obj()
         return (rarc.comment if rarc else "") or ""
@@ -73,6 +80,7 @@ class RarArchiver(Archiver):
                         check=True,
                     )
 
+                self._reset_rar_obj()
                 if platform.system() == "Darwin":
                     time.sleep(1)
             except (subprocess.CalledProcessError, OSError) as e:
@@ -84,12 +92,11 @@ class RarArchiver(Archiver):
             return False
 
     def read_file(self, archive_file: str) -> bytes:
-        rarc = self.get_rar_obj()
-        if rarc is None:
-            return b""
-
         tries = 0
         while tries < 7:
+            rarc = self.get_rar_obj()
+            if rarc is None:
+                return b""
             try:
                 tries = tries + 1
                 data: bytes = rarc.open(archive_file).read()
@@ -106,8 +113,12 @@ class RarArchiver(Archiver):
                     )
                     continue
 
+            except rarfile.NoRarEntry:
+                # Missing members raise KeyError, the same as zip and 7zip archives
+                raise KeyError(archive_file) from None
             except OSError as e:
                 logger.error("Error reading rar archive [%s]: %s :: %s :: tries #%d", e, self.path, archive_file, tries)
+                self._reset_rar_obj()
                 time.sleep(1)
             except Exception as e:
                 logger.error(
@@ -128,6 +139,68 @@ class RarArchiver(Archiver):
 
         raise OSError
 
+    def read_files(self, archive_files: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+        """
+        Reads several files from the archive, yielding (filename, data) in the order they were requested.
+        Compressed files are extracted with a single run of the unrar tool rarfile uses instead of one process per file.
+        """
+        rarc = self.get_rar_obj()
+        if rarc is None:
+            return
+
+        archive_files = list(archive_files)
+        compressed = []
+        for archive_file in archive_files:
+            # Names in a list file are wildcards and can't be escaped, those files are read on their own
+            if "*" in archive_file or "?" in archive_file:
+                continue
+            try:
+                if rarc.getinfo(archive_file).compress_type != rarfile.RAR_M0:
+                    compressed.append(archive_file)
+            except rarfile.NoRarEntry:
+                pass
+
+        # Files are read back from the temporary folder one at a time so the whole archive is never held in memory
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            extracted: dict[str, pathlib.Path] = {}
+            unrar = shutil.which(rarfile.UNRAR_TOOL)
+            if len(compressed) > 1 and unrar:
+                extracted = self._extract_files(rarc, unrar, compressed, pathlib.Path(tmp_dir).resolve())
+
+            for archive_file in archive_files:
+                if archive_file in extracted:
+                    yield archive_file, extracted.pop(archive_file).read_bytes()
+                else:
+                    yield archive_file, self.read_file(archive_file)
+
+    def _extract_files(
+        self, rarc: rarfile.RarFile, unrar: str, archive_files: list[str], tmp_path: pathlib.Path
+    ) -> dict[str, pathlib.Path]:
+        """Extracts the files to tmp_path with unrar, files that fail to extract are left out"""
+        extracted: dict[str, pathlib.Path] = {}
+        list_file = tmp_path / "files.lst"
+        list_file.write_text("\n".join(archive_files), encoding="utf-8")
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+
+        result = subprocess.run(
+            [unrar, "x", "-c-", "-y", "-inul", "-p-", "-scfl", str(self.path), f"@{list_file}", f"{out_dir}{os.sep}"],
+            startupinfo=self.startupinfo,
+            stdout=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode != 0:
+            logger.info("Error extracting from rar archive [exitcode: %d]: %s", result.returncode, self.path)
+
+        for archive_file in archive_files:
+            file_path = (out_dir / archive_file).resolve()
+            if not file_path.is_relative_to(out_dir) or not file_path.is_file():
+                continue
+            if file_path.stat().st_size == rarc.getinfo(archive_file).file_size:
+                extracted[archive_file] = file_path
+        return extracted
+
     def remove_file(self, archive_file: str) -> bool:
         if self.exe:
             # use external program to remove file from Rar archive
@@ -138,6 +211,7 @@ class RarArchiver(Archiver):
                 stdin=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
+            self._reset_rar_obj()
 
             if platform.system() == "Darwin":
                 time.sleep(1)
@@ -167,6 +241,7 @@ class RarArchiver(Archiver):
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
             )
+            self._reset_rar_obj()
 
             if platform.system() == "Darwin":
                 time.sleep(1)
@@ -209,9 +284,8 @@ class RarArchiver(Archiver):
                 rar_cwd.mkdir(exist_ok=True)
                 rar_path = (tmp_path / self.path.name).with_suffix(".rar")
 
-                for filename in other_archive.get_filename_list():
+                for filename, data in other_archive.read_files(other_archive.get_filename_list()):
                     (rar_cwd / filename).parent.mkdir(exist_ok=True, parents=True)
-                    data = other_archive.read_file(filename)
                     if data is not None:
                         with open(rar_cwd / filename, mode="w+b") as tmp_file:
                             tmp_file.write(data)
@@ -229,6 +303,7 @@ class RarArchiver(Archiver):
 
                 self.path.unlink(missing_ok=True)
                 shutil.move(rar_path, self.path)
+                self._reset_rar_obj()
         except Exception as e:
             logger.exception("Error while copying to rar archive [%s]: from %s to %s", e, other_archive.path, self.path)
             return False
@@ -251,12 +326,23 @@ class RarArchiver(Archiver):
         return False
 
     def get_rar_obj(self) -> rarfile.RarFile | None:
+        """Returns the parsed archive, it is only parsed again if the file has changed"""
         if rar_support:
             try:
+                st = os.stat(self.path)
+                key = (str(self.path), st.st_size, st.st_mtime_ns)
+                if self._rar_obj is not None and self._rar_key == key:
+                    return self._rar_obj
                 rarc = rarfile.RarFile(str(self.path))
             except (OSError, rarfile.RarFileError) as e:
                 logger.error("Unable to get rar object [%s]: %s", e, self.path)
             else:
+                self._rar_obj = rarc
+                self._rar_key = key
                 return rarc
 
         return None
+
+    def _reset_rar_obj(self) -> None:
+        self._rar_obj = None
+        self._rar_key = None
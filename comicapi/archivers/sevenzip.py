@@ -5,6 +5,7 @@ import os
 import pathlib
 import shutil
 import tempfile
+from collections.abc import Iterable, Iterator
 
 from comicapi.archivers import Archiver
 
@@ -22,6 +23,7 @@ class SevenZipArchiver(Archiver):
     """7Z implementation"""
 
     enabled = z7_support
+    magic = (b"7z\xbc\xaf\x27\x1c",)
 
     def __init__(self) -> None:
         super().__init__()
@@ -37,13 +39,31 @@ class SevenZipArchiver(Archiver):
         data = b""
         try:
             with py7zr.SevenZipFile(self.path, "r") as zf:
-                data = zf.read(archive_file)[archive_file].read()
+                data = zf.read([archive_file])[archive_file].read()
         except (py7zr.Bad7zFile, OSError) as e:
             logger.error("Error reading 7zip archive [%s]: %s :: %s", e, self.path, archive_file)
             raise
 
         return data
 
+    def read_files(self, archive_files: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+        """
+        The solid stream is decompressed once for all of the files instead of once per file.
+        Files are extracted to a temporary folder and read back one at a time to keep memory use down.
+        """
+        archive_files = list(archive_files)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = pathlib.Path(tmp_dir)
+            try:
+                with py7zr.SevenZipFile(self.path, "r") as zf:
+                    zf.extract(path=tmp_path, targets=archive_files)
+            except (py7zr.Bad7zFile, OSError) as e:
+                logger.error("Error reading 7zip archive [%s]: %s :: %s", e, self.path, archive_files)
+                raise
+
+            for archive_file in archive_files:
+                yield archive_file, (tmp_path / archive_file).read_bytes()
+
     def remove_file(self, archive_file: str) -> bool:
         return self.rebuild([archive_file])
 
@@ -105,10 +125,7 @@ class SevenZipArchiver(Archiver):
         """Replace the current zip with one copied from another archive"""
         try:
             with py7zr.SevenZipFile(self.path, "w") as zout:
-                for filename in other_archive.get_filename_list():
-                    data = other_archive.read_file(
-                        filename
-                    )  # This will be very inefficient if other_archive is a 7z file
+                for filename, data in other_archive.read_files(other_archive.get_filename_list()):
                     if data is not None:
                         zout.writestr(data, filename)
         except Exception as e:
@@ -1,30 +1,192 @@
 from __future__ import annotations
 
 import logging
+import mmap
 import os
 import pathlib
 import shutil
 import struct
 import tempfile
 import zipfile
-from typing import cast
+from collections.abc import Iterable, Iterator
+from typing import IO, NamedTuple, cast
 
 from comicapi.archivers import Archiver
 
 logger = logging.getLogger(__name__)
 
+_copy_buffer_size = 1024 * 1024
+
+# These formats are already compressed, deflating them costs CPU for almost no gain
+stored_extensions = frozenset((".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".jxl"))
+# When False every file is deflated
+store_images = True
+
+
+def _compress_type(filename: str) -> int:
+    if store_images and os.path.splitext(filename)[1].casefold() in stored_extensions:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _strip_zip64(extra: bytes) -> bytes:
+    """Removes the zip64 extra field, zipfile adds its own when it is needed"""
+    fields = []
+    i = 0
+    while i + 4 <= len(extra):
+        header_id, size = struct.unpack_from("<2H", extra, i)
+        if header_id != 0x0001:
+            fields.append(extra[i : i + 4 + size])
+        i += 4 + size
+    return b"".join(fields)
+
+
+def _copy_member(zin: zipfile.ZipFile, item: zipfile.ZipInfo, zout: zipfile.ZipFile) -> None:
+    """Streams item from zin to zout, re-compressing it according to its file type"""
+    zinfo = zipfile.ZipInfo(item.filename, item.date_time)
+    zinfo.compress_type = _compress_type(item.filename)
+    zinfo.file_size = item.file_size
+    zinfo.comment = item.comment
+    zinfo.create_system = item.create_system
+    zinfo.external_attr = item.external_attr
+    zinfo.extra = _strip_zip64(item.extra)
+    with zin.open(item) as src, zout.open(zinfo, "w") as dst:
+        while chunk := src.read(_copy_buffer_size):
+            dst.write(chunk)
+
+
+class ZipMember(NamedTuple):
+    filename: str
+    # offset of the local file header from the start of the file
+    header_offset: int
+    compress_type: int
+    compress_size: int
+    file_size: int
+
+    def is_dir(self) -> bool:
+        return self.filename.endswith("/")
+
+
+class _EndRecord(NamedTuple):
+    # offset of the "End of Central Directory" record
+    offset: int
+    entry_count: int
+    directory_offset: int
+    directory_size: int
+    # distance the archive has been moved by data prepended to it
+    concat: int
+    comment: bytes
+
+
+_end_struct = struct.Struct("<4s4H2LH")
+_end64_locator_struct = struct.Struct("<4sLQL")
+_end64_struct = struct.Struct("<4sQ2H2L4Q")
+_directory_struct = struct.Struct("<4s4B4HL2L5H2L")
+
+
+def _map_file(path: pathlib.Path | str) -> mmap.mmap:
+    """Maps the whole file read-only, nothing is read until it is accessed"""
+    with open(path, mode="rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _end_record(mm: mmap.mmap) -> _EndRecord:
+    # The record is at the very end unless there is a comment, which is at most 65535 bytes
+    offset = mm.rfind(b"PK\x05\x06", max(0, len(mm) - _end_struct.size - 0xFFFF))
+    if offset < 0 or offset + _end_struct.size > len(mm):
+        raise zipfile.BadZipFile("Could not find the End of Central Directory record")
+    _, disk, _, _, count, directory_size, directory_offset, comment_length = _end_struct.unpack_from(mm, offset)
+    if disk != 0:
+        raise zipfile.BadZipFile("Zip files that span multiple disks are not supported")
+    comment = mm[offset + _end_struct.size : offset + _end_struct.size + comment_length]
+
+    directory_end = offset
+    locator = offset - _end64_locator_struct.size
+    if locator >= 0 and mm[locator : locator + 4] == b"PK\x06\x07":
+        # zip64, the real values are in another record before the locator
+        end64 = locator - _end64_struct.size
+        if end64 < 0 or mm[end64 : end64 + 4] != b"PK\x06\x06":
+            raise zipfile.BadZipFile("Corrupt zip64 End of Central Directory record")
+        _, _, _, _, _, _, _, count, directory_size, directory_offset = _end64_struct.unpack_from(mm, end64)
+        directory_end = end64
+
+    concat = directory_end - directory_size - directory_offset
+    if concat < 0:
+        raise zipfile.BadZipFile("Corrupt End of Central Directory record")
+    return _EndRecord(offset, count, directory_offset, directory_size, concat, comment)
+
+
+def _members(mm: mmap.mmap, end: _EndRecord) -> list[ZipMember]:
+    members = []
+    pos = end.directory_offset + end.concat
+    directory_end = pos + end.directory_size
+    while pos < directory_end:
+        fields = _directory_struct.unpack_from(mm, pos)
+        if fields[0] != b"PK\x01\x02":
+            raise zipfile.BadZipFile("Bad magic number for central directory")
+        flags, compress_type = fields[5], fields[6]
+        compress_size, file_size, name_length, extra_length, comment_length = fields[10:15]
+        header_offset = fields[18]
+        pos += _directory_struct.size
+
+        raw_name = mm[pos : pos + name_length]
+        filename = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        # mirror zipfile.ZipInfo
+        filename = filename.split("\x00", 1)[0]
+        if os.sep != "/":
+            filename = filename.replace(os.sep, "/")
+        pos += name_length
+
+        if 0xFFFFFFFF in (file_size, compress_size, header_offset):
+            file_size, compress_size, header_offset = _zip64_extra(
+                mm[pos : pos + extra_length], file_size, compress_size, header_offset
+            )
+        pos += extra_length + comment_length
+
+        members.append(ZipMember(filename, header_offset + end.concat, compress_type, compress_size, file_size))
+
+    if len(members) != end.entry_count:
+        raise zipfile.BadZipFile("Central directory is incomplete")
+    return members
+
+
+def _zip64_extra(extra: bytes, file_size: int, compress_size: int, header_offset: int) -> tuple[int, int, int]:
+    """The 64 bit values are only present for fields that are 0xFFFFFFFF, in this order"""
+    pos = 0
+    while pos + 4 <= len(extra):
+        tag, length = struct.unpack_from("<2H", extra, pos)
+        if tag == 0x0001:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, pos + 4))
+            if file_size == 0xFFFFFFFF:
+                file_size = next(values)
+            if compress_size == 0xFFFFFFFF:
+                compress_size = next(values)
+            if header_offset == 0xFFFFFFFF:
+                header_offset = next(values)
+            break
+        pos += 4 + length
+    return file_size, compress_size, header_offset
+
 
 class ZipArchiver(Archiver):
 
     """ZIP implementation"""
 
+    # local file header, end of central directory (empty archive) and spanned archive
+    magic = (b"PK\x03\x04", b"PK\x05\x06", b"PK\x07\x08")
+
     def __init__(self) -> None:
         super().__init__()
 
     def get_comment(self) -> str:
-        with zipfile.ZipFile(self.path, "r") as zf:
-            comment = zf.comment.decode("utf-8")
-        return comment
+        try:
+            with _map_file(self.path) as mm:
+                return _end_record(mm).comment.decode("utf-8")
+        except (zipfile.BadZipfile, ValueError):
+            # fall back to zipfile for anything unusual
+            with zipfile.ZipFile(self.path, "r") as zf:
+                comment = zf.comment.decode("utf-8")
+            return comment
 
     def set_comment(self, comment: str) -> bool:
         with zipfile.ZipFile(self.path, mode="a") as zf:
@@ -40,6 +202,25 @@ class ZipArchiver(Archiver):
                 raise
         return data
 
+    def read_files(self, archive_files: Iterable[str]) -> Iterator[tuple[str, bytes]]:
+        with zipfile.ZipFile(self.path, mode="r") as zf:
+            for archive_file in archive_files:
+                try:
+                    data = zf.read(archive_file)
+                except (zipfile.BadZipfile, OSError) as e:
+                    logger.error("Error reading zip archive [%s]: %s :: %s", e, self.path, archive_file)
+                    raise
+                yield archive_file, data
+
+    def open_member(self, archive_file: str) -> IO[bytes]:
+        try:
+            # The file stays open until the member is closed
+            with zipfile.ZipFile(self.path, mode="r") as zf:
+                return zf.open(archive_file)
+        except (zipfile.BadZipfile, OSError) as e:
+            logger.error("Error reading zip archive [%s]: %s :: %s", e, self.path, archive_file)
+            raise
+
     def remove_file(self, archive_file: str) -> bool:
         return self.rebuild([archive_file])
 
@@ -55,7 +236,7 @@ class ZipArchiver(Archiver):
         try:
             # now just add the archive file as a new one
             with zipfile.ZipFile(self.path, mode="a", allowZip64=True, compression=zipfile.ZIP_DEFLATED) as zf:
-                zf.writestr(archive_file, data)
+                zf.writestr(archive_file, data, compress_type=_compress_type(archive_file))
             return True
         except (zipfile.BadZipfile, OSError) as e:
             logger.error("Error writing zip archive [%s]: %s :: %s", e, self.path, archive_file)
@@ -63,13 +244,27 @@ class ZipArchiver(Archiver):
 
     def get_filename_list(self) -> list[str]:
         try:
-            with zipfile.ZipFile(self.path, mode="r") as zf:
-                namelist = [file.filename for file in zf.infolist() if not file.is_dir()]
-            return namelist
+            return [member.filename for member in self.get_members() if not member.is_dir()]
         except (zipfile.BadZipfile, OSError) as e:
             logger.error("Error listing files in zip archive [%s]: %s", e, self.path)
             return []
 
+    def get_members(self) -> list[ZipMember]:
+        """
+        Lists the files in the zip in the order they are in the central directory.
+        The central directory is read straight from a memory map of the file instead of through zipfile.
+        """
+        try:
+            with _map_file(self.path) as mm:
+                return _members(mm, _end_record(mm))
+        except (zipfile.BadZipfile, ValueError, struct.error, UnicodeDecodeError):
+            # fall back to zipfile for anything unusual
+            with zipfile.ZipFile(self.path, mode="r") as zf:
+                return [
+                    ZipMember(x.filename, x.header_offset, x.compress_type, x.compress_size, x.file_size)
+                    for x in zf.infolist()
+                ]
+
     def rebuild(self, exclude_list: list[str]) -> bool:
         """Zip helper func
 
@@ -81,9 +276,11 @@ class ZipArchiver(Archiver):
             ) as zout:
                 with zipfile.ZipFile(self.path, mode="r") as zin:
                     for item in zin.infolist():
-                        buffer = zin.read(item.filename)
                         if item.filename not in exclude_list:
-                            zout.writestr(item, buffer)
+                            if item.is_dir():
+                                zout.writestr(item, b"")
+                            else:
+                                _copy_member(zin, item, zout)
 
                     # preserve the old comment
                     zout.comment = zin.comment
@@ -100,13 +297,19 @@ class ZipArchiver(Archiver):
         return True
 
     def copy_from_archive(self, other_archive: Archiver) -> bool:
-        """Replace the current zip with one copied from another archive"""
+        """Replace the current zip with one copied from another archive, one file at a time"""
         try:
             with zipfile.ZipFile(self.path, mode="w", allowZip64=True) as zout:
-                for filename in other_archive.get_filename_list():
-                    data = other_archive.read_file(filename)
-                    if data is not None:
-                        zout.writestr(filename, data)
+                if isinstance(other_archive, ZipArchiver):
+                    # stream each file straight across instead of reading it into memory
+                    with zipfile.ZipFile(other_archive.path, mode="r") as zin:
+                        for item in zin.infolist():
+                            if not item.is_dir():
+                                _copy_member(zin, item, zout)
+                else:
+                    for filename, data in other_archive.read_files(other_archive.get_filename_list()):
+                        if data is not None:
+                            zout.writestr(filename, data, compress_type=_compress_type(filename))
 
             # preserve the old comment
             comment = other_archive.get_comment()
@@ -142,47 +345,19 @@ class ZipArchiver(Archiver):
         see: http://en.wikipedia.org/wiki/Zip_(file_format)#Structure
         """
 
-        # get file size
-        statinfo = os.stat(filename)
-        file_length = statinfo.st_size
-
         try:
+            with _map_file(filename) as mm:
+                end_offset = _end_record(mm).offset
+
             with open(filename, mode="r+b") as file:
-                # the starting position, relative to EOF
-                pos = -4
-                found = False
-
-                # walk backwards to find the "End of Central Directory" record
-                while (not found) and (-pos != file_length):
-                    # seek, relative to EOF
-                    file.seek(pos, 2)
-                    value = file.read(4)
-
-                    # look for the end of central directory signature
-                    if bytearray(value) == bytearray([0x50, 0x4B, 0x05, 0x06]):
-                        found = True
-                    else:
-                        # not found, step back another byte
-                        pos = pos - 1
-
-                if found:
-                    # now skip forward 20 bytes to the comment length word
-                    pos += 20
-                    file.seek(pos, 2)
-
-                    # Pack the length of the comment string
-                    fmt = "H"  # one 2-byte integer
-                    comment_length = struct.pack(fmt, len(comment))  # pack integer in a binary string
-
-                    # write out the length
-                    file.write(comment_length)
-                    file.seek(pos + 2, 2)
-
-                    # write out the comment itself
-                    file.write(comment.encode("utf-8"))
-                    file.truncate()
-                else:
-                    raise Exception("Could not find the End of Central Directory record!")
+                # skip forward 20 bytes to the comment length word
+                file.seek(end_offset + 20)
+
+                # write out the length and the comment itself
+                encoded = comment.encode("utf-8")
+                file.write(struct.pack("<H", len(encoded)))
+                file.write(encoded)
+                file.truncate()
         except Exception as e:
             logger.error("Error writing comment to zip archive [%s]: %s", e, self.path)
             return False
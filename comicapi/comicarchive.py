@@ -14,28 +14,40 @@
 # limitations under the License.
 from __future__ import annotations
 
+import concurrent.futures
+import functools
 import io
 import logging
 import os
 import pathlib
 import shutil
 import sys
+import zipfile
 from typing import cast
 
-from comicapi import filenamelexer, filenameparser, utils
+from comicapi import filenamelexer, filenameparser, imagesize, utils
 from comicapi.archivers import Archiver, UnknownArchiver, ZipArchiver
 from comicapi.comet import CoMet
 from comicapi.comicbookinfo import ComicBookInfo
 from comicapi.comicinfoxml import ComicInfoXml
-from comicapi.genericmetadata import GenericMetadata, PageType
+from comicapi.genericmetadata import GenericMetadata, ImageMetadata, PageType
+from comicapi.libraryindex import Fingerprint, IndexEntry, LibraryIndex
 
 logger = logging.getLogger(__name__)
 
 archivers: list[type[Archiver]] = []
+_plugins_loaded = False
+
+# Threads used to measure the pages of large zip archives
+page_size_workers = min(4, os.cpu_count() or 1)
+
+_page_extensions = frozenset((".jpg", ".jpeg", ".png", ".gif", ".webp"))
 
 
 def load_archive_plugins() -> None:
-    if not archivers:
+    global _plugins_loaded
+    if not archivers and not _plugins_loaded:
+        _plugins_loaded = True
         if sys.version_info < (3, 10):
             from importlib_metadata import entry_points
         else:
@@ -54,6 +66,72 @@ def load_archive_plugins() -> None:
         archivers.extend(builtin)
 
 
+# Extensions commonly used for archives that are not the canonical comic extension of their archiver
+_archive_extensions = frozenset((".zip", ".rar", ".7z"))
+
+_comic_extensions: frozenset[str] = frozenset()
+
+
+def comic_extensions() -> frozenset[str]:
+    """Returns the casefolded extensions of every enabled archiver"""
+    global _comic_extensions
+    if not _comic_extensions:
+        load_archive_plugins()
+        _comic_extensions = _archive_extensions | {arch().extension().casefold() for arch in archivers} - {""}
+    return _comic_extensions
+
+
+def _read_magic(path: pathlib.Path | str) -> bytes:
+    """Reads enough of the start of the file to match the magic of every archiver"""
+    size = max((len(m) for arch in archivers for m in arch.magic), default=0)
+    if not size:
+        return b""
+    try:
+        with open(path, "rb") as f:
+            return f.read(size)
+    except OSError:
+        return b""
+
+
+def is_comic_candidate(path: pathlib.Path | str) -> bool:
+    """
+    A cheap check for whether path could be a comic archive, used to skip other files when scanning folders.
+    Files with a known extension are accepted without being opened, other files are checked for a known signature.
+    """
+    if os.path.splitext(path)[1].casefold() in comic_extensions():
+        return True
+    head = _read_magic(path)
+    return any(head.startswith(arch.magic) for arch in archivers if arch.magic)
+
+
+def get_archiver(path: pathlib.Path) -> Archiver:
+    """
+    Returns an archiver that can open path.
+    The start of the file is read once and matched against the magic of each archiver, only matching archivers and
+    archivers without magic are probed with is_valid. Every archiver is probed if no magic matches e.g. archives with
+    data prepended to them.
+    """
+    if not _plugins_loaded:
+        load_archive_plugins()
+
+    head = _read_magic(path) if path.is_file() else b""
+    recognised = False
+    for archiver in archivers:
+        if archiver.magic:
+            if not head.startswith(archiver.magic):
+                continue
+            recognised = True
+        if archiver.is_valid(path):
+            return archiver.open(path)
+
+    if head and not recognised:
+        for archiver in archivers:
+            if archiver.magic and archiver.is_valid(path):
+                return archiver.open(path)
+
+    return UnknownArchiver.open(path)
+
+
 class MetaDataStyle:
     CBI = 0
     CIX = 1
@@ -62,11 +140,75 @@ class MetaDataStyle:
     short_name = ["cbl", "cr", "comet"]
 
 
+# The same file is often parsed several times in a run, only the filename is used so it is the key
+@functools.lru_cache(maxsize=4096)
+def _metadata_from_filename(
+    filename: str,
+    complicated_parser: bool,
+    remove_c2c: bool,
+    remove_fcbd: bool,
+    remove_publisher: bool,
+    split_words: bool,
+) -> GenericMetadata:
+    metadata = GenericMetadata()
+
+    if split_words:
+        import wordninja
+
+        path = pathlib.PurePath(filename)
+        filename = " ".join(wordninja.split(path.stem)) + path.suffix
+
+    if complicated_parser:
+        lex = filenamelexer.Lex(filename)
+        p = filenameparser.Parse(
+            lex.items, remove_c2c=remove_c2c, remove_fcbd=remove_fcbd, remove_publisher=remove_publisher
+        )
+        metadata.alternate_number = utils.xlate(p.filename_info["alternate"])
+        metadata.issue = utils.xlate(p.filename_info["issue"])
+        metadata.issue_count = utils.xlate_int(p.filename_info["issue_count"])
+        metadata.publisher = utils.xlate(p.filename_info["publisher"])
+        metadata.series = utils.xlate(p.filename_info["series"])
+        metadata.title = utils.xlate(p.filename_info["title"])
+        metadata.volume = utils.xlate_int(p.filename_info["volume"])
+        metadata.volume_count = utils.xlate_int(p.filename_info["volume_count"])
+        metadata.year = utils.xlate_int(p.filename_info["year"])
+
+        metadata.scan_info = utils.xlate(p.filename_info["remainder"])
+        metadata.format = "FCBD" if p.filename_info["fcbd"] else None
+        if p.filename_info["annual"]:
+            metadata.format = "Annual"
+    else:
+        fnp = filenameparser.FileNameParser()
+        fnp.parse_filename(filename)
+
+        if fnp.issue:
+            metadata.issue = fnp.issue
+        if fnp.series:
+            metadata.series = fnp.series
+        if fnp.volume:
+            metadata.volume = utils.xlate_int(fnp.volume)
+        if fnp.year:
+            metadata.year = utils.xlate_int(fnp.year)
+        if fnp.issue_count:
+            metadata.issue_count = utils.xlate_int(fnp.issue_count)
+        if fnp.remainder:
+            metadata.scan_info = fnp.remainder
+
+    metadata.is_empty = False
+
+    return metadata
+
+
 class ComicArchive:
     logo_data = b""
     pil_available = True
 
-    def __init__(self, path: pathlib.Path | str, default_image_path: pathlib.Path | str | None = None) -> None:
+    def __init__(
+        self,
+        path: pathlib.Path | str,
+        default_image_path: pathlib.Path | str | None = None,
+        index: LibraryIndex | None = None,
+    ) -> None:
         self.cbi_md: GenericMetadata | None = None
         self.cix_md: GenericMetadata | None = None
         self.comet_filename: str | None = None
@@ -77,19 +219,25 @@ class ComicArchive:
         self.path = pathlib.Path(path).absolute()
         self.page_count: int | None = None
         self.page_list: list[str] = []
+        self._raw_cix: bytes | None = None
+        self._raw_cbi: str | None = None
+        self._raw_comet: str | None = None
+        # Pages are never changed by ComicArchive so this is kept when the cache is reset
+        self._page_sizes: dict[str, tuple[int, int | None, int | None]] = {}
 
         self.ci_xml_filename = "ComicInfo.xml"
         self.comet_default_filename = "CoMet.xml"
         self.reset_cache()
         self.default_image_path = default_image_path
 
-        self.archiver: Archiver = UnknownArchiver.open(self.path)
+        self.archiver: Archiver = get_archiver(self.path)
 
-        load_archive_plugins()
-        for archiver in archivers:
-            if archiver.is_valid(self.path):
-                self.archiver = archiver.open(self.path)
-                break
+        # Unchanged archives are loaded from the index instead of being read again
+        self.index = index
+        if self.index is not None:
+            entry = self.index.get(self.path)
+            if entry is not None:
+                self.load_index_entry(entry)
 
         if not ComicArchive.logo_data and self.default_image_path:
             with open(self.default_image_path, mode="rb") as fd:
@@ -107,6 +255,52 @@ class ComicArchive:
         self.cix_md = None
         self.cbi_md = None
         self.comet_md = None
+        self._raw_cix = None
+        self._raw_cbi = None
+        self._raw_comet = None
+
+    def load_index_entry(self, entry: IndexEntry) -> None:
+        if entry.page_list:
+            self.page_list = entry.page_list
+        self._has_cix = entry.has_cix
+        self._has_cbi = entry.has_cbi
+        self._has_comet = entry.has_comet
+        self.comet_filename = entry.comet_filename
+        self._raw_cix = entry.raw_cix
+        self._raw_cbi = entry.raw_cbi
+        self._raw_comet = entry.raw_comet
+        for name, (size, width, height) in entry.page_sizes.items():
+            # Only pages that could be read are stored, they always have a size
+            if size is None:
+                continue
+            self._page_sizes[name] = (
+                int(size),
+                None if width is None else int(width),
+                None if height is None else int(height),
+            )
+
+    def update_index(self) -> None:
+        """Stores everything read from the archive so far in the library index"""
+        if self.index is None:
+            return
+        fingerprint = Fingerprint.of(self.path)
+        if fingerprint is None:
+            return
+        self.index.add(
+            self.path,
+            IndexEntry(
+                fingerprint=fingerprint,
+                page_list=self.page_list or None,
+                has_cix=self._has_cix,
+                has_cbi=self._has_cbi,
+                has_comet=self._has_comet,
+                comet_filename=self.comet_filename,
+                raw_cix=self._raw_cix,
+                raw_cbi=self._raw_cbi,
+                raw_comet=self._raw_comet,
+                page_sizes={name: list(size) for name, size in self._page_sizes.items()},
+            ),
+        )
 
     def load_cache(self, style_list: list[int]) -> None:
         for style in style_list:
@@ -118,8 +312,11 @@ class ComicArchive:
             return
         os.makedirs(new_path.parent, 0o777, True)
         shutil.move(self.path, new_path)
+        if self.index is not None:
+            self.index.remove(self.path)
         self.path = new_path
         self.archiver.path = pathlib.Path(path)
+        self.update_index()
 
     def is_writable(self, check_archive_status: bool = True) -> bool:
         if isinstance(self.archiver, UnknownArchiver):
@@ -148,13 +345,17 @@ class ComicArchive:
     def extension(self) -> str:
         return self.archiver.extension()
 
-    def read_metadata(self, style: int) -> GenericMetadata:
+    def read_metadata(self, style: int, pages: bool = True) -> GenericMetadata:
+        """
+        With pages=False only the metadata file is read, the pages of the archive are never listed.
+        The page list is left as it is in the metadata, it isn't checked against the archive or generated.
+        """
         if style == MetaDataStyle.CIX:
-            return self.read_cix()
+            return self.read_cix(pages)
         if style == MetaDataStyle.CBI:
-            return self.read_cbi()
+            return self.read_cbi(pages)
         if style == MetaDataStyle.COMET:
-            return self.read_comet()
+            return self.read_comet(pages)
         return GenericMetadata()
 
     def write_metadata(self, metadata: GenericMetadata, style: int) -> bool:
@@ -261,23 +462,25 @@ class ComicArchive:
         return scanner_page_index
 
     def get_page_name_list(self, sort_list: bool = True) -> list[str]:
-        if not self.page_list:
-            # get the list file names in the archive, and sort
-            files: list[str] = self.archiver.get_filename_list()
-
-            # seems like some archive creators are on Windows, and don't know about case-sensitivity!
-            if sort_list:
-                files = cast(list[str], utils.os_sorted(files))
-
-            # make a sub-list of image files
-            self.page_list = []
-            for name in files:
-                if (
-                    os.path.splitext(name)[1].casefold() in [".jpg", ".jpeg", ".png", ".gif", ".webp"]
-                    and os.path.basename(name)[0] != "."
-                ):
-                    self.page_list.append(name)
+        if self.page_list:
+            return self.page_list
+
+        # get the list file names in the archive, and sort
+        files: list[str] = self.archiver.get_filename_list()
 
+        # make a sub-list of image files
+        pages = [
+            name
+            for name in files
+            if os.path.splitext(name)[1].casefold() in _page_extensions and os.path.basename(name)[0] != "."
+        ]
+
+        # Only the sorted list is kept, it is what is stored in the library index
+        if not sort_list:
+            return pages
+
+        # seems like some archive creators are on Windows, and don't know about case-sensitivity!
+        self.page_list = cast(list[str], utils.os_sorted(pages))
         return self.page_list
 
     def get_number_of_pages(self) -> int:
@@ -285,7 +488,16 @@ class ComicArchive:
             self.page_count = len(self.get_page_name_list())
         return self.page_count
 
-    def read_cbi(self) -> GenericMetadata:
+    def read_cbi(self, pages: bool = True) -> GenericMetadata:
+        if self.cbi_md is None and not pages:
+            # has_cbi would list the pages to check that this is a comic archive
+            raw_cbi = self._raw_cbi
+            if raw_cbi is None and self._has_cbi is not False:
+                raw_cbi = self.archiver.get_comment()
+                if not ComicBookInfo().validate_string(raw_cbi):
+                    raw_cbi = ""
+            return ComicBookInfo().metadata_from_string(raw_cbi) if raw_cbi else GenericMetadata()
+
         if self.cbi_md is None:
             raw_cbi = self.read_raw_cbi()
             if raw_cbi:
@@ -294,14 +506,16 @@ class ComicArchive:
                 self.cbi_md = GenericMetadata()
 
             self.cbi_md.set_default_page_list(self.get_number_of_pages())
+            # The metadata is kept as long as the archive, a library of archives keeps many page lists
+            self.cbi_md.compact_pages()
 
         return self.cbi_md
 
     def read_raw_cbi(self) -> str:
-        if not self.has_cbi():
-            return ""
+        if self._raw_cbi is None:
+            self._raw_cbi = self.archiver.get_comment() if self.has_cbi() else ""
 
-        return self.archiver.get_comment()
+        return self._raw_cbi
 
     def has_cbi(self) -> bool:
         if self._has_cbi is None:
@@ -339,7 +553,21 @@ class ComicArchive:
             return write_success
         return True
 
-    def read_cix(self) -> GenericMetadata:
+    def read_cix(self, pages: bool = True) -> GenericMetadata:
+        if self.cix_md is None and not pages:
+            raw_cix = self._raw_cix
+            if raw_cix is None and self._has_cix is not False:
+                raw_cix = b""
+                try:
+                    # Reading the member directly saves listing the archive
+                    raw_cix = self.archiver.read_file(self.ci_xml_filename) or b""
+                except (KeyError, FileNotFoundError):
+                    # There is no ComicInfo.xml, there are no tags
+                    self._has_cix = False
+                except Exception as e:
+                    logger.error("Error reading in raw CIX! for %s: %s", self.path, e)
+            return ComicInfoXml().metadata_from_string(raw_cix) if raw_cix else GenericMetadata()
+
         if self.cix_md is None:
             raw_cix = self.read_raw_cix()
             if raw_cix:
@@ -356,18 +584,21 @@ class ComicArchive:
 
             if len(self.cix_md.pages) == 0:
                 self.cix_md.set_default_page_list(self.get_number_of_pages())
+            self.cix_md.compact_pages()
 
         return self.cix_md
 
     def read_raw_cix(self) -> bytes:
+        if self._raw_cix is not None:
+            return self._raw_cix
         if not self.has_cix():
             return b""
         try:
-            raw_cix = self.archiver.read_file(self.ci_xml_filename) or b""
+            self._raw_cix = self.archiver.read_file(self.ci_xml_filename) or b""
         except Exception as e:
             logger.error("Error reading in raw CIX! for %s: %s", self.path, e)
-            raw_cix = b""
-        return raw_cix
+            return b""
+        return self._raw_cix
 
     def write_cix(self, metadata: GenericMetadata) -> bool:
         if metadata is not None:
@@ -406,7 +637,19 @@ class ComicArchive:
                 self._has_cix = False
         return self._has_cix
 
-    def read_comet(self) -> GenericMetadata:
+    def read_comet(self, pages: bool = True) -> GenericMetadata:
+        if self.comet_md is None and not pages:
+            raw_comet = self._raw_comet
+            if raw_comet is None and self._has_comet is not False:
+                raw_comet = ""
+                comet_filename = self.comet_filename if self._has_comet else self._find_comet()
+                if comet_filename is not None:
+                    try:
+                        raw_comet = self.archiver.read_file(comet_filename).decode("utf-8")
+                    except OSError as e:
+                        logger.exception("Error reading in raw CoMet!: %s", e)
+            return CoMet().metadata_from_string(raw_comet) if raw_comet else GenericMetadata()
+
         if self.comet_md is None:
             raw_comet = self.read_raw_comet()
             if raw_comet is None or raw_comet == "":
@@ -427,10 +670,13 @@ class ComicArchive:
                 if cover_idx != 0:
                     del self.comet_md.pages[0]["Type"]
                     self.comet_md.pages[cover_idx]["Type"] = PageType.FrontCover
+            self.comet_md.compact_pages()
 
         return self.comet_md
 
     def read_raw_comet(self) -> str:
+        if self._raw_comet is not None:
+            return self._raw_comet
         raw_comet = ""
         if not self.has_comet():
             raw_comet = ""
@@ -441,6 +687,8 @@ class ComicArchive:
                     raw_comet = raw_bytes.decode("utf-8")
             except OSError as e:
                 logger.exception("Error reading in raw CoMet!: %s", e)
+                return raw_comet
+        self._raw_comet = raw_comet
         return raw_comet
 
     def write_comet(self, metadata: GenericMetadata) -> bool:
@@ -480,59 +728,117 @@ class ComicArchive:
             if not self.seems_to_be_a_comic_archive():
                 return self._has_comet
 
-            # look at all xml files in root, and search for CoMet data, get first
-            for n in self.archiver.get_filename_list():
-                if os.path.dirname(n) == "" and os.path.splitext(n)[1].casefold() == ".xml":
-                    # read in XML file, and validate it
-                    data = ""
-                    try:
-                        d = self.archiver.read_file(n)
-                        if d:
-                            data = d.decode("utf-8")
-                    except Exception as e:
-                        logger.warning("Error reading in Comet XML for validation! from %s: %s", self.path, e)
-                    if CoMet().validate_string(data):
-                        # since we found it, save it!
-                        self.comet_filename = n
-                        self._has_comet = True
-                        break
+            self.comet_filename = self._find_comet()
+            self._has_comet = self.comet_filename is not None
 
         return self._has_comet
 
+    def _find_comet(self) -> str | None:
+        # look at all xml files in root, and search for CoMet data, get first
+        for n in self.archiver.get_filename_list():
+            if os.path.dirname(n) == "" and os.path.splitext(n)[1].casefold() == ".xml":
+                # read in XML file, and validate it
+                data = ""
+                try:
+                    # Only read the whole file if the start looks like CoMet
+                    if b"<comet" not in self.archiver.read_file_prefix(n, 4096):
+                        continue
+                    d = self.archiver.read_file(n)
+                    if d:
+                        data = d.decode("utf-8")
+                except Exception as e:
+                    logger.warning("Error reading in Comet XML for validation! from %s: %s", self.path, e)
+                if CoMet().validate_string(data):
+                    return n
+        return None
+
     def apply_archive_info_to_metadata(self, md: GenericMetadata, calc_page_sizes: bool = False) -> None:
         md.page_count = self.get_number_of_pages()
 
         if calc_page_sizes:
-            for index, p in enumerate(md.pages):
-                idx = int(p["Image"])
-                if self.pil_available:
-                    try:
-                        from PIL import Image
-
-                        self.pil_available = True
-                    except ImportError:
-                        self.pil_available = False
-                    if "ImageSize" not in p or "ImageHeight" not in p or "ImageWidth" not in p:
-                        data = self.get_page(idx)
-                        if data:
-                            try:
-                                if isinstance(data, bytes):
-                                    im = Image.open(io.BytesIO(data))
-                                else:
-                                    im = Image.open(io.StringIO(data))
-                                w, h = im.size
-
-                                p["ImageSize"] = str(len(data))
-                                p["ImageHeight"] = str(h)
-                                p["ImageWidth"] = str(w)
-                            except Exception as e:
-                                logger.warning("Error decoding image [%s] %s :: image %s", e, self.path, index)
-                                p["ImageSize"] = str(len(data))
-
+            # Only the pages missing information are measured
+            pending: dict[str, list[ImageMetadata]] = {}
+            for p in md.pages:
+                if "ImageSize" not in p or "ImageHeight" not in p or "ImageWidth" not in p:
+                    pending.setdefault(self.get_page_name(int(p["Image"])), []).append(p)
+
+            sizes = self.get_page_sizes([name for name in pending if name])
+            for name, pages in pending.items():
+                for p in pages:
+                    if name in sizes:
+                        size, width, height = sizes[name]
+                    else:
+                        # Unreadable pages are substituted with the logo
+                        data = self.get_page(int(p["Image"]))
+                        if not data:
+                            continue
+                        size = len(data)
+                        width, height = imagesize.image_size(data) or self._decode_image_size(data, name)
+
+                    p["ImageSize"] = str(size)
+                    if width is not None and height is not None:
+                        p["ImageHeight"] = str(height)
+                        p["ImageWidth"] = str(width)
+
+    def get_page_sizes(self, names: list[str]) -> dict[str, tuple[int, int | None, int | None]]:
+        """
+        Returns the size in bytes, width and height of the named pages.
+        The width and height are None if the image could not be decoded, pages that could not be read are left out.
+        Where possible only the image header is read and results are kept in the library index.
+        """
+        missing = [name for name in names if name not in self._page_sizes]
+        if missing:
+            if isinstance(self.archiver, ZipArchiver):
+                # Each worker opens its own copy of the zip
+                workers = max(1, min(page_size_workers, len(missing) // 32))
+                chunks = [missing[i::workers] for i in range(workers)]
+                if workers > 1:
+                    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+                        for result in executor.map(self._probe_zip_page_sizes, chunks):
+                            self._page_sizes.update(result)
                 else:
-                    if "ImageSize" not in p:
-                        data = self.get_page(idx)
-                        p["ImageSize"] = str(len(data))
+                    self._page_sizes.update(self._probe_zip_page_sizes(missing))
+            else:
+                try:
+                    for name, data in self.archiver.read_files(missing):
+                        width, height = imagesize.image_size(data) or self._decode_image_size(data, name)
+                        self._page_sizes[name] = (len(data), width, height)
+                except Exception as e:
+                    logger.error("Error reading pages [%s]: %s", e, self.path)
+
+        return {name: self._page_sizes[name] for name in names if name in self._page_sizes}
+
+    def _probe_zip_page_sizes(self, names: list[str]) -> dict[str, tuple[int, int | None, int | None]]:
+        sizes: dict[str, tuple[int, int | None, int | None]] = {}
+        try:
+            with zipfile.ZipFile(self.path, mode="r") as zf:
+                for name in names:
+                    info = zf.getinfo(name)
+                    with zf.open(info) as f:
+                        header = f.read(imagesize.HEADER_SIZE)
+                        dimensions: tuple[int | None, int | None] | None = imagesize.image_size(header)
+                        if dimensions is None:
+                            dimensions = self._decode_image_size(header + f.read(), name)
+                    width, height = dimensions
+                    sizes[name] = (info.file_size, width, height)
+        except Exception as e:
+            logger.error("Error reading pages [%s]: %s", e, self.path)
+        return sizes
+
+    def _decode_image_size(self, data: bytes, name: str) -> tuple[int | None, int | None]:
+        """Falls back to Pillow for formats imagesize doesn't understand"""
+        if self.pil_available:
+            try:
+                from PIL import Image
+            except ImportError:
+                self.pil_available = False
+                return None, None
+
+            try:
+                return Image.open(io.BytesIO(data)).size
+            except Exception as e:
+                logger.warning("Error decoding image [%s] %s :: %s", e, self.path, name)
+        return None, None
 
     def metadata_from_filename(
         self,
@@ -542,53 +848,10 @@ class ComicArchive:
         remove_publisher: bool = False,
         split_words: bool = False,
     ) -> GenericMetadata:
-        metadata = GenericMetadata()
-
-        filename = self.path.name
-        if split_words:
-            import wordninja
-
-            filename = " ".join(wordninja.split(self.path.stem)) + self.path.suffix
-
-        if complicated_parser:
-            lex = filenamelexer.Lex(filename)
-            p = filenameparser.Parse(
-                lex.items, remove_c2c=remove_c2c, remove_fcbd=remove_fcbd, remove_publisher=remove_publisher
-            )
-            metadata.alternate_number = utils.xlate(p.filename_info["alternate"])
-            metadata.issue = utils.xlate(p.filename_info["issue"])
-            metadata.issue_count = utils.xlate_int(p.filename_info["issue_count"])
-            metadata.publisher = utils.xlate(p.filename_info["publisher"])
-            metadata.series = utils.xlate(p.filename_info["series"])
-            metadata.title = utils.xlate(p.filename_info["title"])
-            metadata.volume = utils.xlate_int(p.filename_info["volume"])
-            metadata.volume_count = utils.xlate_int(p.filename_info["volume_count"])
-            metadata.year = utils.xlate_int(p.filename_info["year"])
-
-            metadata.scan_info = utils.xlate(p.filename_info["remainder"])
-            metadata.format = "FCBD" if p.filename_info["fcbd"] else None
-            if p.filename_info["annual"]:
-                metadata.format = "Annual"
-        else:
-            fnp = filenameparser.FileNameParser()
-            fnp.parse_filename(filename)
-
-            if fnp.issue:
-                metadata.issue = fnp.issue
-            if fnp.series:
-                metadata.series = fnp.series
-            if fnp.volume:
-                metadata.volume = utils.xlate_int(fnp.volume)
-            if fnp.year:
-                metadata.year = utils.xlate_int(fnp.year)
-            if fnp.issue_count:
-                metadata.issue_count = utils.xlate_int(fnp.issue_count)
-            if fnp.remainder:
-                metadata.scan_info = fnp.remainder
-
-        metadata.is_empty = False
-
-        return metadata
+        # The cached metadata is shared, a copy is returned so it is never changed
+        return _metadata_from_filename(
+            self.path.name, complicated_parser, remove_c2c, remove_fcbd, remove_publisher, split_words
+        ).copy()
 
     def export_as_zip(self, zip_filename: pathlib.Path) -> bool:
         if self.archiver.name() == "ZIP":
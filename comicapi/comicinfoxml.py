@@ -17,7 +17,7 @@ from __future__ import annotations
 import logging
 import xml.etree.ElementTree as ET
 from collections import OrderedDict
-from typing import Any, cast
+from typing import Any, Callable, cast
 from xml.etree.ElementTree import ElementTree
 
 from comicapi import utils
@@ -25,6 +25,56 @@ from comicapi.genericmetadata import GenericMetadata, ImageMetadata
 
 logger = logging.getLogger(__name__)
 
+# CIX tag: (GenericMetadata attribute, conversion)
+_cix_fields: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "Series": ("series", utils.xlate),
+    "Title": ("title", utils.xlate),
+    "Number": ("issue", utils.xlate),
+    "Count": ("issue_count", utils.xlate_int),
+    "Volume": ("volume", utils.xlate_int),
+    "AlternateSeries": ("alternate_series", utils.xlate),
+    "AlternateNumber": ("alternate_number", utils.xlate),
+    "AlternateCount": ("alternate_count", utils.xlate_int),
+    "Summary": ("comments", utils.xlate),
+    "Notes": ("notes", utils.xlate),
+    "Year": ("year", utils.xlate_int),
+    "Month": ("month", utils.xlate_int),
+    "Day": ("day", utils.xlate_int),
+    "Publisher": ("publisher", utils.xlate),
+    "Imprint": ("imprint", utils.xlate),
+    "Genre": ("genre", utils.xlate),
+    "Web": ("web_link", utils.xlate),
+    "LanguageISO": ("language", utils.xlate),
+    "Format": ("format", utils.xlate),
+    "Manga": ("manga", utils.xlate),
+    "Characters": ("characters", utils.xlate),
+    "Teams": ("teams", utils.xlate),
+    "Locations": ("locations", utils.xlate),
+    "PageCount": ("page_count", utils.xlate_int),
+    "ScanInformation": ("scan_info", utils.xlate),
+    "StoryArc": ("story_arc", utils.xlate),
+    "SeriesGroup": ("series_group", utils.xlate),
+    "AgeRating": ("maturity_rating", utils.xlate),
+    "CommunityRating": ("critical_rating", utils.xlate_float),
+    "BlackAndWhite": ("black_and_white", lambda value: True if _is_true(value) else None),
+}
+
+# CIX credit tag: role
+_cix_credits = {
+    "Writer": "Writer",
+    "Penciller": "Penciller",
+    "Inker": "Inker",
+    "Colorist": "Colorist",
+    "Letterer": "Letterer",
+    "Editor": "Editor",
+    "CoverArtist": "Cover",
+}
+
+
+def _is_true(value: str | None) -> bool:
+    value = utils.xlate(value)
+    return value is not None and value.casefold() in ("yes", "true", "1")
+
 
 class ComicInfoXml:
     writer_synonyms = ["writer", "plotter", "scripter"]
@@ -60,25 +110,30 @@ class ComicInfoXml:
         md = metadata
 
         if xml:
-            root = ET.ElementTree(ET.fromstring(xml)).getroot()
+            root = ET.fromstring(xml)
         else:
             # build a tree structure
             root = ET.Element("ComicInfo")
             root.attrib["xmlns:xsi"] = "http://www.w3.org/2001/XMLSchema-instance"
             root.attrib["xmlns:xsd"] = "http://www.w3.org/2001/XMLSchema"
-        # helper func
 
+        # the first element of each tag, what root.find would return
+        elements: dict[str, ET.Element] = {}
+        for element in root:
+            elements.setdefault(element.tag, element)
+
+        # helper func
         def assign(cix_entry: str, md_entry: Any) -> None:
+            et_entry = elements.get(cix_entry)
             if md_entry is not None and md_entry:
-                et_entry = root.find(cix_entry)
                 if et_entry is not None:
                     et_entry.text = str(md_entry)
                 else:
-                    ET.SubElement(root, cix_entry).text = str(md_entry)
-            else:
-                et_entry = root.find(cix_entry)
-                if et_entry is not None:
-                    root.remove(et_entry)
+                    elements[cix_entry] = ET.SubElement(root, cix_entry)
+                    elements[cix_entry].text = str(md_entry)
+            elif et_entry is not None:
+                root.remove(et_entry)
+                del elements[cix_entry]
 
         assign("Title", md.title)
         assign("Series", md.series)
@@ -98,46 +153,23 @@ class ComicInfoXml:
 
         # need to specially process the credits, since they are structured
         # differently than CIX
-        credit_writer_list = []
-        credit_penciller_list = []
-        credit_inker_list = []
-        credit_colorist_list = []
-        credit_letterer_list = []
-        credit_cover_list = []
-        credit_editor_list = []
+        role_tags = self._role_tags()
+        credit_lists: dict[str, list[str]] = {tag: [] for tag in _cix_credits}
 
         # first, loop thru credits, and build a list for each role that CIX
         # supports
         for credit in metadata.credits:
-            if credit["role"].casefold() in set(self.writer_synonyms):
-                credit_writer_list.append(credit["person"].replace(",", ""))
-
-            if credit["role"].casefold() in set(self.penciller_synonyms):
-                credit_penciller_list.append(credit["person"].replace(",", ""))
-
-            if credit["role"].casefold() in set(self.inker_synonyms):
-                credit_inker_list.append(credit["person"].replace(",", ""))
-
-            if credit["role"].casefold() in set(self.colorist_synonyms):
-                credit_colorist_list.append(credit["person"].replace(",", ""))
-
-            if credit["role"].casefold() in set(self.letterer_synonyms):
-                credit_letterer_list.append(credit["person"].replace(",", ""))
-
-            if credit["role"].casefold() in set(self.cover_synonyms):
-                credit_cover_list.append(credit["person"].replace(",", ""))
-
-            if credit["role"].casefold() in set(self.editor_synonyms):
-                credit_editor_list.append(credit["person"].replace(",", ""))
+            for tag in role_tags.get(credit["role"].casefold(), ()):
+                credit_lists[tag].append(credit["person"].replace(",", ""))
 
         # second, convert each list to string, and add to XML struct
-        assign("Writer", ", ".join(credit_writer_list))
-        assign("Penciller", ", ".join(credit_penciller_list))
-        assign("Inker", ", ".join(credit_inker_list))
-        assign("Colorist", ", ".join(credit_colorist_list))
-        assign("Letterer", ", ".join(credit_letterer_list))
-        assign("CoverArtist", ", ".join(credit_cover_list))
-        assign("Editor", ", ".join(credit_editor_list))
+        assign("Writer", ", ".join(credit_lists["Writer"]))
+        assign("Penciller", ", ".join(credit_lists["Penciller"]))
+        assign("Inker", ", ".join(credit_lists["Inker"]))
+        assign("Colorist", ", ".join(credit_lists["Colorist"]))
+        assign("Letterer", ", ".join(credit_lists["Letterer"]))
+        assign("CoverArtist", ", ".join(credit_lists["CoverArtist"]))
+        assign("Editor", ", ".join(credit_lists["Editor"]))
 
         assign("Publisher", md.publisher)
         assign("Imprint", md.imprint)
@@ -156,7 +188,7 @@ class ComicInfoXml:
         assign("ScanInformation", md.scan_info)
 
         #  loop and add the page entries under pages node
-        pages_node = root.find("Pages")
+        pages_node = elements.get("Pages")
         if pages_node is not None:
             pages_node.clear()
         else:
@@ -175,73 +207,30 @@ class ComicInfoXml:
     def convert_xml_to_metadata(self, tree: ElementTree) -> GenericMetadata:
         root = tree.getroot()
 
-        if root.tag != "ComicInfo":
+        if root is None or root.tag != "ComicInfo":
             raise Exception("Not a ComicInfo file")
 
-        def get(name: str) -> str | None:
-            tag = root.find(name)
-            if tag is None:
-                return None
-            return tag.text
-
         md = GenericMetadata()
-
-        md.series = utils.xlate(get("Series"))
-        md.title = utils.xlate(get("Title"))
-        md.issue = utils.xlate(get("Number"))
-        md.issue_count = utils.xlate_int(get("Count"))
-        md.volume = utils.xlate_int(get("Volume"))
-        md.alternate_series = utils.xlate(get("AlternateSeries"))
-        md.alternate_number = utils.xlate(get("AlternateNumber"))
-        md.alternate_count = utils.xlate_int(get("AlternateCount"))
-        md.comments = utils.xlate(get("Summary"))
-        md.notes = utils.xlate(get("Notes"))
-        md.year = utils.xlate_int(get("Year"))
-        md.month = utils.xlate_int(get("Month"))
-        md.day = utils.xlate_int(get("Day"))
-        md.publisher = utils.xlate(get("Publisher"))
-        md.imprint = utils.xlate(get("Imprint"))
-        md.genre = utils.xlate(get("Genre"))
-        md.web_link = utils.xlate(get("Web"))
-        md.language = utils.xlate(get("LanguageISO"))
-        md.format = utils.xlate(get("Format"))
-        md.manga = utils.xlate(get("Manga"))
-        md.characters = utils.xlate(get("Characters"))
-        md.teams = utils.xlate(get("Teams"))
-        md.locations = utils.xlate(get("Locations"))
-        md.page_count = utils.xlate_int(get("PageCount"))
-        md.scan_info = utils.xlate(get("ScanInformation"))
-        md.story_arc = utils.xlate(get("StoryArc"))
-        md.series_group = utils.xlate(get("SeriesGroup"))
-        md.maturity_rating = utils.xlate(get("AgeRating"))
-        md.critical_rating = utils.xlate_float(get("CommunityRating"))
-
-        tmp = utils.xlate(get("BlackAndWhite"))
-        if tmp is not None and tmp.casefold() in ["yes", "true", "1"]:
-            md.black_and_white = True
-        # Now extract the credit info
+        values = md.__dict__
+        # everything is read in a single pass over the children of root
+        # only the first element of a tag is used, like root.find
+        seen = set()
+        pages_node = None
         for n in root:
-            if any(
-                [
-                    n.tag == "Writer",
-                    n.tag == "Penciller",
-                    n.tag == "Inker",
-                    n.tag == "Colorist",
-                    n.tag == "Letterer",
-                    n.tag == "Editor",
-                ]
-            ):
+            tag = n.tag
+            if tag in _cix_fields:
+                if tag not in seen:
+                    seen.add(tag)
+                    name, xlate = _cix_fields[tag]
+                    values[name] = xlate(n.text)
+            elif tag in _cix_credits:
                 if n.text is not None:
                     for name in n.text.split(","):
-                        md.add_credit(name.strip(), n.tag)
-
-            if n.tag == "CoverArtist":
-                if n.text is not None:
-                    for name in n.text.split(","):
-                        md.add_credit(name.strip(), "Cover")
+                        md.add_credit(name.strip(), _cix_credits[tag])
+            elif tag == "Pages" and pages_node is None:
+                pages_node = n
 
         # parse page data now
-        pages_node = root.find("Pages")
         if pages_node is not None:
             for page in pages_node:
                 p: dict[str, Any] = page.attrib
@@ -255,6 +244,23 @@ class ComicInfoXml:
 
         return md
 
+    def _role_tags(self) -> dict[str, tuple[str, ...]]:
+        """Maps each role synonym to the CIX credit tags it is written to"""
+        role_tags: dict[str, tuple[str, ...]] = {}
+        for tag, synonyms in (
+            ("Writer", self.writer_synonyms),
+            ("Penciller", self.penciller_synonyms),
+            ("Inker", self.inker_synonyms),
+            ("Colorist", self.colorist_synonyms),
+            ("Letterer", self.letterer_synonyms),
+            ("CoverArtist", self.cover_synonyms),
+            ("Editor", self.editor_synonyms),
+        ):
+            for role in synonyms:
+                if tag not in role_tags.get(role, ()):
+                    role_tags[role] = role_tags.get(role, ()) + (tag,)
+        return role_tags
+
     def write_to_external_file(self, filename: str, metadata: GenericMetadata, xml: bytes = b"") -> None:
         tree = self.convert_metadata_to_xml(metadata, xml)
         tree.write(filename, encoding="utf-8", xml_declaration=True)
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import calendar
+import functools
+import itertools
+import locale
 import os
+import re
 import unicodedata
 from enum import Enum, auto
-from typing import Any, Callable
 
 
 class ItemType(Enum):
@@ -86,247 +89,172 @@ class Item:
         return f"{self.val}: index: {self.pos}: {self.typ}"
 
 
+# Precompiled scanners for each kind of token, they match from the position the token starts at
+_space_run = re.compile(r"[_ \t]+")
+_operator_run = re.compile(r"[-|:;]*")
+# Digits, a decimal part only if a digit follows the dot, then an ordinal suffix
+_number = re.compile(r"[0-9]*(?:\.[0-9]+)?(?:st|[nr]d|th)?")
+# The same characters as is_alpha_numeric
+_alpha_numeric_run = re.compile(r"[^\W_]+")
+
+
+def _match_end(scanner: re.Pattern[str], text: str, pos: int) -> int:
+    match = scanner.match(text, pos)
+    # Each scanner is only used where it matches, the runs that can be empty match an empty string
+    assert match is not None
+    return match.end()
+
+
+_info_specifiers = frozenset(k for k, v in key.items() if v == ItemType.InfoSpecifier)
+
+_single_items = {
+    "(": ItemType.LeftParen,
+    ")": ItemType.RightParen,
+    "{": ItemType.LeftBrace,
+    "}": ItemType.RightBrace,
+    "[": ItemType.LeftSBrace,
+    "]": ItemType.RightSBrace,
+}
+
+
 class Lexer:
     def __init__(self, string: str) -> None:
         self.input: str = string  # The string being scanned
-        # The next lexing function to enter
-        self.state: Callable[[Lexer], Callable | None] | None = None  # type: ignore[type-arg]
-        self.pos: int = -1  # Current position in the input
-        self.start: int = 0  # Start position of this item
-        self.lastPos: int = 0  # Position of most recent item returned by nextItem
+        self.pos: int = 0  # Current position in the input
         self.paren_depth: int = 0  # Nesting depth of ( ) exprs
         self.brace_depth: int = 0  # Nesting depth of { }
         self.sbrace_depth: int = 0  # Nesting depth of [ ]
         self.items: list[Item] = []
 
-    # Next returns the next rune in the input.
-    def get(self) -> str:
-        if int(self.pos) >= len(self.input) - 1:
-            self.pos += 1
-            return eof
-
-        self.pos += 1
-        return self.input[self.pos]
-
-    # Peek returns but does not consume the next rune in the input.
-    def peek(self) -> str:
-        if int(self.pos) >= len(self.input) - 1:
-            return eof
-
-        return self.input[self.pos + 1]
-
-    def backup(self) -> None:
-        self.pos -= 1
-
     # Emit passes an item back to the client.
-    def emit(self, t: ItemType) -> None:
-        self.items.append(Item(t, self.start, self.input[self.start : self.pos + 1]))
-        self.start = self.pos + 1
+    def emit(self, t: ItemType, end: int) -> None:
+        self.items.append(Item(t, self.pos, self.input[self.pos : end]))
+        self.pos = end
 
-    # Ignore skips over the pending input before this point.
-    def ignore(self) -> None:
-        self.start = self.pos
+    # Errorf adds an error item, the scan stops after it
+    def errorf(self, message: str) -> None:
+        self.items.append(Item(ItemType.Error, self.pos, message))
 
-    # Accept consumes the next rune if it's from the valid se:
-    def accept(self, valid: str) -> bool:
-        if self.get() in valid:
-            return True
-
-        self.backup()
-        return False
-
-    # AcceptRun consumes a run of runes from the valid set.
-    def accept_run(self, valid: str) -> None:
-        while self.get() in valid:
-            continue
-
-        self.backup()
-
-    def scan_number(self) -> bool:
-        digits = "0123456789"
-
-        self.accept_run(digits)
-        if self.accept("."):
-            if self.accept(digits):
-                self.accept_run(digits)
-            else:
-                self.backup()
-        if self.accept("s"):
-            if not self.accept("t"):
-                self.backup()
-        elif self.accept("nr"):
-            if not self.accept("d"):
-                self.backup()
-        elif self.accept("t"):
-            if not self.accept("h"):
-                self.backup()
-
-        return True
-
-    # Runs the state machine for the lexer.
+    # Runs the lexer, each token is scanned in one step with a regex instead of a character at a time.
     def run(self) -> None:
-        self.state = lex_filename
-        while self.state is not None:
-            self.state = self.state(self)
-
-
-# Errorf returns an error token and terminates the scan by passing
-# Back a nil pointer that will be the next state, terminating self.nextItem.
-def errorf(lex: Lexer, message: str) -> Callable[[Lexer], Callable | None] | None:  # type: ignore[type-arg]
-    lex.items.append(Item(ItemType.Error, lex.start, message))
-    return None
-
-
-# Scans the elements inside action delimiters.
-def lex_filename(lex: Lexer) -> Callable[[Lexer], Callable | None] | None:  # type: ignore[type-arg]
-    r = lex.get()
-    if r == eof:
-        if lex.paren_depth != 0:
-            return errorf(lex, "unclosed left paren")
-
-        if lex.brace_depth != 0:
-            return errorf(lex, "unclosed left paren")
-        lex.emit(ItemType.EOF)
-        return None
-    elif is_space(r):
-        if r == "_" and lex.peek() == "_":
-            lex.get()
-            lex.emit(ItemType.Skip)
+        text = self.input
+        # A null character ends the input
+        end = text.find(eof)
+        if end < 0:
+            end = len(text)
         else:
-            return lex_space
-    elif r == ".":
-        r = lex.peek()
-        if r < "0" or "9" < r:
-            lex.emit(ItemType.Dot)
-            return lex_filename
-
-        lex.backup()
-        return lex_number
-    elif r == "'":
-        r = lex.peek()
-        if r in "0123456789":
-            return lex_number
-        lex.emit(ItemType.Text)  # TODO: Change to Text
-    elif "0" <= r <= "9":
-        lex.backup()
-        return lex_number
-    elif r == "#":
-        if "0" <= lex.peek() <= "9":
-            return lex_number
-        lex.emit(ItemType.Symbol)
-    elif is_operator(r):
-        if r == "-" and lex.peek() == "-":
-            lex.get()
-            lex.emit(ItemType.Skip)
+            text = text[:end]
+
+        while self.pos < end:
+            pos = self.pos
+            r = text[pos]
+            following = text[pos + 1 : pos + 2]
+
+            if r in "_ \t":
+                if r == "_" and following == "_":
+                    self.emit(ItemType.Skip, pos + 2)
+                else:
+                    self.emit(ItemType.Space, _match_end(_space_run, text, pos))
+            elif r == ".":
+                if "0" <= following <= "9" and following:
+                    self.scan_number(text, pos)
+                else:
+                    self.emit(ItemType.Dot, pos + 1)
+            elif r == "'":
+                if following and following in "0123456789":
+                    self.scan_number(text, pos + 1)
+                else:
+                    self.emit(ItemType.Text, pos + 1)
+            elif "0" <= r <= "9":
+                self.scan_number(text, pos)
+            elif r == "#":
+                if "0" <= following <= "9" and following:
+                    self.scan_number(text, pos + 1)
+                else:
+                    self.emit(ItemType.Symbol, pos + 1)
+            elif is_operator(r):
+                if r == "-" and following == "-":
+                    self.emit(ItemType.Skip, pos + 2)
+                else:
+                    self.emit(ItemType.Operator, _match_end(_operator_run, text, pos + 1))
+            elif r.isalpha() or r.isnumeric():
+                self.scan_text(text, pos)
+            elif r in _single_items:
+                self.emit(_single_items[r], pos + 1)
+                if r == ")":
+                    self.paren_depth -= 1
+                    if self.paren_depth < 0:
+                        return self.errorf("unexpected right paren " + r)
+                elif r == "(":
+                    self.paren_depth += 1
+                elif r == "}":
+                    self.brace_depth -= 1
+                    if self.brace_depth < 0:
+                        return self.errorf("unexpected right brace " + r)
+                elif r == "{":
+                    self.brace_depth += 1
+                elif r == "]":
+                    self.sbrace_depth -= 1
+                    if self.sbrace_depth < 0:
+                        return self.errorf("unexpected right brace " + r)
+                else:
+                    self.sbrace_depth += 1
+            elif is_symbol(r):
+                self.emit(ItemType.Symbol, pos + 1)
+            else:
+                return self.errorf("unrecognized character in action: " + r)
+
+        if self.paren_depth != 0:
+            return self.errorf("unclosed left paren")
+        if self.brace_depth != 0:
+            return self.errorf("unclosed left paren")
+        self.items.append(Item(ItemType.EOF, end, self.input[end : end + 1]))
+
+    # Scan_number scans a number starting at digits_start, the item starts at self.pos which may be a # or '
+    def scan_number(self, text: str, digits_start: int) -> None:
+        end = _match_end(_number, text, digits_start)
+        if text[self.pos] == "#":
+            self.emit(ItemType.IssueNumber, end)
+        elif not text[end - 1].isdigit():
+            # Assume that 80th is just text and not a number
+            self.emit(ItemType.Text, end)
         else:
-            return lex_operator
-    elif is_alpha_numeric(r):
-        lex.backup()
-        return lex_text
-    elif r == "(":
-        lex.emit(ItemType.LeftParen)
-        lex.paren_depth += 1
-    elif r == ")":
-        lex.emit(ItemType.RightParen)
-        lex.paren_depth -= 1
-        if lex.paren_depth < 0:
-            return errorf(lex, "unexpected right paren " + r)
-
-    elif r == "{":
-        lex.emit(ItemType.LeftBrace)
-        lex.brace_depth += 1
-    elif r == "}":
-        lex.emit(ItemType.RightBrace)
-        lex.brace_depth -= 1
-        if lex.brace_depth < 0:
-            return errorf(lex, "unexpected right brace " + r)
-
-    elif r == "[":
-        lex.emit(ItemType.LeftSBrace)
-        lex.sbrace_depth += 1
-    elif r == "]":
-        lex.emit(ItemType.RightSBrace)
-        lex.sbrace_depth -= 1
-        if lex.sbrace_depth < 0:
-            return errorf(lex, "unexpected right brace " + r)
-    elif is_symbol(r):
-        lex.emit(ItemType.Symbol)
-    else:
-        return errorf(lex, "unrecognized character in action: " + r)
-
-    return lex_filename
-
-
-def lex_operator(lex: Lexer) -> Callable:  # type: ignore[type-arg]
-    lex.accept_run("-|:;")
-    lex.emit(ItemType.Operator)
-    return lex_filename
-
-
-# LexSpace scans a run of space characters.
-# One space has already been seen.
-def lex_space(lex: Lexer) -> Callable:  # type: ignore[type-arg]
-    while is_space(lex.peek()):
-        lex.get()
-
-    lex.emit(ItemType.Space)
-    return lex_filename
-
-
-# Lex_text scans an alphanumeric.
-def lex_text(lex: Lexer) -> Callable:  # type: ignore[type-arg]
-    while True:
-        r = lex.get()
-        if is_alpha_numeric(r):
-            if r.isnumeric():  # E.g. v1
-                word = lex.input[lex.start : lex.pos]
-                if word.casefold() in key and key[word.casefold()] == ItemType.InfoSpecifier:
-                    lex.backup()
-                    lex.emit(key[word.casefold()])
-                    return lex_filename
+            self.emit(ItemType.Number, end)
+
+    # Scan_text scans an alphanumeric.
+    def scan_text(self, text: str, start: int) -> None:
+        end = _match_end(_alpha_numeric_run, text, start)
+        if not text[start:end].isalpha():
+            # E.g. v1
+            for i in range(start + 1, end):
+                if text[i].isnumeric() and text[start:i].casefold() in _info_specifiers:
+                    self.emit(ItemType.InfoSpecifier, i)
+                    return
+
+        if text[end : end + 2] == "'s":
+            end += 2
+        if text[start:end].casefold() == "vol" and text[end : end + 1] == ".":
+            end += 1
+
+        word = text[start:end].casefold()
+        if word in key:
+            self.emit(key[word], end)
+        elif cal(text[start:end]):
+            self.emit(ItemType.Calendar, end)
         else:
-            if r == "'" and lex.peek() == "s":
-                lex.get()
-            else:
-                lex.backup()
-            word = lex.input[lex.start : lex.pos + 1]
-            if word.casefold() == "vol" and lex.peek() == ".":
-                lex.get()
-            word = lex.input[lex.start : lex.pos + 1]
-
-            if word.casefold() in key:
-                lex.emit(key[word.casefold()])
-            elif cal(word):
-                lex.emit(ItemType.Calendar)
-            else:
-                lex.emit(ItemType.Text)
-            break
-
-    return lex_filename
-
-
-def cal(value: str) -> set[Any]:
-    month_abbr = [i for i, x in enumerate(calendar.month_abbr) if x == value.title()]
-    month_name = [i for i, x in enumerate(calendar.month_name) if x == value.title()]
-    day_abbr = [i for i, x in enumerate(calendar.day_abbr) if x == value.title()]
-    day_name = [i for i, x in enumerate(calendar.day_name) if x == value.title()]
-    return set(month_abbr + month_name + day_abbr + day_name)
+            self.emit(ItemType.Text, end)
 
 
-def lex_number(lex: Lexer) -> Callable[[Lexer], Callable | None] | None:  # type: ignore[type-arg]
-    if not lex.scan_number():
-        return errorf(lex, "bad number syntax: " + lex.input[lex.start : lex.pos])
-    # Complex number logic removed. Messes with math operations without space
+def cal(value: str) -> bool:
+    return value.title() in _calendar_names(locale.setlocale(locale.LC_TIME))
 
-    if lex.input[lex.start] == "#":
-        lex.emit(ItemType.IssueNumber)
-    elif not lex.input[lex.pos].isdigit():
-        # Assume that 80th is just text and not a number
-        lex.emit(ItemType.Text)
-    else:
-        lex.emit(ItemType.Number)
 
-    return lex_filename
+@functools.lru_cache(maxsize=None)
+def _calendar_names(current_locale: str) -> frozenset[str]:
+    # The names depend on the locale
+    return frozenset(
+        itertools.chain(calendar.month_abbr, calendar.month_name, calendar.day_abbr, calendar.day_name)
+    ) - {""}
 
 
 def is_space(character: str) -> bool:
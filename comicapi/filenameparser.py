@@ -20,9 +20,13 @@ This should probably be re-written, but, well, it mostly works!
 # http://code.google.com/p/pycomicmetathis/
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import itertools
 import logging
 import os
 import re
+from collections.abc import Iterable, Iterator
 from operator import itemgetter
 from re import Match
 from typing import Callable, TypedDict
@@ -1147,3 +1151,49 @@ def Parse(
     )
     p.run()
     return p
+
+
+def parse_filenames(
+    filenames: Iterable[str],
+    workers: int = 1,
+    chunk_size: int = 256,
+    first_is_alt: bool = False,
+    remove_c2c: bool = False,
+    remove_fcbd: bool = False,
+    remove_publisher: bool = False,
+) -> Iterator[FilenameInfo]:
+    """
+    Parses each filename with Lex and Parse, the results are yielded in the same order as filenames.
+    With more than one worker chunks of filenames are parsed in a process pool. Only a few chunks are read ahead of
+    the results, so filenames can be a generator over a whole library.
+    """
+    options = (first_is_alt, remove_c2c, remove_fcbd, remove_publisher)
+    filenames = iter(filenames)
+    chunks = iter(lambda: list(itertools.islice(filenames, chunk_size)), [])
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _parse_chunk(chunk, options)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending: collections.deque[concurrent.futures.Future[list[FilenameInfo]]] = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_parse_chunk, chunk, options))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _parse_chunk(filenames: list[str], options: tuple[bool, bool, bool, bool]) -> list[FilenameInfo]:
+    first_is_alt, remove_c2c, remove_fcbd, remove_publisher = options
+    return [
+        Parse(
+            filenamelexer.Lex(filename).items,
+            first_is_alt=first_is_alt,
+            remove_c2c=remove_c2c,
+            remove_fcbd=remove_fcbd,
+            remove_publisher=remove_publisher,
+        ).filename_info
+        for filename in filenames
+    ]
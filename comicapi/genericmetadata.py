@@ -20,15 +20,56 @@ possible, however lossy it might be
 # limitations under the License.
 from __future__ import annotations
 
-import copy
 import dataclasses
 import logging
-from typing import Any, TypedDict
+from array import array
+from collections.abc import Iterable, MutableSequence, Sequence
+from typing import TYPE_CHECKING, Any, TypedDict, cast, overload
 
 from comicapi import utils
 
 logger = logging.getLogger(__name__)
 
+# Fields that overlay copies when they are set, empty strings clear the field
+_overlay_fields = (
+    "series",
+    "issue",
+    "issue_count",
+    "title",
+    "publisher",
+    "day",
+    "month",
+    "year",
+    "volume",
+    "volume_count",
+    "genre",
+    "language",
+    "country",
+    "critical_rating",
+    "alternate_series",
+    "alternate_number",
+    "alternate_count",
+    "imprint",
+    "web_link",
+    "format",
+    "manga",
+    "black_and_white",
+    "maturity_rating",
+    "story_arc",
+    "series_group",
+    "scan_info",
+    "characters",
+    "teams",
+    "locations",
+    "comments",
+    "notes",
+    "price",
+    "is_version_of",
+    "rights",
+    "identifier",
+    "last_mark",
+)
+
 
 class PageType:
 
@@ -60,6 +101,245 @@ class ImageMetadata(TypedDict, total=False):
     ImageWidth: str
 
 
+# Page types are stored in a PageTable as their position in this tuple plus one, 0 means the page has no type
+_page_types = (
+    PageType.FrontCover,
+    PageType.InnerCover,
+    PageType.Roundup,
+    PageType.Story,
+    PageType.Advertisement,
+    PageType.Editorial,
+    PageType.Letters,
+    PageType.Preview,
+    PageType.BackCover,
+    PageType.Other,
+    PageType.Deleted,
+)
+_page_type_codes = {t: i for i, t in enumerate(_page_types, 1)}
+
+# ImageMetadata keys that are numbers stored as strings, mapped to their PageTable column
+_page_number_columns = {"ImageSize": "_size", "ImageHeight": "_height", "ImageWidth": "_width"}
+
+
+class PageTable(MutableSequence[ImageMetadata]):
+    """
+    A page list stored as columns instead of a dict per page.
+    Numbers are kept in int arrays and page types and double page flags in a byte each, -1 and 0 mean missing.
+    Anything that doesn't fit a column (bookmarks, sizes that aren't plain numbers, unknown page types) is kept in a
+    dict for that page.
+
+    Pages are returned as dicts that write any change back to the table, so it can be used as a list of ImageMetadata.
+    A returned page refers to its position in the table, get it again after pages are inserted or deleted.
+    """
+
+    __slots__ = ("_image", "_size", "_height", "_width", "_type", "_double", "_extra")
+
+    def __init__(self, pages: Iterable[ImageMetadata] = ()) -> None:
+        self._image = array("q")
+        self._size = array("q")
+        self._height = array("q")
+        self._width = array("q")
+        self._type = bytearray()
+        self._double = bytearray()
+        self._extra: list[dict[str, Any] | None] = []
+        for page in pages:
+            self.append(page)
+
+    def __len__(self) -> int:
+        return len(self._image)
+
+    @overload
+    def __getitem__(self, index: int) -> ImageMetadata:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ImageMetadata]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> ImageMetadata | list[ImageMetadata]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return cast(ImageMetadata, _PageView(self, range(len(self))[index]))
+
+    @overload
+    def __setitem__(self, index: int, page: ImageMetadata) -> None:
+        ...
+
+    @overload
+    def __setitem__(self, index: slice, page: Iterable[ImageMetadata]) -> None:
+        ...
+
+    def __setitem__(self, index: int | slice, page: ImageMetadata | Iterable[ImageMetadata]) -> None:
+        if isinstance(index, slice):
+            pages = self.to_list()
+            pages[index] = cast(Iterable[ImageMetadata], page)
+            self.clear()
+            self.extend(pages)
+            return
+        index = range(len(self))[index]
+        for key in self._row(index):
+            self._clear(index, key)
+        for key, value in cast(ImageMetadata, page).items():
+            self._set(index, key, value)
+
+    def __delitem__(self, index: int | slice) -> None:
+        for column in self._columns():
+            del column[index]
+
+    def insert(self, index: int, page: ImageMetadata) -> None:
+        # the same positions as list.insert
+        if index < 0:
+            index = max(0, len(self) + index)
+        index = min(index, len(self))
+        self._image.insert(index, -1)
+        self._size.insert(index, -1)
+        self._height.insert(index, -1)
+        self._width.insert(index, -1)
+        self._type.insert(index, 0)
+        self._double.insert(index, 0)
+        self._extra.insert(index, None)
+        for key, value in page.items():
+            self._set(index, key, value)
+
+    def clear(self) -> None:
+        for column in self._columns():
+            del column[:]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(self._row(i) == page for i, page in enumerate(other))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_list()!r})"
+
+    def copy(self) -> PageTable:
+        tmp = PageTable()
+        tmp._image = array("q", self._image)
+        tmp._size = array("q", self._size)
+        tmp._height = array("q", self._height)
+        tmp._width = array("q", self._width)
+        tmp._type = bytearray(self._type)
+        tmp._double = bytearray(self._double)
+        tmp._extra = [None if extra is None else extra.copy() for extra in self._extra]
+        return tmp
+
+    def to_list(self) -> list[ImageMetadata]:
+        """Returns the pages as plain dicts"""
+        return [cast(ImageMetadata, self._row(i)) for i in range(len(self))]
+
+    def _columns(self) -> tuple[MutableSequence[Any], ...]:
+        return (self._image, self._size, self._height, self._width, self._type, self._double, self._extra)
+
+    def _row(self, index: int) -> dict[str, Any]:
+        row: dict[str, Any] = {}
+        if self._image[index] >= 0:
+            row["Image"] = self._image[index]
+        for key, name in _page_number_columns.items():
+            value = getattr(self, name)[index]
+            if value >= 0:
+                row[key] = str(value)
+        if self._type[index]:
+            row["Type"] = _page_types[self._type[index] - 1]
+        if self._double[index]:
+            row["DoublePage"] = self._double[index] == 2
+        extra = self._extra[index]
+        if extra:
+            row.update(extra)
+        return row
+
+    def _set(self, index: int, key: str, value: Any) -> None:
+        self._clear(index, key)
+        if key == "Image" and type(value) is int and 0 <= value < 2**63:
+            self._image[index] = value
+        elif key in _page_number_columns and _is_plain_number(value):
+            getattr(self, _page_number_columns[key])[index] = int(value)
+        elif key == "Type" and value in _page_type_codes:
+            self._type[index] = _page_type_codes[value]
+        elif key == "DoublePage" and type(value) is bool:
+            self._double[index] = 1 + value
+        else:
+            extra = self._extra[index]
+            if extra is None:
+                extra = {}
+                self._extra[index] = extra
+            extra[key] = value
+
+    def _clear(self, index: int, key: str) -> None:
+        if key == "Image":
+            self._image[index] = -1
+        elif key in _page_number_columns:
+            getattr(self, _page_number_columns[key])[index] = -1
+        elif key == "Type":
+            self._type[index] = 0
+        elif key == "DoublePage":
+            self._double[index] = 0
+        extra = self._extra[index]
+        if extra is not None:
+            extra.pop(key, None)
+            if not extra:
+                self._extra[index] = None
+
+
+class _PageView(dict):  # type: ignore[type-arg]
+    """A page of a PageTable, changes are written back to the table"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: PageTable, index: int) -> None:
+        super().__init__(table._row(index))
+        self._table = table
+        self._index = index
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._table._set(self._index, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._table._clear(self._index, key)
+
+    if not TYPE_CHECKING:
+        # dict's |= doesn't go through __setitem__. mypy keeps dict's signature, which a subclass can't match
+        def __ior__(self, other):
+            self.update(other)
+            return self
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self:
+            self._table._clear(self._index, key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[str, Any]:
+        key, value = super().popitem()
+        self._table._clear(self._index, key)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        for key in list(self):
+            del self[key]
+
+
+def _is_plain_number(value: Any) -> bool:
+    # Only strings that turn back into the same string are stored as numbers
+    return (
+        isinstance(value, str)
+        and 0 < len(value) < 19
+        and value.isascii()
+        and value.isdigit()
+        and str(int(value)) == value
+    )
+
+
 class CreditMetadata(TypedDict):
     person: str
     role: str
@@ -119,7 +399,7 @@ class GenericMetadata:
 
     credits: list[CreditMetadata] = dataclasses.field(default_factory=list)
     tags: set[str] = dataclasses.field(default_factory=set)
-    pages: list[ImageMetadata] = dataclasses.field(default_factory=list)
+    pages: MutableSequence[ImageMetadata] = dataclasses.field(default_factory=list)
 
     # Some CoMet-only items
     price: float | None = None
@@ -136,7 +416,21 @@ class GenericMetadata:
                 break
 
     def copy(self) -> GenericMetadata:
-        return copy.deepcopy(self)
+        """Everything except the credits, tags and pages is immutable so only those are copied deeply"""
+        tmp = object.__new__(type(self))
+        tmp.__dict__.update(self.__dict__)
+        tmp.credits = [c.copy() for c in self.credits]
+        tmp.tags = set(self.tags)
+        if isinstance(self.pages, PageTable):
+            tmp.pages = self.pages.copy()
+        else:
+            tmp.pages = [p.copy() for p in self.pages]
+        return tmp
+
+    def compact_pages(self) -> None:
+        """Stores the page list in a PageTable, for when the metadata of many archives is kept in memory"""
+        if not isinstance(self.pages, PageTable):
+            self.pages = PageTable(self.pages)
 
     def replace(self, /, **kwargs: Any) -> GenericMetadata:
         tmp = self.copy()
@@ -150,53 +444,15 @@ class GenericMetadata:
         to this one.
         """
 
-        def assign(cur: str, new: Any) -> None:
-            if new is not None:
-                if isinstance(new, str) and len(new) == 0:
-                    setattr(self, cur, None)
-                else:
-                    setattr(self, cur, new)
-
         if not new_md.is_empty:
             self.is_empty = False
 
-        assign("series", new_md.series)
-        assign("issue", new_md.issue)
-        assign("issue_count", new_md.issue_count)
-        assign("title", new_md.title)
-        assign("publisher", new_md.publisher)
-        assign("day", new_md.day)
-        assign("month", new_md.month)
-        assign("year", new_md.year)
-        assign("volume", new_md.volume)
-        assign("volume_count", new_md.volume_count)
-        assign("genre", new_md.genre)
-        assign("language", new_md.language)
-        assign("country", new_md.country)
-        assign("critical_rating", new_md.critical_rating)
-        assign("alternate_series", new_md.alternate_series)
-        assign("alternate_number", new_md.alternate_number)
-        assign("alternate_count", new_md.alternate_count)
-        assign("imprint", new_md.imprint)
-        assign("web_link", new_md.web_link)
-        assign("format", new_md.format)
-        assign("manga", new_md.manga)
-        assign("black_and_white", new_md.black_and_white)
-        assign("maturity_rating", new_md.maturity_rating)
-        assign("story_arc", new_md.story_arc)
-        assign("series_group", new_md.series_group)
-        assign("scan_info", new_md.scan_info)
-        assign("characters", new_md.characters)
-        assign("teams", new_md.teams)
-        assign("locations", new_md.locations)
-        assign("comments", new_md.comments)
-        assign("notes", new_md.notes)
-
-        assign("price", new_md.price)
-        assign("is_version_of", new_md.is_version_of)
-        assign("rights", new_md.rights)
-        assign("identifier", new_md.identifier)
-        assign("last_mark", new_md.last_mark)
+        values = self.__dict__
+        new_values = new_md.__dict__
+        for name in _overlay_fields:
+            new = new_values[name]
+            if new is not None:
+                values[name] = None if new == "" else new
 
         self.overlay_credits(new_md.credits)
         # TODO
@@ -207,12 +463,13 @@ class GenericMetadata:
         # For now, go the easy route, where any overlay
         # value wipes out the whole list
         if len(new_md.tags) > 0:
-            assign("tags", new_md.tags)
+            self.tags = new_md.tags
 
         if len(new_md.pages) > 0:
-            assign("pages", new_md.pages)
+            self.pages = new_md.pages
 
     def overlay_credits(self, new_credits: list[CreditMetadata]) -> None:
+        index: dict[tuple[str, str], CreditMetadata] | None = None
         for c in new_credits:
             primary = bool("primary" in c and c["primary"])
 
@@ -221,9 +478,24 @@ class GenericMetadata:
                 for r in reversed(self.credits):
                     if r["role"].casefold() == c["role"].casefold():
                         self.credits.remove(r)
+                index = None
             # otherwise, add it!
             else:
-                self.add_credit(c["person"], c["role"], primary)
+                if index is None:
+                    index = self._credit_index()
+                key = (c["person"].casefold(), c["role"].casefold())
+                if key in index:
+                    index[key]["primary"] = primary
+                else:
+                    index[key] = CreditMetadata(person=c["person"], role=c["role"], primary=primary)
+                    self.credits.append(index[key])
+
+    def _credit_index(self) -> dict[tuple[str, str], CreditMetadata]:
+        """Maps casefolded (person, role) to the first matching credit, the same one add_credit would find"""
+        index: dict[tuple[str, str], CreditMetadata] = {}
+        for c in self.credits:
+            index.setdefault((c["person"].casefold(), c["role"].casefold()), c)
+        return index
 
     def set_default_page_list(self, count: int) -> None:
         # generate a default page list, with the first page marked as the cover
@@ -0,0 +1,191 @@
+"""A persistent index of what is known about the archives in a library"""
+# Copyright 2012-2014 ComicTagger Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+import sqlite3 as lite
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Increment when the schema changes, an index with a different version is rebuilt
+SCHEMA_VERSION = 2
+
+
+class Fingerprint(NamedTuple):
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @classmethod
+    def of(cls, path: pathlib.Path | str) -> Fingerprint | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return cls(st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+@dataclasses.dataclass
+class IndexEntry:
+    """
+    What is known about an archive, None means it has not been read yet.
+    The raw metadata is stored so it doesn't have to be read from the archive again.
+    """
+
+    fingerprint: Fingerprint
+    page_list: list[str] | None = None
+    has_cix: bool | None = None
+    has_cbi: bool | None = None
+    has_comet: bool | None = None
+    comet_filename: str | None = None
+    raw_cix: bytes | None = None
+    raw_cbi: str | None = None
+    raw_comet: str | None = None
+    # filename: [size in bytes, width, height]
+    page_sizes: dict[str, list[int | None]] = dataclasses.field(default_factory=dict)
+
+
+class LibraryIndex:
+    """
+    Stores the page list and metadata of archives keyed by their path.
+    An entry is only returned while the size, modification time and inode of the file are unchanged.
+    """
+
+    def __init__(self, db_file: pathlib.Path) -> None:
+        self.db_file = db_file
+
+        try:
+            with lite.connect(self.db_file) as con:
+                version = con.execute("PRAGMA user_version").fetchone()[0]
+        except lite.DatabaseError:
+            logger.warning("Library index %s is corrupt, rebuilding", self.db_file)
+            version = -1
+        if version != SCHEMA_VERSION:
+            self.create_index_db()
+
+    def create_index_db(self) -> None:
+        # this will wipe out any existing version
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        open(self.db_file, "wb").close()
+
+        con = lite.connect(self.db_file)
+
+        # create tables
+        with con:
+            cur = con.cursor()
+            cur.execute(
+                "CREATE TABLE Archives("
+                + "path TEXT NOT NULL PRIMARY KEY,"
+                + "size INT,"
+                + "mtime_ns INT,"
+                + "inode INT,"
+                + "page_list TEXT,"  # JSON list
+                + "has_cix BOOL,"
+                + "has_cbi BOOL,"
+                + "has_comet BOOL,"
+                + "comet_filename TEXT,"
+                + "raw_cix BLOB,"
+                + "raw_cbi TEXT,"
+                + "raw_comet TEXT,"
+                + "page_sizes TEXT)"  # JSON object
+            )
+            cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def get(self, path: pathlib.Path | str) -> IndexEntry | None:
+        """Returns the entry for path if the file hasn't changed since it was indexed"""
+        fingerprint = Fingerprint.of(path)
+        if fingerprint is None:
+            return None
+
+        con = lite.connect(self.db_file)
+        with con:
+            cur = con.cursor()
+            cur.execute(
+                "SELECT size, mtime_ns, inode, page_list, has_cix, has_cbi, has_comet, comet_filename, raw_cix,"
+                " raw_cbi, raw_comet, page_sizes FROM Archives WHERE path=?",
+                [str(path)],
+            )
+            row = cur.fetchone()
+
+        if row is None or Fingerprint(*row[:3]) != fingerprint:
+            return None
+
+        return IndexEntry(
+            fingerprint=fingerprint,
+            page_list=json.loads(row[3]) if row[3] is not None else None,
+            has_cix=_bool(row[4]),
+            has_cbi=_bool(row[5]),
+            has_comet=_bool(row[6]),
+            comet_filename=row[7],
+            raw_cix=row[8],
+            raw_cbi=row[9],
+            raw_comet=row[10],
+            page_sizes=json.loads(row[11]) if row[11] is not None else {},
+        )
+
+    def add(self, path: pathlib.Path | str, entry: IndexEntry) -> None:
+        data: dict[str, Any] = {
+            "path": str(path),
+            "size": entry.fingerprint.size,
+            "mtime_ns": entry.fingerprint.mtime_ns,
+            "inode": entry.fingerprint.inode,
+            "page_list": json.dumps(entry.page_list) if entry.page_list is not None else None,
+            "has_cix": entry.has_cix,
+            "has_cbi": entry.has_cbi,
+            "has_comet": entry.has_comet,
+            "comet_filename": entry.comet_filename,
+            "raw_cix": entry.raw_cix,
+            "raw_cbi": entry.raw_cbi,
+            "raw_comet": entry.raw_comet,
+            "page_sizes": json.dumps(entry.page_sizes) if entry.page_sizes else None,
+        }
+        con = lite.connect(self.db_file)
+        with con:
+            con.execute(
+                f"INSERT OR REPLACE INTO Archives ({', '.join(data)}) VALUES ({', '.join('?' * len(data))})",
+                list(data.values()),
+            )
+
+    def remove(self, path: pathlib.Path | str) -> None:
+        con = lite.connect(self.db_file)
+        with con:
+            con.execute("DELETE FROM Archives WHERE path=?", [str(path)])
+
+    def move(self, moves: Iterable[tuple[pathlib.Path | str, pathlib.Path | str]]) -> None:
+        """
+        Keeps the entries of renamed files, renaming doesn't change the fingerprint.
+        All of the moves happen at once so files can swap names.
+        """
+        moves = [(str(old_path), str(new_path)) for old_path, new_path in moves]
+        con = lite.connect(self.db_file)
+        with con:
+            rows = []
+            for old_path, new_path in moves:
+                row = con.execute("SELECT * FROM Archives WHERE path=?", [old_path]).fetchone()
+                if row is not None:
+                    rows.append((new_path, *row[1:]))
+            con.executemany("DELETE FROM Archives WHERE path=?", [[path] for move in moves for path in move])
+            if rows:
+                con.executemany(f"INSERT INTO Archives VALUES ({', '.join('?' * len(rows[0]))})", rows)
+
+
+def _bool(value: int | None) -> bool | None:
+    return None if value is None else bool(value)
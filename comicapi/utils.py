@@ -14,6 +14,8 @@
 # limitations under the License.
 from __future__ import annotations
 
+import fnmatch
+import functools
 import json
 import logging
 import os
@@ -21,9 +23,9 @@ import pathlib
 import platform
 import unicodedata
 from collections import defaultdict
-from collections.abc import Iterable, Mapping
+from collections.abc import Container, Iterable, Iterator, Mapping
 from shutil import which  # noqa: F401
-from typing import Any
+from typing import Any, Callable
 
 import comicapi.data
 
@@ -38,11 +40,17 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
-def _custom_key(tup):
+@functools.lru_cache(maxsize=None)
+def _os_sort_key() -> Callable[[Any], Any]:
+    # Building the key is expensive, it only needs to be done once
     import natsort
 
+    return natsort.os_sort_keygen()
+
+
+def _custom_key(tup):
     lst = []
-    for x in natsort.os_sort_keygen()(tup):
+    for x in _os_sort_key()(tup):
         ret = x
         if len(x) > 1 and isinstance(x[1], int) and isinstance(x[0], str) and x[0] == "":
             ret = ("a", *x[1:])
@@ -52,11 +60,9 @@ def _custom_key(tup):
 
 
 def os_sorted(lst: Iterable) -> Iterable:
-    import natsort
-
     key = _custom_key
     if icu_available or platform.system() == "Windows":
-        key = natsort.os_sort_keygen()
+        key = _os_sort_key()
     return sorted(lst, key=key)
 
 
@@ -85,16 +91,64 @@ def parse_date_str(date_str: str | None) -> tuple[int | None, int | None, int |
 def get_recursive_filelist(pathlist: list[str]) -> list[str]:
     """Get a recursive list of of all files under all path items in the list"""
 
-    filelist: list[str] = []
+    return list(iter_recursive_filelist(pathlist))
+
+
+def iter_recursive_filelist(
+    pathlist: Iterable[str],
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+    file_filter: Callable[[str], bool] | None = None,
+) -> Iterator[str]:
+    """
+    Yields all files under all path items in the list as they are found.
+
+    Globs are matched against the name and the full path of each entry. When include is given only matching files
+    are yielded, files and folders matching exclude are skipped.
+    include, exclude and file_filter only apply to files found in a folder, files in pathlist are always yielded.
+    """
+    include = list(include)
+    exclude = list(exclude)
     for p in pathlist:
         if os.path.isdir(p):
-            for root, _, files in os.walk(p):
-                for f in files:
-                    filelist.append(os.path.join(root, f))
+            yield from _scan_dir(str(p), include, exclude, file_filter)
         else:
-            filelist.append(p)
+            yield p
+
 
-    return filelist
+def _glob_match(entry: os.DirEntry[str], globs: list[str]) -> bool:
+    return any(fnmatch.fnmatch(entry.name, g) or fnmatch.fnmatch(entry.path, g) for g in globs)
+
+
+def _scan_dir(
+    root: str, include: list[str], exclude: list[str], file_filter: Callable[[str], bool] | None
+) -> Iterator[str]:
+    # Same order as os.walk: the files in a folder, then each sub-folder
+    sub_dirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if exclude and _glob_match(entry, exclude):
+                    continue
+                try:
+                    if entry.is_dir():
+                        # Like os.walk symlinks to folders are not followed
+                        if not entry.is_symlink():
+                            sub_dirs.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+                if include and not _glob_match(entry, include):
+                    continue
+                if file_filter is not None and not file_filter(entry.path):
+                    continue
+                yield entry.path
+    except OSError as e:
+        logger.debug("Failed to list %s: %s", root, e)
+        return
+
+    for sub_dir in sub_dirs:
+        yield from _scan_dir(sub_dir, include, exclude, file_filter)
 
 
 def add_to_path(dirname: str) -> None:
@@ -213,11 +267,12 @@ def titles_match(search_title: str, record_title: str, threshold: int = 90) -> b
     return ratio >= threshold
 
 
-def unique_file(file_name: pathlib.Path) -> pathlib.Path:
+def unique_file(file_name: pathlib.Path, reserved: Container[pathlib.Path] = ()) -> pathlib.Path:
+    """Returns file_name or the first file_name (n) that doesn't exist and isn't in reserved"""
     name = file_name.stem
     counter = 1
     while True:
-        if not file_name.exists():
+        if not file_name.exists() and file_name not in reserved:
             return file_name
         file_name = file_name.with_stem(name + " (" + str(counter) + ")")
         counter += 1
@@ -16,23 +16,31 @@
 # limitations under the License.
 from __future__ import annotations
 
+import collections
+import concurrent.futures
 import json
 import logging
 import os
+import pathlib
 import sys
+import threading
+from collections.abc import Iterable
 from datetime import datetime
 from pprint import pprint
 
 from comicapi import utils
-from comicapi.comicarchive import ComicArchive, MetaDataStyle
+from comicapi.comicarchive import ComicArchive, MetaDataStyle, is_comic_candidate
 from comicapi.genericmetadata import GenericMetadata
+from comicapi.libraryindex import LibraryIndex
 from comictaggerlib import ctversion
 from comictaggerlib.cbltransformer import CBLTransformer
 from comictaggerlib.ctsettings import ct_ns
 from comictaggerlib.filerenamer import FileRenamer, get_rename_dir
 from comictaggerlib.graphics import graphics_path
 from comictaggerlib.issueidentifier import IssueIdentifier
+from comictaggerlib.renameplanner import RenamePlan
 from comictaggerlib.resulttypes import MultipleMatch, OnlineMatchResults
+from comictalker.comiccacher import cache_stats
 from comictalker.comictalker import ComicTalker, TalkerError
 
 logger = logging.getLogger(__name__)
@@ -43,6 +51,13 @@ class CLI:
         self.config = config
         self.talkers = talkers
         self.batch_mode = False
+        # Held while picking the name of an exported zip so parallel exports can't pick the same one
+        self.export_lock = threading.Lock()
+        # Absolute paths of the archives this run created, the lazy recursive scan must not process them
+        self.created_files: set[pathlib.Path] = set()
+        # Renames are collected while going through the files and done together at the end
+        self.rename_plan = RenamePlan()
+        self.library_index = LibraryIndex(config.runtime_config.user_cache_dir / "library_index.db")
 
     def current_talker(self) -> ComicTalker:
         if self.config.talker_source in self.talkers:
@@ -175,14 +190,43 @@ class CLI:
             return
 
         match_results = OnlineMatchResults()
-        self.batch_mode = len(self.config.runtime_files) > 1
+        self.batch_mode = self.config.runtime_recursive or len(self.config.runtime_files) > 1
 
-        for f in self.config.runtime_files:
-            self.process_file_cli(f, match_results)
-            sys.stdout.flush()
+        files: Iterable[str] = self.config.runtime_files
+        if self.config.runtime_recursive:
+            # Files are processed as they are found, only likely comics in sub-folders are returned
+            files = utils.iter_recursive_filelist(
+                files, self.config.runtime_include, self.config.runtime_exclude, is_comic_candidate
+            )
+            # Exports are written while the folders are still being scanned. Renames are done after the scan
+            files = (f for f in files if pathlib.Path(os.path.abspath(f)) not in self.created_files)
+
+        workers = self.config.runtime_export_workers
+        if self.config.commands_export_to_zip and self.batch_mode and workers > 1:
+            # Conversions spend most of their time (de)compressing which releases the GIL
+            # Only a few files are submitted ahead so the scan stays lazy
+            with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+                pending: collections.deque[concurrent.futures.Future[None]] = collections.deque()
+                for f in files:
+                    pending.append(executor.submit(self.process_file_cli, f, match_results))
+                    if len(pending) >= workers * 2:
+                        pending.popleft().result()
+                        sys.stdout.flush()
+                while pending:
+                    pending.popleft().result()
+                    sys.stdout.flush()
+        else:
+            for f in files:
+                self.process_file_cli(f, match_results)
+                sys.stdout.flush()
+
+        if self.config.commands_rename:
+            self.execute_renames()
 
         self.post_process_matches(match_results)
 
+        logger.info("Cache statistics: %s", cache_stats.report())
+
         print(f"\nFiles tagged with metadata provided by {self.current_talker().name} {self.current_talker().website}")
 
     def create_local_metadata(self, ca: ComicArchive) -> GenericMetadata:
@@ -497,17 +541,32 @@ class CLI:
             print(msg_hdr + "Filename is already good!", file=sys.stderr)
             return
 
+        self.rename_plan.add(original_path, full_path, new_name)
+
+    def execute_renames(self) -> None:
+        plan = self.rename_plan
+        self.rename_plan = RenamePlan()
+        plan.plan()
+
+        if self.config.runtime_rename_plan:
+            if self.config.runtime_rename_plan == "-":
+                print(plan.as_json())
+            else:
+                try:
+                    pathlib.Path(self.config.runtime_rename_plan).write_text(plan.as_json(), encoding="utf-8")
+                except OSError:
+                    logger.exception("Failed to write the rename plan to %s", self.config.runtime_rename_plan)
+
         suffix = ""
         if not self.config.runtime_dryrun:
-            # rename the file
-            try:
-                ca.rename(utils.unique_file(full_path))
-            except OSError:
-                logger.exception("Failed to rename comic archive: %s", ca.path)
+            if not plan.execute(index=self.library_index):
+                logger.error("Failed to rename %d comic archive(s), no files were renamed", len(plan.errors))
+                return
         else:
             suffix = " (dry-run, no change)"
 
-        print(f"renamed '{original_path.name}' -> '{new_name}' {suffix}")
+        for op in plan.operations:
+            print(f"renamed '{op.source.name}' -> '{op.label}' {suffix}")
 
     def export(self, ca: ComicArchive) -> None:
         msg_hdr = ""
@@ -519,18 +578,22 @@ class CLI:
             return
 
         filename_path = ca.path
-        new_file = filename_path.with_suffix(".cbz")
+        new_file = pathlib.Path(os.path.abspath(filename_path.with_suffix(".cbz")))
 
-        if self.config.runtime_abort_on_conflict and new_file.exists():
-            print(msg_hdr + f"{new_file.name} already exists in the that folder.")
-            return
+        with self.export_lock:
+            if self.config.runtime_abort_on_conflict and (new_file.exists() or new_file in self.created_files):
+                print(msg_hdr + f"{new_file.name} already exists in the that folder.")
+                return
 
-        new_file = utils.unique_file(new_file)
+            # Names picked by exports that are still running are taken too
+            new_file = utils.unique_file(new_file, self.created_files)
+            if not self.config.runtime_dryrun:
+                self.created_files.add(new_file)
 
         delete_success = False
         export_success = False
         if not self.config.runtime_dryrun:
-            if ca.export_as_zip(new_file):
+            if self.export_zip(ca, new_file):
                 export_success = True
                 if self.config.runtime_delete_after_zip_export:
                     try:
@@ -539,9 +602,6 @@ class CLI:
                     except OSError:
                         logger.exception(msg_hdr + "Error deleting original archive after export")
                         delete_success = False
-            else:
-                # last export failed, so remove the zip, if it exists
-                new_file.unlink(missing_ok=True)
         else:
             msg = msg_hdr + f"Dry-run:  Would try to create {os.path.split(new_file)[1]}"
             if self.config.runtime_delete_after_zip_export:
@@ -559,12 +619,30 @@ class CLI:
 
         print(msg)
 
+    def export_zip(self, ca: ComicArchive, new_file: pathlib.Path) -> bool:
+        """Exports to a temporary file that is renamed once it is complete, a failed export leaves nothing behind"""
+        # new_file is reserved for this export so the temporary name is too
+        tmp_file = new_file.with_name(f".{new_file.name}.part")
+        # The recursive scan may still be listing the folder, it must not pick up the partial archive
+        with self.export_lock:
+            self.created_files.add(tmp_file)
+        try:
+            if not ca.export_as_zip(tmp_file):
+                return False
+            tmp_file.replace(new_file)
+        except OSError:
+            logger.exception("Error moving the exported archive to %s", new_file)
+            return False
+        finally:
+            tmp_file.unlink(missing_ok=True)
+        return True
+
     def process_file_cli(self, filename: str, match_results: OnlineMatchResults) -> None:
         if not os.path.lexists(filename):
             logger.error("Cannot find %s", filename)
             return
 
-        ca = ComicArchive(filename, str(graphics_path / "nocover.png"))
+        ca = ComicArchive(filename, str(graphics_path / "nocover.png"), self.library_index)
 
         if not ca.seems_to_be_a_comic_archive():
             logger.error("Sorry, but %s is not a comic archive!", filename)
@@ -596,3 +674,5 @@ class CLI:
 
         elif self.config.commands_export_to_zip:
             self.export(ca)
+
+        ca.update_index()
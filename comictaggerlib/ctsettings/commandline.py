@@ -78,6 +78,14 @@ def register_runtime(parser: settngs.Manager) -> None:
         help="""Delete original archive after successful\nexport to Zip. (only relevant for -e)""",
         file=False,
     )
+    parser.add_setting(
+        "--export-workers",
+        type=int,
+        default=4,
+        metavar="N",
+        help="""Number of archives to export to Zip at the same time. (only relevant for -e with multiple files)\n\n""",
+        file=False,
+    )
     parser.add_setting(
         "-f",
         "--parse-filename",
@@ -136,6 +144,12 @@ def register_runtime(parser: settngs.Manager) -> None:
         help="""With -p, will print out the raw tag block(s)\nfrom the file.\n""",
         file=False,
     )
+    parser.add_setting(
+        "--rename-plan",
+        metavar="FILE",
+        help="""Write the planned renames to FILE as JSON,\n"-" prints them. (only relevant for -r)\n\n""",
+        file=False,
+    )
     parser.add_setting(
         "-R",
         "--recursive",
@@ -143,6 +157,22 @@ def register_runtime(parser: settngs.Manager) -> None:
         help="Recursively include files in sub-folders.",
         file=False,
     )
+    parser.add_setting(
+        "--include",
+        default=[],
+        action="append",
+        metavar="GLOB",
+        help="""With -R, only include files in sub-folders matching GLOB.\nMay be given multiple times.\n\n""",
+        file=False,
+    )
+    parser.add_setting(
+        "--exclude",
+        default=[],
+        action="append",
+        metavar="GLOB",
+        help="""With -R, skip files and sub-folders matching GLOB.\nMay be given multiple times.\n\n""",
+        file=False,
+    )
     parser.add_setting(
         "-S",
         "--script",
@@ -289,9 +319,6 @@ def validate_commandline_settings(config: settngs.Config[ct_ns], parser: settngs
         if not config[0].runtime_type:
             parser.exit(message="Please specify the type to copy to with -t\n", status=1)
 
-    if config[0].runtime_recursive:
-        config[0].runtime_files = utils.get_recursive_filelist(config[0].runtime_files)
-
     # take a crack at finding rar exe if it's not in the path
     if not utils.which("rar"):
         if platform.system() == "Windows":
@@ -12,6 +12,12 @@ from comictaggerlib.defaults import DEFAULT_REPLACEMENTS, Replacement, Replaceme
 def general(parser: settngs.Manager) -> None:
     # General Settings
     parser.add_setting("check_for_new_version", default=False, cmdline=False)
+    parser.add_setting(
+        "--zip-store-images",
+        default=True,
+        action=argparse.BooleanOptionalAction,
+        help="Store images in zip archives without compressing them again, other files are always compressed",
+    )
 
 
 def internal(parser: settngs.Manager) -> None:
@@ -124,6 +130,36 @@ def filename(parser: settngs.Manager) -> None:
 def talker(parser: settngs.Manager) -> None:
     # General settings for talkers
     parser.add_setting("--source", default="comicvine", help="Use a specified source by source ID")
+    parser.add_setting(
+        "--search-cache-days",
+        default=1,
+        type=int,
+        help="Number of days a cached search response is used before asking the source if it changed",
+    )
+    parser.add_setting(
+        "--series-cache-days",
+        default=7,
+        type=int,
+        help="Number of days cached series information is used before it is fetched again",
+    )
+    parser.add_setting(
+        "--issue-cache-days",
+        default=7,
+        type=int,
+        help="Number of days cached issue information is used before it is fetched again",
+    )
+    parser.add_setting(
+        "--old-series-age",
+        default=5,
+        type=int,
+        help="Series without a new issue in %(default)s years are considered old and rarely change",
+    )
+    parser.add_setting(
+        "--old-series-cache-days",
+        default=90,
+        type=int,
+        help="Number of days cached information for old series and their issues is used before it is fetched again",
+    )
 
 
 def cbl(parser: settngs.Manager) -> None:
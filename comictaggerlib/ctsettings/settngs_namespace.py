@@ -21,6 +21,7 @@ class settngs_namespace(settngs.TypedNS):
     runtime_verbose: int
     runtime_abort_on_conflict: bool
     runtime_delete_after_zip_export: bool
+    runtime_export_workers: int
     runtime_parse_filename: bool
     runtime_issue_id: str
     runtime_online: bool
@@ -29,7 +30,10 @@ class settngs_namespace(settngs.TypedNS):
     runtime_abort_on_low_confidence: bool
     runtime_summary: bool
     runtime_raw: bool
+    runtime_rename_plan: str
     runtime_recursive: bool
+    runtime_include: list[str]
+    runtime_exclude: list[str]
     runtime_script: str
     runtime_split_words: bool
     runtime_dryrun: bool
@@ -42,6 +46,7 @@ class settngs_namespace(settngs.TypedNS):
     runtime_files: list[str]
 
     general_check_for_new_version: bool
+    general_zip_store_images: bool
 
     internal_install_id: str
     internal_save_data_style: int
@@ -77,6 +82,11 @@ class settngs_namespace(settngs.TypedNS):
     filename_remove_publisher: bool
 
     talker_source: str
+    talker_search_cache_days: int
+    talker_series_cache_days: int
+    talker_issue_cache_days: int
+    talker_old_series_age: int
+    talker_old_series_cache_days: int
 
     cbl_assume_lone_credit_is_primary: bool
     cbl_copy_characters_to_tags: bool
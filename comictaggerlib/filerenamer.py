@@ -16,11 +16,12 @@
 from __future__ import annotations
 
 import calendar
+import functools
 import logging
 import os
 import pathlib
 import string
-from collections.abc import Mapping, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Any, cast
 
 from pathvalidate import Platform, normalize_platform, sanitize_filename
@@ -32,6 +33,42 @@ from comictaggerlib.defaults import DEFAULT_REPLACEMENTS, Replacement, Replaceme
 
 logger = logging.getLogger(__name__)
 
+_credit_roles = ("writer", "penciller", "inker", "colorist", "letterer", "cover artist", "editor")
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_format(format_string: str) -> tuple[tuple[str, str | None, str | None, str | None], ...]:
+    """Templates are re-used for every file, so they are only parsed once"""
+    return tuple(string.Formatter().parse(format_string))
+
+
+@functools.lru_cache(maxsize=32)
+def _template_parts(template: str) -> tuple[str, ...]:
+    return pathlib.PureWindowsPath(template).parts
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_filename(filename: str, platform: Platform) -> str:
+    """sanitize_filename is slow and the same series, publishers and creators come up again and again"""
+    return str(sanitize_filename(filename, platform=platform))
+
+
+class _Default(dict[str, Any]):
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _primary_credits(md: GenericMetadata, roles: Iterable[str]) -> dict[str, str]:
+    """Same as calling md.get_primary_credit for each role but only goes through the credits once"""
+    primary = {role.casefold(): "" for role in roles}
+    for credit in md.credits:
+        if "role" not in credit or "person" not in credit:
+            continue
+        role = credit["role"].casefold()
+        if role in primary and (primary[role] == "" or credit.get("primary")):
+            primary[role] = credit["person"]
+    return primary
+
 
 def get_rename_dir(ca: ComicArchive, rename_dir: str | pathlib.Path | None) -> pathlib.Path:
     folder = ca.path.parent.absolute()
@@ -105,7 +142,7 @@ class MetadataFormatter(string.Formatter):
             raise ValueError("Max string recursion exceeded")
         result = []
         lstrip = False
-        for literal_text, field_name, format_spec, conversion in self.parse(format_string):
+        for literal_text, field_name, format_spec, conversion in _parse_format(format_string):
             # output the literal text
             if literal_text:
                 if lstrip:
@@ -163,7 +200,7 @@ class MetadataFormatter(string.Formatter):
                     # colons and slashes get special treatment
                     fmt_obj = self.handle_replacements(fmt_obj, self.replacements.format_value)
                     fmt_obj = " ".join(fmt_obj.split())
-                    fmt_obj = str(sanitize_filename(fmt_obj, platform=self.platform))
+                    fmt_obj = _sanitize_filename(fmt_obj, self.platform)
                 result.append(fmt_obj)
 
         return "".join(result), False
@@ -189,6 +226,8 @@ class FileRenamer:
         self.move = False
         self.platform = platform
         self.replacements = replacements
+        self._formatter: MetadataFormatter | None = None
+        self._formatter_key: tuple[bool, str, Replacements] | None = None
 
     def set_metadata(self, metadata: GenericMetadata) -> None:
         self.metadata = metadata
@@ -202,22 +241,25 @@ class FileRenamer:
     def set_template(self, template: str) -> None:
         self.template = template
 
-    def determine_name(self, ext: str) -> str:
-        class Default(dict[str, Any]):
-            def __missing__(self, key: str) -> str:
-                return "{" + key + "}"
+    def formatter(self) -> MetadataFormatter:
+        """The formatter is re-used until the settings it depends on change"""
+        key = (self.smart_cleanup, self.platform, self.replacements)
+        if self._formatter is None or self._formatter_key != key:
+            self._formatter = MetadataFormatter(
+                self.smart_cleanup, platform=self.platform, replacements=self.replacements
+            )
+            self._formatter_key = key
+        return self._formatter
 
+    def determine_name(self, ext: str) -> str:
         md = self.metadata
 
-        template = self.template
-
         new_name = ""
 
-        fmt = MetadataFormatter(self.smart_cleanup, platform=self.platform, replacements=self.replacements)
-        md_dict = vars(md)
+        fmt = self.formatter()
+        md_dict = dict(vars(md))
         md_dict["issue"] = IssueString(md.issue).as_string(pad=self.issue_zero_padding)
-        for role in ["writer", "penciller", "inker", "colorist", "letterer", "cover artist", "editor"]:
-            md_dict[role] = md.get_primary_credit(role)
+        md_dict.update(_primary_credits(md, _credit_roles))
 
         if (isinstance(md.month, int) or isinstance(md.month, str) and md.month.isdigit()) and 0 < int(md.month) < 13:
             md_dict["month_name"] = calendar.month_name[int(md.month)]
@@ -226,11 +268,10 @@ class FileRenamer:
             md_dict["month_name"] = ""
             md_dict["month_abbr"] = ""
 
+        kwargs = _Default(md_dict)
         new_basename = ""
-        for component in pathlib.PureWindowsPath(template).parts:
-            new_basename = str(
-                sanitize_filename(fmt.vformat(component, args=[], kwargs=Default(md_dict)), platform=self.platform)
-            ).strip()
+        for component in _template_parts(self.template):
+            new_basename = _sanitize_filename(fmt.vformat(component, args=[], kwargs=kwargs), self.platform).strip()
             new_name = os.path.join(new_name, new_basename)
 
         new_name += ext
@@ -23,7 +23,8 @@ from typing import Callable, cast
 from PyQt5 import QtCore, QtWidgets, uic
 
 from comicapi import utils
-from comicapi.comicarchive import ComicArchive
+from comicapi.comicarchive import ComicArchive, is_comic_candidate
+from comicapi.libraryindex import LibraryIndex
 from comictaggerlib.ctsettings import ct_ns
 from comictaggerlib.graphics import graphics_path
 from comictaggerlib.optionalmsgdialog import OptionalMessageDialog
@@ -64,6 +65,7 @@ class FileSelectionList(QtWidgets.QWidget):
         uic.loadUi(ui_path / "fileselectionlist.ui", self)
 
         self.config = config
+        self.library_index = LibraryIndex(config.runtime_config.user_cache_dir / "library_index.db")
 
         reduce_widget_font_size(self.twList)
 
@@ -180,11 +182,13 @@ class FileSelectionList(QtWidgets.QWidget):
             self.listCleared.emit()
 
     def add_path_list(self, pathlist: list[str]) -> None:
-        filelist = utils.get_recursive_filelist(pathlist)
-        # we now have a list of files to add
+        # Files are added as they are found, only likely comics in sub-folders are returned
+        filelist = utils.iter_recursive_filelist(
+            pathlist, self.config.runtime_include, self.config.runtime_exclude, is_comic_candidate
+        )
 
-        # Prog dialog on Linux flakes out for small range, so scale up
-        progdialog = QtWidgets.QProgressDialog("", "Cancel", 0, len(filelist), parent=self)
+        # The number of files isn't known up front, show a busy indicator
+        progdialog = QtWidgets.QProgressDialog("", "Cancel", 0, 0, parent=self)
         progdialog.setWindowTitle("Adding Files")
         progdialog.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
         progdialog.setMinimumDuration(300)
@@ -194,11 +198,10 @@ class FileSelectionList(QtWidgets.QWidget):
         first_added = None
         rar_added_ro = False
         self.twList.setSortingEnabled(False)
-        for idx, f in enumerate(filelist):
+        for f in filelist:
             QtCore.QCoreApplication.processEvents()
             if progdialog.wasCanceled():
                 break
-            progdialog.setValue(idx + 1)
             progdialog.setLabelText(f)
             center_window_on_parent(progdialog)
             QtCore.QCoreApplication.processEvents()
@@ -276,7 +279,7 @@ class FileSelectionList(QtWidgets.QWidget):
         if self.is_list_dupe(path):
             return self.get_current_list_row(path)
 
-        ca = ComicArchive(path, str(graphics_path / "nocover.png"))
+        ca = ComicArchive(path, str(graphics_path / "nocover.png"), self.library_index)
 
         if ca.seems_to_be_a_comic_archive():
             row: int = self.twList.rowCount()
@@ -368,6 +371,7 @@ class FileSelectionList(QtWidgets.QWidget):
             except Exception:
                 pass
             fi.ca.has_cbi()
+            fi.ca.update_index()
 
     def get_selected_archive_list(self) -> list[ComicArchive]:
         ca_list: list[ComicArchive] = []
@@ -16,6 +16,7 @@
 from __future__ import annotations
 
 import argparse
+import datetime
 import json
 import locale
 import logging
@@ -28,9 +29,11 @@ from typing import cast
 
 import settngs
 
+import comicapi.archivers.zip
 import comicapi.comicarchive
 import comicapi.utils
 import comictalker
+import comictalker.comiccacher
 from comictaggerlib import cli, ctsettings
 from comictaggerlib.ctsettings import ct_ns
 from comictaggerlib.ctversion import version
@@ -99,6 +102,20 @@ def update_publishers(config: settngs.Config[ct_ns]) -> None:
             logger.exception("Failed to load publishers from %s: %s", json_file, e)
 
 
+def update_cache_policy(config: settngs.Config[ct_ns]) -> None:
+    comictalker.comiccacher.default_policy = comictalker.comiccacher.CachePolicy(
+        search_ttl=datetime.timedelta(days=config[0].talker_search_cache_days),
+        series_ttl=datetime.timedelta(days=config[0].talker_series_cache_days),
+        issue_ttl=datetime.timedelta(days=config[0].talker_issue_cache_days),
+        old_series_ttl=datetime.timedelta(days=config[0].talker_old_series_cache_days),
+        old_series_age=config[0].talker_old_series_age,
+    )
+
+
+def update_zip_compression(config: settngs.Config[ct_ns]) -> None:
+    comicapi.archivers.zip.store_images = config[0].general_zip_store_images
+
+
 class App:
     """docstring for App"""
 
@@ -181,6 +198,8 @@ class App:
 
         comicapi.utils.load_publishers()
         update_publishers(self.config)
+        update_cache_policy(self.config)
+        update_zip_compression(self.config)
 
         # manage the CV API key
         # None comparison is used so that the empty string can unset the value
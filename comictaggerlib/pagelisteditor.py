@@ -16,6 +16,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 
 from PyQt5 import QtCore, QtGui, QtWidgets, uic
 
@@ -103,7 +104,7 @@ class PageListEditor(QtWidgets.QWidget):
         self.first_front_page: int | None = None
 
         self.comic_archive: ComicArchive | None = None
-        self.pages_list: list[ImageMetadata] = []
+        self.pages_list: Sequence[ImageMetadata] = []
 
     def reset_page(self) -> None:
         self.pageWidget.clear()
@@ -309,7 +310,7 @@ class PageListEditor(QtWidgets.QWidget):
 
         self.listWidget.setFocus()
 
-    def set_data(self, comic_archive: ComicArchive, pages_list: list[ImageMetadata]) -> None:
+    def set_data(self, comic_archive: ComicArchive, pages_list: Sequence[ImageMetadata]) -> None:
         self.comic_archive = comic_archive
         self.pages_list = pages_list
         if pages_list is not None and len(pages_list) > 0:
@@ -0,0 +1,180 @@
+"""Plans and carries out renaming many files at once"""
+#
+# Copyright 2012-2014 ComicTagger Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import errno
+import json
+import logging
+import os
+import pathlib
+import shutil
+import threading
+
+from comicapi.libraryindex import LibraryIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class RenameOperation:
+    source: pathlib.Path
+    target: pathlib.Path
+    # what to show the user, usually the new name relative to the destination folder
+    label: str
+    # set when the file has to be moved out of the way of another rename first
+    temporary: pathlib.Path | None = None
+
+
+class RenamePlan:
+    """
+    Renames files in two phases.
+
+    plan() works out every target name in memory: files renamed to the same name, or to the name of a file that is
+    already there, get a unique name like utils.unique_file would give them. Files renamed to the name of another file
+    in the batch (including swaps and longer cycles) are first moved to a temporary name.
+
+    execute() creates the folders and then renames all of the files in parallel. Each completed rename is recorded in
+    the journal, if anything fails every rename in the journal is undone.
+    """
+
+    def __init__(self) -> None:
+        self.operations: list[RenameOperation] = []
+        self.journal: list[tuple[pathlib.Path, pathlib.Path]] = []
+        self.errors: list[tuple[pathlib.Path, pathlib.Path, OSError]] = []
+        self._lock = threading.Lock()
+        self._listings: dict[pathlib.Path, set[str]] = {}
+
+    def add(self, source: pathlib.Path, target: pathlib.Path, label: str = "") -> None:
+        self.operations.append(RenameOperation(source.absolute(), target.absolute(), label or target.name))
+
+    def plan(self) -> None:
+        # A file that is renamed isn't in the way of anything
+        vacated = {_key(op.source) for op in self.operations if op.source != op.target}
+        sources = {_key(op.source) for op in self.operations}
+        claimed: set[str] = set()
+
+        operations = []
+        for op in self.operations:
+            if op.source == op.target:
+                continue
+            target = op.target
+            counter = 1
+            while self._exists(target, vacated) or _key(target) in claimed:
+                target = op.target.with_stem(f"{op.target.stem} ({counter})")
+                counter += 1
+            if target != op.target:
+                op.label = str(pathlib.PurePath(op.label).with_name(target.name))
+                op.target = target
+            claimed.add(_key(target))
+            operations.append(op)
+        self.operations = operations
+
+        # Files whose name is taken by another rename in the batch are moved aside first
+        targets = {_key(op.target) for op in self.operations}
+        for op in self.operations:
+            if _key(op.source) in targets:
+                op.temporary = self._temporary_name(op.source, sources | claimed)
+                claimed.add(_key(op.temporary))
+
+    def as_json(self) -> str:
+        return json.dumps(
+            [
+                {
+                    "source": str(op.source),
+                    "target": str(op.target),
+                    "temporary": str(op.temporary) if op.temporary else None,
+                }
+                for op in self.operations
+            ],
+            indent=2,
+        )
+
+    def execute(self, workers: int = 4, index: LibraryIndex | None = None) -> bool:
+        """Returns False if any rename failed, in which case all renames have been undone"""
+        try:
+            for folder in {op.target.parent for op in self.operations}:
+                folder.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error("Failed to create folder for renaming: %s", e)
+            return False
+
+        staged = [(op.source, op.temporary) for op in self.operations if op.temporary is not None]
+        final = [(op.temporary or op.source, op.target) for op in self.operations]
+        if not (self._move_all(staged, workers) and self._move_all(final, workers)):
+            self.rollback()
+            return False
+
+        if index is not None:
+            index.move((op.source, op.target) for op in self.operations)
+        return True
+
+    def rollback(self) -> None:
+        while self.journal:
+            source, target = self.journal.pop()
+            try:
+                _move(target, source)
+            except OSError:
+                logger.exception("Failed to undo the rename of %s to %s", source, target)
+
+    def _move_all(self, moves: list[tuple[pathlib.Path, pathlib.Path]], workers: int) -> bool:
+        with concurrent.futures.ThreadPoolExecutor(max(1, workers)) as executor:
+            for _ in executor.map(lambda move: self._journaled_move(*move), moves):
+                pass
+        return not self.errors
+
+    def _journaled_move(self, source: pathlib.Path, target: pathlib.Path) -> None:
+        try:
+            _move(source, target)
+        except OSError as e:
+            logger.error("Failed to rename %s to %s: %s", source, target, e)
+            with self._lock:
+                self.errors.append((source, target, e))
+        else:
+            with self._lock:
+                self.journal.append((source, target))
+
+    def _exists(self, path: pathlib.Path, vacated: set[str]) -> bool:
+        # Each folder is listed once instead of checking every candidate name on disk
+        if path.parent not in self._listings:
+            try:
+                self._listings[path.parent] = {os.path.normcase(name) for name in os.listdir(path.parent)}
+            except OSError:
+                self._listings[path.parent] = set()
+        return os.path.normcase(path.name) in self._listings[path.parent] and _key(path) not in vacated
+
+    def _temporary_name(self, path: pathlib.Path, taken: set[str]) -> pathlib.Path:
+        counter = 0
+        while True:
+            temporary = path.with_name(f".{path.name}.ctrename{counter}")
+            if not self._exists(temporary, set()) and _key(temporary) not in taken:
+                return temporary
+            counter += 1
+
+
+def _key(path: pathlib.Path) -> str:
+    return os.path.normcase(path)
+
+
+def _move(source: pathlib.Path, target: pathlib.Path) -> None:
+    try:
+        os.rename(source, target)
+    except OSError as e:
+        # os.rename only works on the same filesystem
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source, target)
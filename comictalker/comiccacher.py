@@ -22,16 +22,133 @@ import logging
 import os
 import pathlib
 import sqlite3 as lite
+import threading
+from collections import Counter
 from typing import Any
 
+from comicapi import utils
 from comictalker.resulttypes import ComicIssue, ComicSeries, Credit
 
 logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass
+class CachedResponse:
+    """A raw response from a talker and the validators needed to revalidate it"""
+
+    key: str
+    data: str
+    etag: str | None = None
+    last_modified: str | None = None
+    timestamp: datetime.datetime = dataclasses.field(default_factory=datetime.datetime.now)
+
+    def expired(self, ttl: datetime.timedelta) -> bool:
+        return datetime.datetime.now() - self.timestamp >= ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """HTTP headers that make the request conditional, the server responds with 304 if it is unchanged"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclasses.dataclass
+class CachePolicy:
+    """
+    How long cached series and issues are used before they are fetched again.
+    Series that have not had a new issue in `old_series_age` years are unlikely to change and use `old_series_ttl`.
+
+    Talkers that cache raw responses use the same TTLs before revalidating them, see `response_ttl`.
+    """
+
+    search_ttl: datetime.timedelta = datetime.timedelta(days=1)
+    series_ttl: datetime.timedelta = datetime.timedelta(days=7)
+    issue_ttl: datetime.timedelta = datetime.timedelta(days=7)
+    old_series_ttl: datetime.timedelta = datetime.timedelta(days=90)
+    old_series_age: int = 5
+
+    @property
+    def max_ttl(self) -> datetime.timedelta:
+        return max(self.search_ttl, self.series_ttl, self.issue_ttl, self.old_series_ttl)
+
+    def is_old(self, last_year: int | None) -> bool:
+        return last_year is not None and datetime.date.today().year - last_year >= self.old_series_age
+
+    def series_ttl_for(self, last_year: int | None) -> datetime.timedelta:
+        """last_year is the year of the most recent issue of the series or the start year if unknown"""
+        if self.is_old(last_year):
+            return self.old_series_ttl
+        return self.series_ttl
+
+    def issue_ttl_for(self, last_year: int | None) -> datetime.timedelta:
+        if self.is_old(last_year):
+            return self.old_series_ttl
+        return self.issue_ttl
+
+    def response_ttl(self, entity: str) -> datetime.timedelta:
+        """
+        How long a raw response for entity ("search", "series" or "issue") is used before it is revalidated.
+        The age of the series isn't known from a request so the TTLs for new series are used.
+        """
+        return {"search": self.search_ttl, "series": self.series_ttl, "issue": self.issue_ttl}.get(
+            entity, datetime.timedelta()
+        )
+
+
+class CacheStats:
+    """Counts cache hits and misses per entity type ("search", "series", "series_issues", "issue")"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def record(self, entity: str, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits[entity] += 1
+            else:
+                self.misses[entity] += 1
+
+    def hit_ratio(self, entity: str) -> float:
+        total = self.hits[entity] + self.misses[entity]
+        return self.hits[entity] / total if total else 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+    def report(self) -> str:
+        entities = sorted(set(self.hits) | set(self.misses))
+        return "; ".join(
+            f"{e}: {self.hits[e]} hits, {self.misses[e]} misses ({self.hit_ratio(e):.0%} hit ratio)" for e in entities
+        )
+
+
+# Set by the application from its settings
+default_policy = CachePolicy()
+cache_stats = CacheStats()
+
+
+def _expired(timestamp: str, ttl: datetime.timedelta) -> bool:
+    try:
+        return datetime.datetime.now() - datetime.datetime.fromisoformat(timestamp) >= ttl
+    except (TypeError, ValueError):
+        return True
+
+
+def _year(date: str | None) -> int | None:
+    return utils.parse_date_str(date)[2] if date else None
+
+
 class ComicCacher:
-    def __init__(self, cache_folder: pathlib.Path, version: str) -> None:
+    def __init__(self, cache_folder: pathlib.Path, version: str, policy: CachePolicy | None = None) -> None:
         self.cache_folder = cache_folder
+        self.policy = policy or default_policy
         self.db_file = cache_folder / "comic_cache.db"
         self.version_file = cache_folder / "cache_version.txt"
         self.version = version
@@ -49,6 +166,9 @@ class ComicCacher:
 
         if not os.path.exists(self.db_file):
             self.create_cache_db()
+        else:
+            # Caches created before responses were cached don't have the table
+            self.create_responses_table()
 
     def clear_cache(self) -> None:
         try:
@@ -132,6 +252,24 @@ class ComicCacher:
                 + "PRIMARY KEY (id, source_name))"
             )
 
+        self.create_responses_table()
+
+    def create_responses_table(self) -> None:
+        con = lite.connect(self.db_file)
+
+        with con:
+            cur = con.cursor()
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS Responses("
+                + "key TEXT NOT NULL,"  # Normalised URL and parameters
+                + "data TEXT,"  # The raw response
+                + "etag TEXT,"
+                + "last_modified TEXT,"
+                + "timestamp DATE DEFAULT (datetime('now','localtime')), "
+                + "source_name TEXT NOT NULL,"
+                + "PRIMARY KEY (key, source_name))"
+            )
+
     def add_search_results(self, source_name: str, search_term: str, ct_search_results: list[ComicSeries]) -> None:
         con = lite.connect(self.db_file)
 
@@ -176,6 +314,12 @@ class ComicCacher:
             con.text_factory = str
             cur = con.cursor()
 
+            # purge expired searches, they are searched for again
+            cur.execute(
+                "DELETE FROM SeriesSearchCache WHERE timestamp  < ?",
+                [str(datetime.datetime.now() - self.policy.search_ttl)],
+            )
+
             cur.execute(
                 "SELECT * FROM SeriesSearchCache INNER JOIN Series on"
                 " SeriesSearchCache.id=Series.id AND SeriesSearchCache.source_name=Series.source_name"
@@ -184,6 +328,7 @@ class ComicCacher:
             )
 
             rows = cur.fetchall()
+            cache_stats.record("search", bool(rows))
             # now process the results
             for record in rows:
                 result = ComicSeries(
@@ -271,46 +416,47 @@ class ComicCacher:
                 self.upsert(cur, "issues", data)
 
     def get_series_info(self, series_id: str, source_name: str, purge: bool = True) -> ComicSeries | None:
-        result: ComicSeries | None = None
-
+        """Returns the series if it is cached and not expired, purge also deletes series too old for any policy"""
         con = lite.connect(self.db_file)
         with con:
             cur = con.cursor()
             con.text_factory = str
 
             if purge:
-                # purge stale series info
-                a_week_ago = datetime.datetime.today() - datetime.timedelta(days=7)
-                cur.execute("DELETE FROM Series WHERE timestamp  < ?", [str(a_week_ago)])
+                # purge series info too old for any policy
+                cur.execute(
+                    "DELETE FROM Series WHERE timestamp  < ?", [str(datetime.datetime.now() - self.policy.max_ttl)]
+                )
 
             # fetch
             cur.execute("SELECT * FROM Series" " WHERE id=? AND source_name=?", [series_id, source_name])
 
             row = cur.fetchone()
 
-            if row is None:
-                return result
-
-            # since ID is primary key, there is only one row
-            result = ComicSeries(
-                id=row[0],
-                name=row[1],
-                publisher=row[2],
-                count_of_issues=row[3],
-                count_of_volumes=row[4],
-                start_year=row[5],
-                image_url=row[6],
-                aliases=row[7].strip().splitlines(),
-                description=row[8],
-                genres=row[9].strip().splitlines(),
-                format=row[10],
+            hit = row is not None and not _expired(
+                row[11], self.policy.series_ttl_for(self._last_year(cur, series_id, source_name, row[5]))
             )
+            cache_stats.record("series", hit)
+            if not hit:
+                return None
 
-        return result
+            return self._series_from_row(row)
 
-    def get_series_issues_info(self, series_id: str, source_name: str) -> list[ComicIssue]:
-        # get_series_info should only fail if someone is doing something weird
-        series = self.get_series_info(series_id, source_name, False) or ComicSeries(
+    def _get_issue_series(self, series_id: str, source_name: str) -> ComicSeries:
+        """Returns the series of cached issues regardless of its age, the issues have their own TTL"""
+        con = lite.connect(self.db_file)
+        with con:
+            cur = con.cursor()
+            con.text_factory = str
+
+            cur.execute("SELECT * FROM Series" " WHERE id=? AND source_name=?", [series_id, source_name])
+            row = cur.fetchone()
+
+        if row is not None:
+            return self._series_from_row(row)
+
+        # The series should only be missing if someone is doing something weird
+        return ComicSeries(
             id=series_id,
             name="",
             description="",
@@ -323,15 +469,32 @@ class ComicCacher:
             count_of_volumes=None,
             format=None,
         )
+
+    def _series_from_row(self, row: tuple[Any, ...]) -> ComicSeries:
+        # since ID is primary key, there is only one row
+        return ComicSeries(
+            id=row[0],
+            name=row[1],
+            publisher=row[2],
+            count_of_issues=row[3],
+            count_of_volumes=row[4],
+            start_year=row[5],
+            image_url=row[6],
+            aliases=row[7].strip().splitlines(),
+            description=row[8],
+            genres=row[9].strip().splitlines(),
+            format=row[10],
+        )
+
+    def get_series_issues_info(self, series_id: str, source_name: str) -> list[ComicIssue]:
+        series = self._get_issue_series(series_id, source_name)
         con = lite.connect(self.db_file)
         with con:
             cur = con.cursor()
             con.text_factory = str
 
-            # purge stale issue info - probably issue data won't change
-            # much....
-            a_week_ago = datetime.datetime.today() - datetime.timedelta(days=7)
-            cur.execute("DELETE FROM Issues WHERE timestamp  < ?", [str(a_week_ago)])
+            # purge issue info too old for any policy
+            cur.execute("DELETE FROM Issues WHERE timestamp  < ?", [str(datetime.datetime.now() - self.policy.max_ttl)])
 
             # fetch
             results: list[ComicIssue] = []
@@ -339,6 +502,12 @@ class ComicCacher:
             cur.execute("SELECT * FROM Issues WHERE series_id=? AND source_name=?", [series_id, source_name])
             rows = cur.fetchall()
 
+            # Every issue of the series shares the TTL of the series
+            last_year = max(filter(None, [series.start_year, *(_year(row[6]) for row in rows)]), default=None)
+            ttl = self.policy.issue_ttl_for(last_year)
+            rows = [row for row in rows if not _expired(row[9], ttl)]
+            cache_stats.record("series_issues", bool(rows))
+
             # now process the results
             for row in rows:
                 credits = []
@@ -384,31 +553,22 @@ class ComicCacher:
             cur = con.cursor()
             con.text_factory = str
 
-            # purge stale issue info - probably issue data won't change
-            # much....
-            a_week_ago = datetime.datetime.today() - datetime.timedelta(days=7)
-            cur.execute("DELETE FROM Issues WHERE timestamp  < ?", [str(a_week_ago)])
+            # purge issue info too old for any policy
+            cur.execute("DELETE FROM Issues WHERE timestamp  < ?", [str(datetime.datetime.now() - self.policy.max_ttl)])
 
             cur.execute("SELECT * FROM Issues WHERE id=? AND source_name=?", [issue_id, source_name])
             row = cur.fetchone()
 
+            if row is not None and _expired(
+                row[9], self.policy.issue_ttl_for(self._last_year(cur, row[1], source_name))
+            ):
+                row = None
+            cache_stats.record("issue", row is not None)
+
             record = None
 
             if row:
-                # get_series_info should only fail if someone is doing something weird
-                series = self.get_series_info(row[1], source_name, False) or ComicSeries(
-                    id=row[1],
-                    name="",
-                    description="",
-                    genres=[],
-                    image_url="",
-                    publisher="",
-                    start_year=None,
-                    aliases=[],
-                    count_of_issues=None,
-                    count_of_volumes=None,
-                    format=None,
-                )
+                series = self._get_issue_series(row[1], source_name)
 
                 # now process the results
                 credits = []
@@ -446,6 +606,65 @@ class ComicCacher:
 
             return record
 
+    def add_response(self, source_name: str, response: CachedResponse) -> None:
+        con = lite.connect(self.db_file)
+
+        with con:
+            cur = con.cursor()
+
+            # purge responses too old for any policy
+            cur.execute(
+                "DELETE FROM Responses WHERE timestamp  < ?", [str(datetime.datetime.now() - self.policy.max_ttl)]
+            )
+
+            data = {
+                "key": response.key,
+                "source_name": source_name,
+                "data": response.data,
+                "etag": response.etag,
+                "last_modified": response.last_modified,
+                "timestamp": response.timestamp,
+            }
+            self.upsert(cur, "responses", data)
+
+    def get_response(self, source_name: str, key: str) -> CachedResponse | None:
+        """Returns the cached response regardless of age, expired responses can still be revalidated"""
+        con = lite.connect(self.db_file)
+        with con:
+            cur = con.cursor()
+            con.text_factory = str
+
+            cur.execute(
+                "SELECT key, data, etag, last_modified, timestamp FROM Responses WHERE key=? AND source_name=?",
+                [key, source_name],
+            )
+            row = cur.fetchone()
+
+            if row is None:
+                return None
+
+            return CachedResponse(
+                key=row[0],
+                data=row[1],
+                etag=row[2],
+                last_modified=row[3],
+                timestamp=datetime.datetime.fromisoformat(row[4]),
+            )
+
+    def _last_year(
+        self, cur: lite.Cursor, series_id: str, source_name: str, start_year: int | None = None
+    ) -> int | None:
+        """Returns the year of the latest cached issue of the series or start_year if there is none"""
+        cur.execute("SELECT MAX(cover_date) FROM Issues WHERE series_id=? AND source_name=?", [series_id, source_name])
+        row = cur.fetchone()
+        if row is None or not row[0]:
+            if start_year is None:
+                cur.execute("SELECT start_year FROM Series WHERE id=? AND source_name=?", [series_id, source_name])
+                row = cur.fetchone()
+                return utils.xlate_int(row[0]) if row else None
+            return utils.xlate_int(start_year)
+        return _year(row[0])
+
     def upsert(self, cur: lite.Cursor, tablename: str, data: dict[str, Any]) -> None:
         """This does an insert if the given PK doesn't exist, and an
         update it if does
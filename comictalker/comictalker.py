@@ -13,6 +13,7 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
 import logging
 import pathlib
 from typing import Any, Callable
@@ -215,3 +216,43 @@ class ComicTalker:
         return the results unfiltered.
         """
         raise NotImplementedError
+
+    async def async_search_for_series(
+        self,
+        series_name: str,
+        callback: Callable[[int, int], None] | None = None,
+        refresh_cache: bool = False,
+        literal: bool = False,
+        series_match_thresh: int = 90,
+    ) -> list[ComicSeries]:
+        """
+        Async variant of `search_for_series`.
+
+        The default implementation runs `search_for_series` in the default executor of the running event loop.
+        Talkers with a native async client should override this.
+        `callback` may be called from the executor thread.
+        """
+        return await asyncio.to_thread(
+            self.search_for_series, series_name, callback, refresh_cache, literal, series_match_thresh
+        )
+
+    async def async_fetch_comic_data(
+        self, issue_id: str | None = None, series_id: str | None = None, issue_number: str = ""
+    ) -> GenericMetadata:
+        """Async variant of `fetch_comic_data`, see `async_search_for_series`"""
+        return await asyncio.to_thread(self.fetch_comic_data, issue_id, series_id, issue_number)
+
+    async def async_fetch_issues_by_series(self, series_id: str) -> list[ComicIssue]:
+        """Async variant of `fetch_issues_by_series`, see `async_search_for_series`"""
+        return await asyncio.to_thread(self.fetch_issues_by_series, series_id)
+
+    async def async_fetch_issues_by_series_issue_num_and_year(
+        self, series_id_list: list[str], issue_number: str, year: int | None
+    ) -> list[ComicIssue]:
+        """Async variant of `fetch_issues_by_series_issue_num_and_year`, see `async_search_for_series`"""
+        return await asyncio.to_thread(
+            self.fetch_issues_by_series_issue_num_and_year, series_id_list, issue_number, year
+        )
+
+    async def async_close(self) -> None:
+        """Releases what the async variants hold for the running event loop, call it before the loop finishes"""
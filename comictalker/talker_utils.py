@@ -13,10 +13,15 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
+import copy
 import logging
 import posixpath
 import re
-from urllib.parse import urlsplit
+import threading
+from collections.abc import Awaitable, Hashable, Iterable
+from typing import Any, Callable, TypeVar
+from urllib.parse import urlencode, urlsplit
 
 from comicapi import utils
 from comicapi.genericmetadata import GenericMetadata
@@ -25,6 +30,8 @@ from comictalker.resulttypes import ComicIssue
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def fix_url(url: str) -> str:
     if not url:
@@ -229,3 +236,109 @@ def cleanup_html(string: str, remove_html_tables: bool = False) -> str:
             newstring.replace("{}", "")
 
     return newstring
+
+
+def request_key(url: str, params: dict[str, Any]) -> tuple[str, tuple[tuple[str, Any], ...]]:
+    """Returns a hashable key for a request to url with the given params"""
+    return url, tuple(sorted((k, str(v)) for k, v in params.items()))
+
+
+def response_cache_key(url: str, params: dict[str, Any], exclude: Iterable[str] = ("api_key",)) -> str:
+    """
+    Returns a normalised URL used to cache the response to a request.
+    Parameters are sorted and any in `exclude` (e.g. secrets) are removed.
+    """
+    tmp_url = urlsplit(url)
+    path = posixpath.normpath(tmp_url.path) if tmp_url.path else ""
+    query = urlencode(sorted((k, str(v)) for k, v in params.items() if k not in exclude))
+    return tmp_url._replace(
+        scheme=tmp_url.scheme.casefold(), netloc=tmp_url.netloc.casefold(), path=path, query=query
+    ).geturl()
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.exception: BaseException | None = None
+
+
+class _Abandoned(Exception):
+    """Set on a shared future when the coroutine making the call is cancelled, a waiting coroutine takes over"""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single call.
+
+    While a call for a key is in flight every other caller with the same key waits for it and receives a shallow copy
+    of the result (or the same exception) instead of making its own call.
+    If the coroutine making the call is cancelled one of the waiting coroutines makes the call instead.
+    Threads and coroutines are tracked separately, a coroutine never waits on a thread or vice versa.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._async_calls: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future[Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return copy.copy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def async_do(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        # Futures belong to a single event loop
+        loop_key = (loop, key)
+        while True:
+            with self._lock:
+                future = self._async_calls.get(loop_key)
+                leader = future is None
+                if future is None:
+                    future = self._async_calls[loop_key] = loop.create_future()
+
+            if leader:
+                break
+            try:
+                # Shield the shared future so a cancelled waiter doesn't cancel it for everyone else
+                return copy.copy(await asyncio.shield(future))
+            except _Abandoned:
+                # The entry is removed before waiters wake up, the first one to get here makes the call
+                continue
+
+        try:
+            result = await fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(_Abandoned())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved, there may not be anyone waiting
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
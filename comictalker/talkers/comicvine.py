@@ -17,12 +17,18 @@ ComicVine information source
 from __future__ import annotations
 
 import argparse
+import asyncio
+import collections
+import dataclasses
+import datetime
 import json
 import logging
 import pathlib
+import posixpath
 import time
+from collections.abc import AsyncIterator, Iterator, Mapping
 from typing import Any, Callable, Generic, TypeVar
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 
 import requests
 import settngs
@@ -33,10 +39,17 @@ import comictalker.talker_utils as talker_utils
 from comicapi import utils
 from comicapi.genericmetadata import GenericMetadata
 from comicapi.issuestring import IssueString
-from comictalker.comiccacher import ComicCacher
+from comictalker.comiccacher import CachedResponse, ComicCacher
 from comictalker.comictalker import ComicTalker, TalkerDataError, TalkerNetworkError
 from comictalker.resulttypes import ComicIssue, ComicSeries, Credit
 
+try:
+    import aiohttp
+
+    async_support = True
+except ImportError:
+    async_support = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +58,14 @@ class CVTypeID:
     Issue = "4000"
 
 
+class CVFieldList:
+    """Only the fields the formatters use are requested, full responses include every issue of a series"""
+
+    Series = "aliases,count_of_issues,description,id,image,name,publisher,start_year"
+    Issues = "aliases,associated_images,cover_date,description,id,image,issue_number,name,site_detail_url,volume"
+    Issue = Issues + ",character_credits,location_credits,person_credits,story_arc_credits,team_credits"
+
+
 class CVImage(TypedDict, total=False):
     icon_url: str
     medium_url: str
@@ -157,6 +178,50 @@ custom_limiter = Limiter(RequestRate(10, 10))
 default_limiter = Limiter(RequestRate(1, 5))
 
 
+@dataclasses.dataclass
+class _SeriesSearch:
+    """Collects the pages of a series search and decides if the next page is needed"""
+
+    search_series_name: str
+    format_results: Callable[[list[CVSeries]], list[ComicSeries]]
+    callback: Callable[[int, int], None] | None
+    literal: bool
+    series_match_thresh: int
+    results: list[ComicSeries] = dataclasses.field(default_factory=list)
+    current_result_count: int = 0
+    total_result_count: int | None = None
+
+    def add_page(self, cv_response: CVResult[list[CVSeries]]) -> bool:
+        """Formats a page as it arrives so the raw pages don't have to be kept, returns True to request another page"""
+        # see http://api.comicvine.com/documentation/#handling_responses
+        if self.total_result_count is None:
+            # 8 Dec 2018 - Comic Vine changed query results again. Terms are now
+            # ORed together, and we get thousands of results.  Good news is the
+            # results are sorted by relevance, so we can be smart about halting the search.
+            # 1. Don't fetch more than some sane amount of pages.
+            # 2. Halt when any result on the current page is less than or equal to a set ratio using thefuzz
+            max_results = 500  # 5 pages
+            self.total_result_count = min(cv_response["number_of_total_results"], max_results)
+
+        self.results.extend(self.format_results(cv_response["results"]))
+        self.current_result_count += cv_response["number_of_page_results"]
+
+        if self.callback is not None:
+            self.callback(self.current_result_count, self.total_result_count)
+        else:
+            logger.debug(f"Found {self.current_result_count} of {self.total_result_count} results")
+
+        # see if we need to keep asking for more pages...
+        if not cv_response["number_of_page_results"] or self.current_result_count >= self.total_result_count:
+            return False
+
+        # Stop searching once any entry falls below the threshold
+        return self.literal or all(
+            utils.titles_match(self.search_series_name, series["name"], self.series_match_thresh)
+            for series in cv_response["results"]
+        )
+
+
 class ComicVineTalker(ComicTalker):
     name: str = "Comic Vine"
     id: str = "comicvine"
@@ -172,6 +237,10 @@ class ComicVineTalker(ComicTalker):
         self.default_api_key = self.api_key = "27431e6787042105bd3e47e169a624521f89f3a4"
         self.remove_html_tables: bool = False
         self.use_series_start_as_volume: bool = False
+        # Shares in-flight requests between concurrent identifications
+        self.single_flight = talker_utils.SingleFlight()
+        # aiohttp sessions are bound to the event loop that created them
+        self._async_sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
 
     def register_settings(self, parser: settngs.Manager) -> None:
         parser.add_setting(
@@ -245,149 +314,214 @@ class ComicVineTalker(ComicTalker):
         literal: bool = False,
         series_match_thresh: int = 90,
     ) -> list[ComicSeries]:
-        # Sanitize the series name for comicvine searching, comicvine search ignore symbols
-        search_series_name = utils.sanitize_title(series_name, literal)
-        logger.info(f"{self.name} searching: {search_series_name}")
-
-        # Before we search online, look in our cache, since we might have done this same search recently
-        # For literal searches always retrieve from online
-        cvc = ComicCacher(self.cache_folder, self.version)
-        if not refresh_cache and not literal:
-            cached_search_results = cvc.get_search_results(self.id, series_name)
-
-            if len(cached_search_results) > 0:
-                return cached_search_results
-
-        params = {  # CV uses volume to mean series
-            "api_key": self.api_key,
-            "format": "json",
-            "resources": "volume",
-            "query": search_series_name,
-            "field_list": "volume,name,id,start_year,publisher,image,description,count_of_issues,aliases",
-            "page": 1,
-            "limit": 100,
-        }
+        # Identical concurrent searches share one search, progress can only be reported to the caller making it
+        if callback is not None:
+            return self._search_for_series(series_name, callback, refresh_cache, literal, series_match_thresh)
+        return self.single_flight.do(
+            ("search", series_name, refresh_cache, literal, series_match_thresh),
+            self._search_for_series,
+            series_name,
+            callback,
+            refresh_cache,
+            literal,
+            series_match_thresh,
+        )
 
-        cv_response: CVResult[list[CVSeries]] = self._get_cv_content(urljoin(self.api_url, "search"), params)
+    def _search_for_series(
+        self,
+        series_name: str,
+        callback: Callable[[int, int], None] | None,
+        refresh_cache: bool,
+        literal: bool,
+        series_match_thresh: int,
+    ) -> list[ComicSeries]:
+        search = self._start_search(series_name, callback, refresh_cache, literal, series_match_thresh)
+        if search.results:
+            return search.results
 
-        search_results: list[CVSeries] = []
+        url, params = self._search_request(search.search_series_name)
+        while search.add_page(self._get_cv_content(url, params)):
+            params["page"] += 1
 
-        # see http://api.comicvine.com/documentation/#handling_responses
+        return self._store_search_results(series_name, search.results)
 
-        current_result_count = cv_response["number_of_page_results"]
-        total_result_count = cv_response["number_of_total_results"]
+    def fetch_comic_data(
+        self, issue_id: str | None = None, series_id: str | None = None, issue_number: str = ""
+    ) -> GenericMetadata:
+        comic_data = GenericMetadata()
+        if issue_id:
+            comic_data = self._fetch_issue_data_by_issue_id(issue_id)
+        elif issue_number and series_id:
+            comic_data = self._fetch_issue_data(int(series_id), issue_number)
 
-        # 8 Dec 2018 - Comic Vine changed query results again. Terms are now
-        # ORed together, and we get thousands of results.  Good news is the
-        # results are sorted by relevance, so we can be smart about halting the search.
-        # 1. Don't fetch more than some sane amount of pages.
-        # 2. Halt when any result on the current page is less than or equal to a set ratio using thefuzz
-        max_results = 500  # 5 pages
+        return comic_data
 
-        total_result_count = min(total_result_count, max_results)
+    def fetch_issues_by_series(self, series_id: str) -> list[ComicIssue]:
+        # before we search online, look in our cache, since we might already have this info
+        cvc = ComicCacher(self.cache_folder, self.version)
+        cached_series_issues_result = cvc.get_series_issues_info(series_id, self.id)
 
-        if callback is None:
-            logger.debug(
-                f"Found {cv_response['number_of_page_results']} of {cv_response['number_of_total_results']} results"
-            )
-        search_results.extend(cv_response["results"])
-        page = 1
+        series_data = self._fetch_series_data(int(series_id))
 
-        if callback is not None:
-            callback(current_result_count, total_result_count)
+        if len(cached_series_issues_result) == series_data.count_of_issues:
+            return cached_series_issues_result
 
-        # see if we need to keep asking for more pages...
-        while current_result_count < total_result_count:
-            if not literal:
-                # Stop searching once any entry falls below the threshold
-                stop_searching = any(
-                    not utils.titles_match(search_series_name, series["name"], series_match_thresh)
-                    for series in cv_response["results"]
-                )
+        # Format to expected output
+        formatted_series_issues_result: list[ComicIssue] = []
+        for cv_response in self._get_cv_pages(*self._series_issues_request(series_id)):
+            formatted_series_issues_result.extend(self._format_issue_results(cv_response["results"]))
 
-                if stop_searching:
-                    break
+        cvc.add_series_issues_info(self.id, formatted_series_issues_result)
 
-            if callback is None:
-                logger.debug(f"getting another page of results {current_result_count} of {total_result_count}...")
-            page += 1
+        return formatted_series_issues_result
 
-            params["page"] = page
-            cv_response = self._get_cv_content(urljoin(self.api_url, "search"), params)
+    def fetch_issues_by_series_issue_num_and_year(
+        self, series_id_list: list[str], issue_number: str, year: str | int | None
+    ) -> list[ComicIssue]:
+        formatted_filtered_issues_result: list[ComicIssue] = []
+        for cv_response in self._get_cv_pages(*self._filtered_issues_request(series_id_list, issue_number, year)):
+            formatted_filtered_issues_result.extend(self._format_issue_results(cv_response["results"]))
 
-            search_results.extend(cv_response["results"])
-            current_result_count += cv_response["number_of_page_results"]
+        return formatted_filtered_issues_result
 
-            if callback is not None:
-                callback(current_result_count, total_result_count)
+    async def async_search_for_series(
+        self,
+        series_name: str,
+        callback: Callable[[int, int], None] | None = None,
+        refresh_cache: bool = False,
+        literal: bool = False,
+        series_match_thresh: int = 90,
+    ) -> list[ComicSeries]:
+        if callback is not None:
+            return await self._async_search_for_series(
+                series_name, callback, refresh_cache, literal, series_match_thresh
+            )
+        return await self.single_flight.async_do(
+            ("search", series_name, refresh_cache, literal, series_match_thresh),
+            self._async_search_for_series,
+            series_name,
+            callback,
+            refresh_cache,
+            literal,
+            series_match_thresh,
+        )
 
-        # Format result to ComicIssue
-        formatted_search_results = self._format_search_results(search_results)
+    async def _async_search_for_series(
+        self,
+        series_name: str,
+        callback: Callable[[int, int], None] | None,
+        refresh_cache: bool,
+        literal: bool,
+        series_match_thresh: int,
+    ) -> list[ComicSeries]:
+        search = self._start_search(series_name, callback, refresh_cache, literal, series_match_thresh)
+        if search.results:
+            return search.results
 
-        # Cache these search results, even if it's literal we cache the results
-        # The most it will cause is extra processing time
-        cvc.add_search_results(self.id, series_name, formatted_search_results)
+        url, params = self._search_request(search.search_series_name)
+        while search.add_page(await self._async_get_cv_content(url, params)):
+            params["page"] += 1
 
-        return formatted_search_results
+        return self._store_search_results(series_name, search.results)
 
-    def fetch_comic_data(
+    async def async_fetch_comic_data(
         self, issue_id: str | None = None, series_id: str | None = None, issue_number: str = ""
     ) -> GenericMetadata:
         comic_data = GenericMetadata()
         if issue_id:
-            comic_data = self._fetch_issue_data_by_issue_id(issue_id)
+            comic_data = await self._async_fetch_issue_data_by_issue_id(issue_id)
         elif issue_number and series_id:
-            comic_data = self._fetch_issue_data(int(series_id), issue_number)
+            comic_data = await self._async_fetch_issue_data(int(series_id), issue_number)
 
         return comic_data
 
-    def fetch_issues_by_series(self, series_id: str) -> list[ComicIssue]:
-        # before we search online, look in our cache, since we might already have this info
+    async def async_fetch_issues_by_series(self, series_id: str) -> list[ComicIssue]:
         cvc = ComicCacher(self.cache_folder, self.version)
         cached_series_issues_result = cvc.get_series_issues_info(series_id, self.id)
 
-        series_data = self._fetch_series_data(int(series_id))
+        series_data = await self._async_fetch_series_data(int(series_id))
 
         if len(cached_series_issues_result) == series_data.count_of_issues:
             return cached_series_issues_result
 
-        params = {  # CV uses volume to mean series
-            "api_key": self.api_key,
-            "filter": f"volume:{series_id}",
-            "format": "json",
-            "field_list": "id,volume,issue_number,name,image,cover_date,site_detail_url,description,aliases,associated_images",
-            "offset": 0,
-        }
-        cv_response: CVResult[list[CVIssue]] = self._get_cv_content(urljoin(self.api_url, "issues/"), params)
+        formatted_series_issues_result: list[ComicIssue] = []
+        async for cv_response in self._async_get_cv_pages(*self._series_issues_request(series_id)):
+            formatted_series_issues_result.extend(await self._async_format_issue_results(cv_response["results"]))
 
-        current_result_count = cv_response["number_of_page_results"]
-        total_result_count = cv_response["number_of_total_results"]
+        cvc.add_series_issues_info(self.id, formatted_series_issues_result)
 
-        series_issues_result = cv_response["results"]
-        page = 1
-        offset = 0
+        return formatted_series_issues_result
 
-        # see if we need to keep asking for more pages...
-        while current_result_count < total_result_count:
-            page += 1
-            offset += cv_response["number_of_page_results"]
+    async def async_fetch_issues_by_series_issue_num_and_year(
+        self, series_id_list: list[str], issue_number: str, year: str | int | None
+    ) -> list[ComicIssue]:
+        formatted_filtered_issues_result: list[ComicIssue] = []
+        async for cv_response in self._async_get_cv_pages(
+            *self._filtered_issues_request(series_id_list, issue_number, year)
+        ):
+            formatted_filtered_issues_result.extend(await self._async_format_issue_results(cv_response["results"]))
 
-            params["offset"] = offset
-            cv_response = self._get_cv_content(urljoin(self.api_url, "issues/"), params)
+        return formatted_filtered_issues_result
 
-            series_issues_result.extend(cv_response["results"])
-            current_result_count += cv_response["number_of_page_results"]
+    async def async_close(self) -> None:
+        session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
 
-        # Format to expected output
-        formatted_series_issues_result = self._format_issue_results(series_issues_result)
+    def _start_search(
+        self,
+        series_name: str,
+        callback: Callable[[int, int], None] | None,
+        refresh_cache: bool,
+        literal: bool,
+        series_match_thresh: int,
+    ) -> _SeriesSearch:
+        """The search holds the cached results if there are any"""
+        # Sanitize the series name for comicvine searching, comicvine search ignore symbols
+        search_series_name = utils.sanitize_title(series_name, literal)
+        logger.info(f"{self.name} searching: {search_series_name}")
+        search = _SeriesSearch(search_series_name, self._format_search_results, callback, literal, series_match_thresh)
 
-        cvc.add_series_issues_info(self.id, formatted_series_issues_result)
+        # Before we search online, look in our cache, since we might have done this same search recently
+        # For literal searches always retrieve from online
+        if not refresh_cache and not literal:
+            cvc = ComicCacher(self.cache_folder, self.version)
+            search.results = cvc.get_search_results(self.id, series_name)
 
-        return formatted_series_issues_result
+        return search
 
-    def fetch_issues_by_series_issue_num_and_year(
+    def _store_search_results(self, series_name: str, results: list[ComicSeries]) -> list[ComicSeries]:
+        # Cache these search results, even if it's literal we cache the results
+        # The most it will cause is extra processing time
+        cvc = ComicCacher(self.cache_folder, self.version)
+        cvc.add_search_results(self.id, series_name, results)
+        return results
+
+    def _search_request(self, search_series_name: str) -> tuple[str, dict[str, Any]]:
+        params = {  # CV uses volume to mean series
+            "api_key": self.api_key,
+            "format": "json",
+            "resources": "volume",
+            "query": search_series_name,
+            "field_list": CVFieldList.Series,
+            "page": 1,
+            "limit": 100,
+        }
+        return urljoin(self.api_url, "search"), params
+
+    def _series_issues_request(self, series_id: str) -> tuple[str, dict[str, Any]]:
+        params = {  # CV uses volume to mean series
+            "api_key": self.api_key,
+            "filter": f"volume:{series_id}",
+            "format": "json",
+            "field_list": CVFieldList.Issues,
+            "offset": 0,
+        }
+        return urljoin(self.api_url, "issues/"), params
+
+    def _filtered_issues_request(
         self, series_id_list: list[str], issue_number: str, year: str | int | None
-    ) -> list[ComicIssue]:
+    ) -> tuple[str, dict[str, Any]]:
         series_filter = ""
         for vid in series_id_list:
             series_filter += str(vid) + "|"
@@ -397,93 +531,232 @@ class ComicVineTalker(ComicTalker):
         if int_year is not None:
             flt += f",cover_date:{int_year}-1-1|{int_year + 1}-1-1"
 
-        params: dict[str, str | int] = {  # CV uses volume to mean series
+        params: dict[str, Any] = {  # CV uses volume to mean series
             "api_key": self.api_key,
             "format": "json",
-            "field_list": "id,volume,issue_number,name,image,cover_date,site_detail_url,description,aliases,associated_images",
+            "field_list": CVFieldList.Issues,
             "filter": flt,
         }
+        return urljoin(self.api_url, "issues/"), params
 
-        cv_response: CVResult[list[CVIssue]] = self._get_cv_content(urljoin(self.api_url, "issues/"), params)
+    def _series_request(self, series_id: int) -> tuple[str, dict[str, Any]]:
+        params = {
+            "api_key": self.api_key,
+            "format": "json",
+            "field_list": CVFieldList.Series,
+        }
+        # CV uses volume to mean series
+        return urljoin(self.api_url, f"volume/{CVTypeID.Volume}-{series_id}"), params
 
-        current_result_count = cv_response["number_of_page_results"]
-        total_result_count = cv_response["number_of_total_results"]
+    def _issue_request(self, issue_id: str) -> tuple[str, dict[str, Any]]:
+        params = {"api_key": self.api_key, "format": "json", "field_list": CVFieldList.Issue}
+        return urljoin(self.api_url, f"issue/{CVTypeID.Issue}-{issue_id}"), params
 
-        filtered_issues_result = cv_response["results"]
-        page = 1
-        offset = 0
+    def _get_cv_content(self, url: str, params: dict[str, Any]) -> CVResult:
+        """
+        Get the content from the CV server.
+        Concurrent identical requests are only sent once.
+        """
+        return self.single_flight.do(talker_utils.request_key(url, params), self._get_limited_cv_content, url, params)
 
-        # see if we need to keep asking for more pages...
-        while current_result_count < total_result_count:
-            page += 1
-            offset += cv_response["number_of_page_results"]
+    def _get_limited_cv_content(self, url: str, params: dict[str, Any]) -> CVResult:
+        # Fresh responses don't count against the rate limit
+        cached, fresh = self._get_cached_response(url, params)
+        if cached is not None and fresh:
+            return json.loads(cached.data)
 
-            params["offset"] = offset
-            cv_response = self._get_cv_content(urljoin(self.api_url, "issues/"), params)
+        with self.limiter.ratelimit("cv", delay=True):
+            return self._check_cv_response(self._get_url_content(url, params, cached))
 
-            filtered_issues_result.extend(cv_response["results"])
-            current_result_count += cv_response["number_of_page_results"]
+    def _get_cv_pages(self, url: str, params: dict[str, Any]) -> Iterator[CVResult]:
+        """Yields every page of an offset paginated CV query as it arrives"""
+        cv_response: CVResult = self._get_cv_content(url, params)
+        yield cv_response
 
-        formatted_filtered_issues_result = self._format_issue_results(filtered_issues_result)
+        # see if we need to keep asking for more pages...
+        while self._next_offset(params, cv_response):
+            cv_response = self._get_cv_content(url, params)
+            yield cv_response
+
+    def _get_url_content(self, url: str, params: dict[str, Any], cached: CachedResponse | None = None) -> Any:
+        """If cached is given the request is conditional and the cached response is used if it is unchanged"""
+        attempts: collections.Counter[int] = collections.Counter()
+        while True:
+            try:
+                resp = requests.get(url, params=params, headers=self._request_headers(cached))
+            except requests.exceptions.Timeout:
+                logger.debug(f"Connection to {self.name} timed out.")
+                raise TalkerNetworkError(self.name, 4)
+            except requests.exceptions.RequestException as e:
+                logger.debug(f"Request exception: {e}")
+                raise TalkerNetworkError(self.name, 0, str(e)) from e
 
-        return formatted_filtered_issues_result
+            cv_response = self._handle_response(url, params, cached, resp.status_code, resp.text, resp.headers)
+            if cv_response is not None:
+                return cv_response
+            time.sleep(self._retry_delay(resp.status_code, attempts))
 
-    def _get_cv_content(self, url: str, params: dict[str, Any]) -> CVResult:
+    async def _async_get_cv_content(self, url: str, params: dict[str, Any]) -> CVResult:
         """
-        Get the content from the CV server.
+        Get the content from the CV server without blocking the event loop.
+        Concurrent identical requests are only sent once.
         """
-        with self.limiter.ratelimit("cv", delay=True):
-            cv_response: CVResult = self._get_url_content(url, params)
+        return await self.single_flight.async_do(
+            talker_utils.request_key(url, params), self._async_get_limited_cv_content, url, params
+        )
 
-            if cv_response["status_code"] != 1:
-                logger.debug(
-                    f"{self.name} query failed with error #{cv_response['status_code']}:  [{cv_response['error']}]."
-                )
-                raise TalkerNetworkError(self.name, 0, f"{cv_response['status_code']}: {cv_response['error']}")
+    async def _async_get_limited_cv_content(self, url: str, params: dict[str, Any]) -> CVResult:
+        cached, fresh = self._get_cached_response(url, params)
+        if cached is not None and fresh:
+            return json.loads(cached.data)
 
-            return cv_response
+        async with self.limiter.ratelimit("cv", delay=True):
+            return self._check_cv_response(await self._async_get_url_content(url, params, cached))
 
-    def _get_url_content(self, url: str, params: dict[str, Any]) -> Any:
-        # if there is a 500 error, try a few more times before giving up
-        limit_counter = 0
-        tries = 0
-        while tries < 4:
-            try:
-                resp = requests.get(url, params=params, headers={"user-agent": "comictagger/" + self.version})
-                if resp.status_code == 200:
-                    return resp.json()
-                if resp.status_code == 500:
-                    logger.debug(f"Try #{tries + 1}: ")
-                    time.sleep(1)
-                    logger.debug(str(resp.status_code))
-                    tries += 1
-                if resp.status_code == requests.status_codes.codes.TOO_MANY_REQUESTS:
-                    logger.info(f"{self.name} rate limit encountered. Waiting for 10 seconds\n")
-                    time.sleep(10)
-                    limit_counter += 1
-                    if limit_counter > 3:
-                        # Tried 3 times, inform user to check CV website.
-                        logger.error(f"{self.name} rate limit error. Exceeded 3 retires.")
-                        raise TalkerNetworkError(
-                            self.name,
-                            3,
-                            "Rate Limit Error: Check your current API usage limit at https://comicvine.gamespot.com/api/",
-                        )
-                else:
-                    break
+    async def _async_get_cv_pages(self, url: str, params: dict[str, Any]) -> AsyncIterator[CVResult]:
+        """Yields every page of an offset paginated CV query as it arrives"""
+        cv_response: CVResult = await self._async_get_cv_content(url, params)
+        yield cv_response
 
-            except requests.exceptions.Timeout:
+        while self._next_offset(params, cv_response):
+            cv_response = await self._async_get_cv_content(url, params)
+            yield cv_response
+
+    async def _async_get_url_content(
+        self, url: str, params: dict[str, Any], cached: CachedResponse | None = None
+    ) -> Any:
+        if not async_support:
+            # No async HTTP client is available, use the blocking client in a thread
+            return await asyncio.to_thread(self._get_url_content, url, params, cached)
+
+        session = self._async_session()
+        # aiohttp only accepts str, int and float parameters
+        query = {k: str(v) if isinstance(v, bool) else v for k, v in params.items()}
+
+        attempts: collections.Counter[int] = collections.Counter()
+        while True:
+            try:
+                async with session.get(url, params=query, headers=self._request_headers(cached)) as resp:
+                    status, text, headers = resp.status, await resp.text(), resp.headers
+            except asyncio.TimeoutError:
                 logger.debug(f"Connection to {self.name} timed out.")
                 raise TalkerNetworkError(self.name, 4)
-            except requests.exceptions.RequestException as e:
+            except aiohttp.ClientError as e:
                 logger.debug(f"Request exception: {e}")
                 raise TalkerNetworkError(self.name, 0, str(e)) from e
+
+            cv_response = self._handle_response(url, params, cached, status, text, headers)
+            if cv_response is not None:
+                return cv_response
+            await asyncio.sleep(self._retry_delay(status, attempts))
+
+    def _async_session(self) -> aiohttp.ClientSession:
+        """Returns the session of the running event loop, a session can only be used by the loop that created it"""
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            # Sessions of finished loops can't be closed anymore, let them go
+            self._async_sessions = {
+                session_loop: loop_session
+                for session_loop, loop_session in self._async_sessions.items()
+                if not session_loop.is_closed()
+            }
+            # Only the static headers are set on the session, conditional headers are per request
+            session = aiohttp.ClientSession(headers={"user-agent": "comictagger/" + self.version})
+            self._async_sessions[loop] = session
+        return session
+
+    def _request_headers(self, cached: CachedResponse | None) -> dict[str, str]:
+        if cached is None:
+            return {"user-agent": "comictagger/" + self.version}
+        return {"user-agent": "comictagger/" + self.version, **cached.conditional_headers()}
+
+    def _get_cached_response(self, url: str, params: dict[str, Any]) -> tuple[CachedResponse | None, bool]:
+        """Returns the cached response and whether it can be used without being revalidated"""
+        cvc = ComicCacher(self.cache_folder, self.version)
+        cached = cvc.get_response(self.id, talker_utils.response_cache_key(url, params))
+        return cached, cached is not None and not cached.expired(cvc.policy.response_ttl(self._response_entity(url)))
+
+    def _handle_response(
+        self,
+        url: str,
+        params: dict[str, Any],
+        cached: CachedResponse | None,
+        status: int,
+        text: str,
+        headers: Mapping[str, str],
+    ) -> Any:
+        """Returns the decoded response and caches it, returns None if the request needs to be retried"""
+        if status == 304 and cached is not None:
+            self._cache_response(dataclasses.replace(cached, timestamp=datetime.datetime.now()))
+            return json.loads(cached.data)
+        if status == 200:
+            try:
+                cv_response = json.loads(text)
             except json.JSONDecodeError as e:
                 logger.debug(f"JSON decode error: {e}")
                 raise TalkerDataError(self.name, 2, "ComicVine did not provide json")
+            self._cache_response(
+                CachedResponse(
+                    talker_utils.response_cache_key(url, params),
+                    text,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                ),
+                cv_response,
+            )
+            return cv_response
+        return None
 
+    def _retry_delay(self, status: int, attempts: collections.Counter[int]) -> int:
+        """Returns how many seconds to wait before retrying a failed request, raises if it should not be retried"""
+        attempts[status] += 1
+        # if there is a 500 error, try a few more times before giving up
+        if status == 500 and attempts[status] < 4:
+            logger.debug(f"Try #{attempts[status]}: {status}")
+            return 1
+        if status == requests.status_codes.codes.TOO_MANY_REQUESTS:
+            if attempts[status] > 3:
+                # Tried 3 times, inform user to check CV website.
+                logger.error(f"{self.name} rate limit error. Exceeded 3 retires.")
+                raise TalkerNetworkError(
+                    self.name,
+                    3,
+                    "Rate Limit Error: Check your current API usage limit at https://comicvine.gamespot.com/api/",
+                )
+            logger.info(f"{self.name} rate limit encountered. Waiting for 10 seconds\n")
+            return 10
         raise TalkerNetworkError(self.name, 5)
 
+    def _check_cv_response(self, cv_response: CVResult) -> CVResult:
+        if cv_response["status_code"] != 1:
+            logger.debug(
+                f"{self.name} query failed with error #{cv_response['status_code']}:  [{cv_response['error']}]."
+            )
+            raise TalkerNetworkError(self.name, 0, f"{cv_response['status_code']}: {cv_response['error']}")
+        return cv_response
+
+    def _next_offset(self, params: dict[str, Any], cv_response: CVResult) -> bool:
+        """Moves the offset in params to the next page, returns False if there are no more pages"""
+        offset = params.get("offset", 0) + cv_response["number_of_page_results"]
+        if not cv_response["number_of_page_results"] or offset >= cv_response["number_of_total_results"]:
+            return False
+        params["offset"] = offset
+        return True
+
+    def _response_entity(self, url: str) -> str:
+        """Returns the cache policy entity of the responses from the endpoint of url"""
+        endpoint = posixpath.relpath(urlsplit(url).path, urlsplit(self.api_url).path).split("/")[0]
+        # CV uses volume to mean series
+        return {"search": "search", "volume": "series", "issues": "series", "issue": "issue"}.get(endpoint, "")
+
+    def _cache_response(self, response: CachedResponse, cv_response: Any = None) -> None:
+        """Stores the raw response, responses that CV reports as errors are not stored"""
+        if cv_response is not None and cv_response.get("status_code") != 1:
+            return
+        cvc = ComicCacher(self.cache_folder, self.version)
+        cvc.add_response(self.id, response)
+
     def _format_search_results(self, search_results: list[CVSeries]) -> list[ComicSeries]:
         formatted_results = []
         for record in search_results:
@@ -520,7 +793,10 @@ class ComicVineTalker(ComicTalker):
 
         return formatted_results
 
-    def _format_issue_results(self, issue_results: list[CVIssue], complete: bool = False) -> list[ComicIssue]:
+    def _format_issue_results(
+        self, issue_results: list[CVIssue], complete: bool = False, series_data: dict[str, ComicSeries] | None = None
+    ) -> list[ComicIssue]:
+        """series_data is a mapping of already fetched series, any series not in it will be fetched"""
         formatted_results = []
         for record in issue_results:
             # Extract image super
@@ -558,7 +834,10 @@ class ComicVineTalker(ComicTalker):
                 for person in record["person_credits"]:
                     persons_list.append(Credit(name=person["name"], role=person["role"]))
 
-            series = self._fetch_series_data(record["volume"]["id"])
+            if series_data and str(record["volume"]["id"]) in series_data:
+                series = series_data[str(record["volume"]["id"])]
+            else:
+                series = self._fetch_series_data(record["volume"]["id"])
 
             formatted_results.append(
                 ComicIssue(
@@ -592,6 +871,10 @@ class ComicVineTalker(ComicTalker):
         return formatted_results
 
     def _fetch_series_data(self, series_id: int) -> ComicSeries:
+        # Coalesced so concurrent lookups of a series only fetch and cache it once
+        return self.single_flight.do(("series", str(series_id)), self._fetch_series, series_id)
+
+    def _fetch_series(self, series_id: int) -> ComicSeries:
         # before we search online, look in our cache, since we might already have this info
         cvc = ComicCacher(self.cache_folder, self.version)
         cached_series_result = cvc.get_series_info(str(series_id), self.id)
@@ -599,42 +882,14 @@ class ComicVineTalker(ComicTalker):
         if cached_series_result is not None:
             return cached_series_result
 
-        series_url = urljoin(self.api_url, f"volume/{CVTypeID.Volume}-{series_id}")  # CV uses volume to mean series
-
-        params = {
-            "api_key": self.api_key,
-            "format": "json",
-        }
-        cv_response: CVResult[CVSeries] = self._get_cv_content(series_url, params)
-
-        series_results = cv_response["results"]
-        formatted_series_results = self._format_search_results([series_results])
-
-        if series_results:
-            cvc.add_series_info(self.id, formatted_series_results[0])
-
-        return formatted_series_results[0]
+        return self._store_series(self._get_cv_content(*self._series_request(series_id)))
 
     def _fetch_issue_data(self, series_id: int, issue_number: str) -> GenericMetadata:
-        issues_list_results = self.fetch_issues_by_series(str(series_id))
-
-        # Loop through issue list to find the required issue info
-        f_record = None
-        for record in issues_list_results:
-            if not IssueString(issue_number).as_string():
-                issue_number = "1"
-            if (
-                IssueString(record.issue_number).as_string().casefold()
-                == IssueString(issue_number).as_string().casefold()
-            ):
-                f_record = record
-                break
+        f_record = self._find_issue(self.fetch_issues_by_series(str(series_id)), issue_number)
 
         if f_record and f_record.complete:
             # Cache had full record
-            return talker_utils.map_comic_issue_to_metadata(
-                f_record, self.name, self.remove_html_tables, self.use_series_start_as_volume
-            )
+            return self._map_issue(f_record)
 
         if f_record is not None:
             return self._fetch_issue_data_by_issue_id(f_record.id)
@@ -642,35 +897,92 @@ class ComicVineTalker(ComicTalker):
 
     def _fetch_issue_data_by_issue_id(self, issue_id: str) -> GenericMetadata:
         # before we search online, look in our cache, since we might already have this info
+        cached_issue = self._get_cached_issue(issue_id)
+        if cached_issue is not None:
+            return self._map_issue(cached_issue)
+
+        cv_response: CVResult[CVIssue] = self._get_cv_content(*self._issue_request(issue_id))
+
+        # Issues don't return the publisher, _format_issue_results fetches the full series.
+        return self._store_issue(self._format_issue_results([cv_response["results"]], True))
+
+    async def _async_format_issue_results(
+        self, issue_results: list[CVIssue], complete: bool = False
+    ) -> list[ComicIssue]:
+        """Fetches the series of every issue concurrently before formatting them"""
+        series_ids = list({str(record["volume"]["id"]) for record in issue_results})
+        series = await asyncio.gather(*(self._async_fetch_series_data(int(series_id)) for series_id in series_ids))
+        return self._format_issue_results(issue_results, complete, dict(zip(series_ids, series)))
+
+    async def _async_fetch_series_data(self, series_id: int) -> ComicSeries:
+        return await self.single_flight.async_do(("series", str(series_id)), self._async_fetch_series, series_id)
+
+    async def _async_fetch_series(self, series_id: int) -> ComicSeries:
         cvc = ComicCacher(self.cache_folder, self.version)
-        cached_issues_result = cvc.get_issue_info(int(issue_id), self.id)
+        cached_series_result = cvc.get_series_info(str(series_id), self.id)
 
-        if cached_issues_result and cached_issues_result.complete:
-            return talker_utils.map_comic_issue_to_metadata(
-                cached_issues_result,
-                self.name,
-                self.remove_html_tables,
-                self.use_series_start_as_volume,
-            )
+        if cached_series_result is not None:
+            return cached_series_result
 
-        issue_url = urljoin(self.api_url, f"issue/{CVTypeID.Issue}-{issue_id}")
-        params = {"api_key": self.api_key, "format": "json"}
-        cv_response: CVResult[CVIssue] = self._get_cv_content(issue_url, params)
+        return self._store_series(await self._async_get_cv_content(*self._series_request(series_id)))
 
-        issue_results = cv_response["results"]
+    async def _async_fetch_issue_data(self, series_id: int, issue_number: str) -> GenericMetadata:
+        f_record = self._find_issue(await self.async_fetch_issues_by_series(str(series_id)), issue_number)
 
-        # Format to expected output
-        cv_issues = self._format_issue_results([issue_results], True)
+        if f_record and f_record.complete:
+            # Cache had full record
+            return self._map_issue(f_record)
 
-        # Due to issue not returning publisher, fetch the series.
-        cv_issues[0].series = self._fetch_series_data(int(cv_issues[0].series.id))
+        if f_record is not None:
+            return await self._async_fetch_issue_data_by_issue_id(f_record.id)
+        return GenericMetadata()
+
+    async def _async_fetch_issue_data_by_issue_id(self, issue_id: str) -> GenericMetadata:
+        cached_issue = self._get_cached_issue(issue_id)
+        if cached_issue is not None:
+            return self._map_issue(cached_issue)
+
+        cv_response: CVResult[CVIssue] = await self._async_get_cv_content(*self._issue_request(issue_id))
 
+        return self._store_issue(await self._async_format_issue_results([cv_response["results"]], True))
+
+    def _store_series(self, cv_response: CVResult[CVSeries]) -> ComicSeries:
+        series_results = cv_response["results"]
+        formatted_series_results = self._format_search_results([series_results])
+
+        if series_results:
+            cvc = ComicCacher(self.cache_folder, self.version)
+            cvc.add_series_info(self.id, formatted_series_results[0])
+
+        return formatted_series_results[0]
+
+    def _get_cached_issue(self, issue_id: str) -> ComicIssue | None:
+        """Returns the cached issue if the cache has the full record"""
+        cvc = ComicCacher(self.cache_folder, self.version)
+        cached_issues_result = cvc.get_issue_info(int(issue_id), self.id)
+
+        if cached_issues_result and cached_issues_result.complete:
+            return cached_issues_result
+        return None
+
+    def _store_issue(self, cv_issues: list[ComicIssue]) -> GenericMetadata:
+        cvc = ComicCacher(self.cache_folder, self.version)
         cvc.add_series_issues_info(self.id, cv_issues)
 
         # Now, map the ComicIssue data to generic metadata
+        return self._map_issue(cv_issues[0])
+
+    def _find_issue(self, issues: list[ComicIssue], issue_number: str) -> ComicIssue | None:
+        # Loop through issue list to find the required issue info
+        if not IssueString(issue_number).as_string():
+            issue_number = "1"
+        issue_number = IssueString(issue_number).as_string().casefold()
+        for record in issues:
+            if IssueString(record.issue_number).as_string().casefold() == issue_number:
+                return record
+        return None
+
+    def _map_issue(self, issue: ComicIssue) -> GenericMetadata:
         return talker_utils.map_comic_issue_to_metadata(
-            cv_issues[0],
-            self.name,
-            self.remove_html_tables,
-            self.use_series_start_as_volume,
+            issue, self.name, self.remove_html_tables, self.use_series_start_as_volume
         )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from typing import Any
 
 import comicapi.genericmetadata
@@ -252,10 +253,48 @@ cv_md = comicapi.genericmetadata.GenericMetadata(
 class MockResponse:
     """Mocks the response object from requests"""
 
-    def __init__(self, result: dict[str, Any], content=None) -> None:
-        self.status_code = 200
+    def __init__(self, result: dict[str, Any], content=None, status_code: int = 200, headers=None) -> None:
+        self.status_code = status_code
         self.result = result
         self.content = content
+        self.headers = headers or {}
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self.result)
 
     def json(self) -> dict[str, list]:
         return self.result
+
+
+class MockAsyncResponse:
+    """Mocks the response object from aiohttp"""
+
+    def __init__(self, response: MockResponse) -> None:
+        self.status = response.status_code
+        self.headers = response.headers
+        self.response = response
+
+    async def text(self) -> str:
+        return self.response.text
+
+    async def __aenter__(self) -> MockAsyncResponse:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class MockClientSession:
+    """Mocks aiohttp.ClientSession, requests are answered by get"""
+
+    def __init__(self, get, headers=None) -> None:
+        self._get = get
+        self.headers = headers or {}
+        self.closed = False
+
+    def get(self, url: str, params=None, headers=None) -> MockAsyncResponse:
+        return MockAsyncResponse(self._get(url, params=params, headers={**self.headers, **(headers or {})}))
+
+    async def close(self) -> None:
+        self.closed = True
@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import platform
 import shutil
+import struct
+import zipfile
 
 import pytest
 from importlib_metadata import entry_points
 
 import comicapi.archivers.rar
+import comicapi.archivers.zip
+import comicapi.comet
 import comicapi.comicarchive
+import comicapi.comicbookinfo
+import comicapi.comicinfoxml
 import comicapi.genericmetadata
 from testing.filenames import datadir
 
@@ -172,3 +178,219 @@ def test_rename_ro_dest(tmp_comic, tmp_path):
     assert old_path.exists()
     assert tmp_comic.path.exists()
     assert tmp_comic.path == old_path
+
+
+def test_get_archiver_magic(tmp_path, monkeypatch):
+    zip_path = tmp_path / "zip.cbr"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("page.jpg", b"jpg")
+    prepended = tmp_path / "prepended.cbz"
+    prepended.write_bytes(b"data" + zip_path.read_bytes())
+    rar_path = tmp_path / "rar.cbz"
+    rar_path.write_bytes(b"Rar!\x1a\x07\x00")
+
+    assert comicapi.comicarchive.get_archiver(zip_path).name() == "ZIP"
+    assert comicapi.comicarchive.get_archiver(prepended).name() == "ZIP"
+    assert comicapi.comicarchive.get_archiver(tmp_path).name() == "Folder"
+
+    # Only the archiver with matching magic is probed
+    def is_valid(path):
+        raise AssertionError("unexpected probe")
+
+    monkeypatch.setattr(comicapi.archivers.ZipArchiver, "is_valid", is_valid)
+    if comicapi.archivers.rar.rar_support:
+        assert comicapi.comicarchive.get_archiver(rar_path).name() == "RAR"
+
+
+@pytest.mark.xfail(not comicapi.archivers.rar.rar_support, reason="rar support")
+def test_rar_read_files():
+    c = comicapi.comicarchive.ComicArchive(datadir / "fake_cbr.cbr")
+    rarc = c.archiver.get_rar_obj()
+    assert rarc is not None
+    assert c.archiver.get_rar_obj() is rarc
+
+    files = dict(c.archiver.read_files(["page0.jpg", "00.jpg"]))
+    assert files == {"page0.jpg": c.archiver.read_file("page0.jpg"), "00.jpg": c.archiver.read_file("00.jpg")}
+
+
+@pytest.mark.parametrize("archiver", archivers)
+def test_read_files(archiver, tmp_path):
+    source_path = tmp_path / "source.cbz"
+    with zipfile.ZipFile(source_path, "w") as zf:
+        zf.writestr("01.jpg", b"page 1")
+        zf.writestr("02.jpg", b"page 2")
+        zf.writestr("ComicInfo.xml", b"<ComicInfo/>")
+    source = comicapi.comicarchive.ComicArchive(source_path)
+
+    archive = archiver.open(tmp_path / "dest")
+    assert archive.copy_from_archive(source.archiver)
+
+    names = ["02.jpg", "ComicInfo.xml", "01.jpg"]
+    assert list(archive.read_files(names)) == [(name, archive.read_file(name)) for name in names]
+    assert dict(archive.read_files(names)) == dict(source.archiver.read_files(names))
+
+    assert archive.read_file_prefix("ComicInfo.xml", 4) == b"<Com"
+    with archive.open_member("01.jpg") as f:
+        assert f.read() == b"page 1"
+
+
+def test_export_compression(tmp_path):
+    source_path = tmp_path / "source.cbz"
+    with zipfile.ZipFile(source_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("01.jpg", b"page 1" * 100)
+        zf.writestr("ComicInfo.xml", b"<ComicInfo/>")
+    source = comicapi.comicarchive.ComicArchive(source_path)
+
+    archive = comicapi.archivers.ZipArchiver.open(tmp_path / "dest.cbz")
+    assert archive.copy_from_archive(source.archiver)
+
+    with zipfile.ZipFile(archive.path) as zf:
+        assert zf.getinfo("01.jpg").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("ComicInfo.xml").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("01.jpg") == b"page 1" * 100
+
+
+def test_export_member_attributes(tmp_path):
+    source_path = tmp_path / "source.cbz"
+    page = zipfile.ZipInfo("01.jpg")
+    page.create_system = 0
+    page.external_attr = 0o100644 << 16
+    # extended timestamp
+    page.extra = struct.pack("<2HBL", 0x5455, 5, 1, 1_000_000_000)
+    with zipfile.ZipFile(source_path, "w") as zf:
+        zf.writestr(page, b"page 1")
+    source = comicapi.comicarchive.ComicArchive(source_path)
+
+    archive = comicapi.archivers.ZipArchiver.open(tmp_path / "dest.cbz")
+    assert archive.copy_from_archive(source.archiver)
+
+    with zipfile.ZipFile(archive.path) as zf:
+        info = zf.getinfo("01.jpg")
+        assert (info.create_system, info.external_attr, info.extra) == (0, page.external_attr, page.extra)
+        assert zf.read("01.jpg") == b"page 1"
+
+
+def test_zip_write_compression(tmp_path, monkeypatch):
+    archive = comicapi.archivers.ZipArchiver.open(tmp_path / "comic.cbz")
+    with zipfile.ZipFile(archive.path, "w") as zf:
+        zf.writestr("01.jpg", b"page 1")
+
+    assert archive.write_file("new.jpg", b"new page" * 100)
+    assert archive.write_file("notes.txt", b"notes" * 100)
+    with zipfile.ZipFile(archive.path) as zf:
+        assert zf.getinfo("new.jpg").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
+
+    monkeypatch.setattr(comicapi.archivers.zip, "store_images", False)
+    assert archive.remove_file("notes.txt")
+    with zipfile.ZipFile(archive.path) as zf:
+        assert zf.getinfo("new.jpg").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("new.jpg") == b"new page" * 100
+
+
+@pytest.mark.parametrize("prefix", [b"", b"self extracting stub"])
+def test_zip_members(tmp_path, prefix):
+    comic = tmp_path / "comic.cbz"
+    with zipfile.ZipFile(comic, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("folder/", b"")
+        zf.writestr("01.jpg", b"page 1" * 100)
+        zf.writestr("02 – ü.jpg", b"page 2")
+        zf.writestr(zipfile.ZipInfo("03.jpg"), b"page 3")
+        zf.comment = b"comment"
+    comic.write_bytes(prefix + comic.read_bytes())
+
+    archive = comicapi.archivers.ZipArchiver.open(comic)
+    with zipfile.ZipFile(comic) as zf:
+        expected = [(x.filename, x.header_offset, x.compress_type, x.compress_size, x.file_size) for x in zf.infolist()]
+    assert archive.get_members() == expected
+    assert archive.get_filename_list() == ["01.jpg", "02 – ü.jpg", "03.jpg"]
+    assert archive.get_comment() == "comment"
+
+    assert archive.write_zip_comment(comic, "ünïcode comment")
+    assert archive.get_comment() == "ünïcode comment"
+    with zipfile.ZipFile(comic) as zf:
+        assert zf.comment.decode("utf-8") == "ünïcode comment"
+        assert zf.read("01.jpg") == b"page 1" * 100
+
+
+def test_read_metadata_without_pages(tmp_path, monkeypatch):
+    md = comicapi.genericmetadata.md_test.copy()
+    comic_path = tmp_path / "comic.cbz"
+    with zipfile.ZipFile(comic_path, "w") as zf:
+        zf.writestr("01.jpg", b"page 1")
+        zf.writestr("ComicInfo.xml", comicapi.comicinfoxml.ComicInfoXml().string_from_metadata(md))
+        zf.writestr("CoMet.xml", comicapi.comet.CoMet().string_from_metadata(md))
+        zf.comment = comicapi.comicbookinfo.ComicBookInfo().string_from_metadata(md).encode("utf-8")
+
+    comic = comicapi.comicarchive.ComicArchive(comic_path)
+
+    def get_page_name_list(sort_list: bool = True) -> list[str]:
+        raise AssertionError("the pages should not be listed")
+
+    monkeypatch.setattr(comic, "get_page_name_list", get_page_name_list)
+
+    for style in (
+        comicapi.comicarchive.MetaDataStyle.CIX,
+        comicapi.comicarchive.MetaDataStyle.CBI,
+        comicapi.comicarchive.MetaDataStyle.COMET,
+    ):
+        assert comic.read_metadata(style, pages=False).series == md.series
+    assert comic.read_metadata(comicapi.comicarchive.MetaDataStyle.CIX, pages=False).pages == md.pages
+
+
+def test_read_cix_without_pages_reads_directly(tmp_path, monkeypatch):
+    md = comicapi.genericmetadata.md_test.copy()
+    tagged_path = tmp_path / "tagged.cbz"
+    untagged_path = tmp_path / "untagged.cbz"
+    with zipfile.ZipFile(tagged_path, "w") as zf:
+        zf.writestr("01.jpg", b"page 1")
+        zf.writestr("ComicInfo.xml", comicapi.comicinfoxml.ComicInfoXml().string_from_metadata(md))
+    with zipfile.ZipFile(untagged_path, "w") as zf:
+        zf.writestr("01.jpg", b"page 1")
+
+    def get_filename_list() -> list[str]:
+        raise AssertionError("the archive should not be listed")
+
+    tagged = comicapi.comicarchive.ComicArchive(tagged_path)
+    untagged = comicapi.comicarchive.ComicArchive(untagged_path)
+    monkeypatch.setattr(tagged.archiver, "get_filename_list", get_filename_list)
+    monkeypatch.setattr(untagged.archiver, "get_filename_list", get_filename_list)
+
+    assert tagged.read_cix(pages=False).series == md.series
+    assert untagged.read_cix(pages=False).is_empty
+    assert not untagged.has_cix()
+
+
+def test_read_metadata_compacts_pages(tmp_path):
+    md = comicapi.genericmetadata.md_test.copy()
+    comic_path = tmp_path / "comic.cbz"
+    with zipfile.ZipFile(comic_path, "w") as zf:
+        zf.writestr("01.jpg", b"page 1")
+        zf.writestr("ComicInfo.xml", comicapi.comicinfoxml.ComicInfoXml().string_from_metadata(md))
+        zf.writestr("CoMet.xml", comicapi.comet.CoMet().string_from_metadata(md))
+        zf.comment = comicapi.comicbookinfo.ComicBookInfo().string_from_metadata(md).encode("utf-8")
+
+    comic = comicapi.comicarchive.ComicArchive(comic_path)
+    for style in (
+        comicapi.comicarchive.MetaDataStyle.CIX,
+        comicapi.comicarchive.MetaDataStyle.CBI,
+        comicapi.comicarchive.MetaDataStyle.COMET,
+    ):
+        pages = comic.read_metadata(style).pages
+        assert isinstance(pages, comicapi.genericmetadata.PageTable)
+        assert len(pages) == 1
+        assert pages[0]["Image"] == 0
+
+
+def test_metadata_from_filename_cache(tmp_path):
+    comic = comicapi.comicarchive.ComicArchive(tmp_path / "Cached Series 001 (2010).cbz")
+    md = comic.metadata_from_filename(complicated_parser=True)
+    assert md.series == "Cached Series"
+    md.series = "changed"
+
+    info = comicapi.comicarchive._metadata_from_filename.cache_info()
+    again = comic.metadata_from_filename(complicated_parser=True)
+    assert comicapi.comicarchive._metadata_from_filename.cache_info().hits == info.hits + 1
+    assert again.series == "Cached Series"
+    assert again.issue == "1"
+    assert comic.metadata_from_filename().series == "Cached Series"
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import dataclasses
+import datetime
+import sqlite3
+
 import pytest
 
 import comictalker.comiccacher
@@ -17,9 +21,70 @@ def test_search_results(comic_cache):
     assert search_results == comic_cache.get_search_results("test", "test search")
 
 
+def test_search_results_ttl(comic_cache):
+    comic_cache.add_search_results("test", "test search", search_results)
+
+    comictalker.comiccacher.cache_stats.clear()
+    assert comic_cache.get_search_results("test", "test search") == search_results
+    comic_cache.policy = comictalker.comiccacher.CachePolicy(search_ttl=datetime.timedelta(0))
+    assert comic_cache.get_search_results("test", "test search") == []
+    assert comictalker.comiccacher.cache_stats.hit_ratio("search") == 0.5
+
+
 @pytest.mark.parametrize("series_info", search_results)
 def test_series_info(comic_cache, series_info):
     comic_cache.add_series_info(series_record=series_info, source_name="test")
     vi = series_info.copy()
     cache_result = comic_cache.get_series_info(series_id=series_info.id, source_name="test")
     assert vi == cache_result
+
+
+def test_response(comic_cache):
+    response = comictalker.comiccacher.CachedResponse("https://example.com/api/issue?format=json", "{}", '"etag"')
+    comic_cache.add_response("test", response)
+    assert comic_cache.get_response("test", response.key) == response
+    assert comic_cache.get_response("test", "https://example.com/api/other") is None
+
+
+def test_response_table_added(tmp_path, mock_version):
+    comictalker.comiccacher.ComicCacher(tmp_path, mock_version[0])
+    # A cache from before responses were cached
+    with sqlite3.connect(tmp_path / "comic_cache.db") as con:
+        con.execute("DROP TABLE Responses")
+    con.close()
+
+    cache = comictalker.comiccacher.ComicCacher(tmp_path, mock_version[0])
+    response = comictalker.comiccacher.CachedResponse("https://example.com/api/issue?format=json", "{}")
+    cache.add_response("test", response)
+    assert cache.get_response("test", response.key) == response
+
+
+def test_response_purge(comic_cache):
+    old = comictalker.comiccacher.CachedResponse(
+        "https://example.com/api/issue/1?format=json",
+        "{}",
+        timestamp=datetime.datetime.now() - comic_cache.policy.max_ttl - datetime.timedelta(days=1),
+    )
+    comic_cache.add_response("test", old)
+    assert comic_cache.get_response("test", old.key) == old
+
+    comic_cache.add_response("test", comictalker.comiccacher.CachedResponse("https://example.com/api/issue/2", "{}"))
+    assert comic_cache.get_response("test", old.key) is None
+
+
+def test_cache_policy(comic_cache):
+    comic_cache.policy = comictalker.comiccacher.CachePolicy(
+        series_ttl=datetime.timedelta(0), old_series_ttl=datetime.timedelta(days=1), old_series_age=5
+    )
+    this_year = datetime.date.today().year
+    old_series = dataclasses.replace(search_results[0], start_year=this_year - 10)
+    new_series = dataclasses.replace(search_results[1], start_year=this_year)
+    comic_cache.add_series_info("test", old_series)
+    comic_cache.add_series_info("test", new_series)
+
+    comictalker.comiccacher.cache_stats.clear()
+    assert comic_cache.get_series_info(old_series.id, "test") == old_series
+    assert comic_cache.get_series_info(new_series.id, "test") is None
+    assert comictalker.comiccacher.cache_stats.hit_ratio("series") == 0.5
+    # The TTL applies even when nothing is purged
+    assert comic_cache.get_series_info(new_series.id, "test", purge=False) is None
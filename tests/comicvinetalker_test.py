@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import dataclasses
+import datetime
+import json
+import threading
+import time
+import unittest.mock
 
 import pytest
+import requests
 
 import comicapi.genericmetadata
+import comictalker.comiccacher
+import comictalker.talker_utils
+import comictalker.talkers.comicvine
 import testing.comicvine
 
 
@@ -16,6 +27,30 @@ def test_search_for_series(comicvine_api, comic_cache):
     assert results == cache_issues
 
 
+def test_search_for_series_callback(comicvine_api, tmp_path):
+    comicvine_api.cache_folder = tmp_path
+    comicvine_api.limiter = comictalker.talkers.comicvine.custom_limiter
+    series_name = "cory doctorows futuristic tales of the here and now"
+    release = threading.Event()
+
+    def search(*args):
+        release.wait(5)
+        return []
+
+    # An identical search without a callback is already in flight
+    key = ("search", series_name, False, False, 90)
+    with concurrent.futures.ThreadPoolExecutor(1) as pool:
+        in_flight = pool.submit(comicvine_api.single_flight.do, key, search)
+        time.sleep(0.1)
+        callback = unittest.mock.Mock()
+        results = comicvine_api.search_for_series(series_name, callback=callback)
+        release.set()
+        assert in_flight.result() == []
+
+    assert results
+    callback.assert_called()
+
+
 def test_fetch_series_data(comicvine_api, comic_cache):
     result = comicvine_api._fetch_series_data(23437)
     # del result["description"]
@@ -59,3 +94,99 @@ def test_fetch_issue_data(comicvine_api, series_id, issue_number, expected):
     results = comicvine_api._fetch_issue_data(series_id, issue_number)
     results.notes = None
     assert results == expected
+
+
+def test_async_fetch_issue_data_by_issue_id(comicvine_api):
+    result = asyncio.run(comicvine_api.async_fetch_comic_data(140529))
+    result.notes = None
+    assert result == testing.comicvine.cv_md
+
+
+def test_async_search_for_series(comicvine_api, comic_cache):
+    results = asyncio.run(
+        comicvine_api.async_search_for_series("cory doctorows futuristic tales of the here and now", literal=True)
+    )
+    assert results == comic_cache.get_search_results(
+        comicvine_api.id, "cory doctorows futuristic tales of the here and now"
+    )
+
+
+def test_async_fetch_issues_by_series_issue_num_and_year(comicvine_api):
+    results = asyncio.run(comicvine_api.async_fetch_issues_by_series_issue_num_and_year([23437], "1", None))
+    assert results == [testing.comicvine.comic_issue_result]
+
+
+def test_response_cache(comicvine_api, tmp_path):
+    comicvine_api.cache_folder = tmp_path
+    comicvine_api.limiter = comictalker.talkers.comicvine.custom_limiter
+    url, params = comicvine_api._series_request(23437)
+    comicvine_api._get_cv_content(url, params)
+    requests.get.assert_called_once()
+    requests.get.reset_mock()
+
+    # Nothing but the raw response is cached and it is still fresh
+    result = comicvine_api._get_cv_content(url, params)
+    assert result["results"]["id"] == 23437
+    requests.get.assert_not_called()
+
+
+def test_response_cache_revalidate(comicvine_api, comic_cache, monkeypatch):
+    monkeypatch.setattr(
+        comictalker.comiccacher, "default_policy", comictalker.comiccacher.CachePolicy(series_ttl=datetime.timedelta())
+    )
+    url = "https://comicvine.gamespot.com/api/volume/4050-23437"
+    params = {"api_key": comicvine_api.api_key, "format": "json"}
+    comic_cache.add_response(
+        comicvine_api.id,
+        comictalker.comiccacher.CachedResponse(
+            comictalker.talker_utils.response_cache_key(url, params),
+            json.dumps(testing.comicvine.cv_volume_result),
+            etag='"1"',
+        ),
+    )
+    m_get = unittest.mock.Mock(return_value=testing.comicvine.MockResponse({}, status_code=304))
+    monkeypatch.setattr(requests, "get", m_get)
+
+    assert comicvine_api._get_cv_content(url, params) == testing.comicvine.cv_volume_result
+    assert m_get.call_args.kwargs["headers"]["If-None-Match"] == '"1"'
+
+
+def test_async_native_session(comicvine_api, monkeypatch, tmp_path):
+    aiohttp = pytest.importorskip("aiohttp")
+    # The shared cache may already have the issue
+    comicvine_api.cache_folder = tmp_path
+    comicvine_api.limiter = comictalker.talkers.comicvine.custom_limiter
+    sessions = []
+
+    def client_session(headers=None):
+        sessions.append(testing.comicvine.MockClientSession(requests.get, headers))
+        return sessions[-1]
+
+    monkeypatch.setattr(comictalker.talkers.comicvine, "async_support", True)
+    monkeypatch.setattr(aiohttp, "ClientSession", client_session)
+
+    async def fetch():
+        result = await comicvine_api.async_fetch_comic_data(140529)
+        await comicvine_api.async_close()
+        return result
+
+    result = asyncio.run(fetch())
+    result.notes = None
+    assert result == testing.comicvine.cv_md
+    # The issue and its series are fetched with one session that is closed with the talker
+    assert requests.get.call_count == 2
+    assert len(sessions) == 1
+    assert sessions[0].closed
+
+
+def test_retry_server_error(comicvine_api, monkeypatch, tmp_path):
+    comicvine_api.cache_folder = tmp_path
+    comicvine_api.limiter = comictalker.talkers.comicvine.custom_limiter
+    monkeypatch.setattr(comictalker.talkers.comicvine.time, "sleep", lambda seconds: None)
+    responses = iter([testing.comicvine.MockResponse({}, status_code=500)])
+    get = requests.get.side_effect
+    requests.get.side_effect = lambda *args, **kwargs: next(responses, None) or get(*args, **kwargs)
+
+    result = comicvine_api._fetch_series(23437)
+    assert result.id == "23437"
+    assert requests.get.call_count == 2
@@ -71,7 +71,9 @@ def comicvine_api(monkeypatch, cbz, comic_cache, mock_version, config) -> comict
                 comicvine.filter_field_list(cv_result["results"], kwargs)
                 return comicvine.MockResponse(cv_result)
             if args[0].startswith("https://comicvine.gamespot.com/api/issue/4000-140529"):
-                return comicvine.MockResponse(comicvine.cv_issue_result)
+                cv_result = copy.deepcopy(comicvine.cv_issue_result)
+                comicvine.filter_field_list(cv_result["results"], kwargs)
+                return comicvine.MockResponse(cv_result)
             if (
                 args[0].startswith("https://comicvine.gamespot.com/api/issues/")
                 and "params" in kwargs
@@ -110,6 +112,8 @@ def comicvine_api(monkeypatch, cbz, comic_cache, mock_version, config) -> comict
 
     # apply the monkeypatch for requests.get to mock_get
     monkeypatch.setattr(requests, "get", m_get)
+    # the async api falls back to requests.get in a thread
+    monkeypatch.setattr(comictalker.talkers.comicvine, "async_support", False)
 
     cv = comictalker.talkers.comicvine.ComicVineTalker(
         version=mock_version[0],
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+
+import comicapi.filenamelexer
+
+lexed = [
+    (
+        "Anda's Game vol.1 v2 (2007)",
+        [
+            ("Text", 0, "Anda's"),
+            ("Space", 6, " "),
+            ("Text", 7, "Game"),
+            ("Space", 11, " "),
+            ("InfoSpecifier", 12, "vol."),
+            ("Number", 16, "1"),
+            ("Space", 17, " "),
+            ("InfoSpecifier", 18, "v"),
+            ("Number", 19, "2"),
+            ("Space", 20, " "),
+            ("LeftParen", 21, "("),
+            ("Number", 22, "2007"),
+            ("RightParen", 26, ")"),
+            ("EOF", 27, ""),
+        ],
+    ),
+    (
+        "#1.5 '99 80th .5 c2c",
+        [
+            ("IssueNumber", 0, "#1.5"),
+            ("Space", 4, " "),
+            ("Number", 5, "'99"),
+            ("Space", 8, " "),
+            ("Text", 9, "80th"),
+            ("Space", 13, " "),
+            ("Number", 14, ".5"),
+            ("Space", 16, " "),
+            ("C2C", 17, "c2c"),
+            ("EOF", 20, ""),
+        ],
+    ),
+    (
+        "a__b--c -|: ½",
+        [
+            ("Text", 0, "a"),
+            ("Skip", 1, "__"),
+            ("Text", 3, "b"),
+            ("Skip", 4, "--"),
+            ("Text", 6, "c"),
+            ("Space", 7, " "),
+            ("Operator", 8, "-|:"),
+            ("Space", 11, " "),
+            ("Text", 12, "½"),
+            ("EOF", 13, ""),
+        ],
+    ),
+    ("(unclosed", [("LeftParen", 0, "("), ("Text", 1, "unclosed"), ("Error", 9, "unclosed left paren")]),
+    ("a)b", [("Text", 0, "a"), ("RightParen", 1, ")"), ("Error", 2, "unexpected right paren )")]),
+    ("a\0b", [("Text", 0, "a"), ("EOF", 1, "\0")]),
+]
+
+
+@pytest.mark.parametrize("filename, expected", lexed)
+def test_lex(filename, expected):
+    items = comicapi.filenamelexer.Lex(filename).items
+    assert [(item.typ.name, item.pos, item.val) for item in items] == expected
@@ -3,7 +3,7 @@ from __future__ import annotations
 import pytest
 
 import comicapi.filenameparser
-from testing.filenames import fnames
+from testing.filenames import fnames, names
 
 
 @pytest.mark.parametrize("filename, reason, expected, xfail", fnames)
@@ -47,3 +47,14 @@ def test_file_name_parser(filename, reason, expected, xfail):
     if xfail and fp != expected:
         pytest.xfail("old parser")
     assert fp == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_filenames(workers):
+    filenames = [name[0] for name in names]
+    expected = [
+        comicapi.filenameparser.Parse(comicapi.filenamelexer.Lex(filename).items, remove_c2c=True).filename_info
+        for filename in filenames
+    ]
+    results = comicapi.filenameparser.parse_filenames(iter(filenames), workers=workers, chunk_size=7, remove_c2c=True)
+    assert list(results) == expected
@@ -40,3 +40,57 @@ def test_add_credit_primary():
 @pytest.mark.parametrize("md, role, expected", credits)
 def test_get_primary_credit(md, role, expected):
     assert md.get_primary_credit(role) == expected
+
+
+def test_copy():
+    md = comicapi.genericmetadata.md_test.copy()
+    assert md == comicapi.genericmetadata.md_test
+
+    md.credits[0]["person"] = "changed"
+    md.tags.add("changed")
+    md.pages[0]["Type"] = "changed"
+    md.series = "changed"
+    assert md.credits[0] != comicapi.genericmetadata.md_test.credits[0]
+    assert "changed" not in comicapi.genericmetadata.md_test.tags
+    assert comicapi.genericmetadata.md_test.pages[0]["Type"] != "changed"
+    assert comicapi.genericmetadata.md_test.series != "changed"
+
+
+def test_overlay_credits():
+    md = comicapi.genericmetadata.GenericMetadata()
+    md.add_credit(person="test", role="writer", primary=False)
+    md.add_credit(person="other", role="artist", primary=False)
+
+    md.overlay_credits(
+        [
+            comicapi.genericmetadata.CreditMetadata(person="TEST", role="Writer", primary=True),
+            comicapi.genericmetadata.CreditMetadata(person="", role="artist", primary=False),
+            comicapi.genericmetadata.CreditMetadata(person="new", role="artist", primary=False),
+            comicapi.genericmetadata.CreditMetadata(person="new", role="Artist", primary=True),
+        ]
+    )
+    assert md.credits == [
+        comicapi.genericmetadata.CreditMetadata(person="test", role="writer", primary=True),
+        comicapi.genericmetadata.CreditMetadata(person="new", role="artist", primary=True),
+    ]
+
+
+def test_compact_pages():
+    md = comicapi.genericmetadata.md_test.copy()
+    md.pages[1]["Bookmark"] = "bookmark"
+    md.pages[2]["ImageSize"] = "not a number"
+    expected = [dict(p) for p in md.pages]
+
+    md.compact_pages()
+    assert isinstance(md.pages, comicapi.genericmetadata.PageTable)
+    assert md.pages == expected
+    assert md.copy() == md
+
+    md.pages[0]["Type"] = comicapi.genericmetadata.PageType.BackCover
+    del md.pages[1]["Bookmark"]
+    md.pages.append(comicapi.genericmetadata.ImageMetadata(Image=99, DoublePage=True))
+    expected[0]["Type"] = comicapi.genericmetadata.PageType.BackCover
+    del expected[1]["Bookmark"]
+    expected.append({"Image": 99, "DoublePage": True})
+    assert md.pages.to_list() == expected
+    assert md.get_cover_page_index_list() == [0]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from PIL import Image
+
+from comicapi.imagesize import image_size
+
+formats = [
+    ("JPEG", {}),
+    ("JPEG", {"progressive": True}),
+    ("PNG", {}),
+    ("GIF", {}),
+    ("WEBP", {}),
+    ("WEBP", {"lossless": True}),
+]
+
+
+@pytest.mark.parametrize("size", [(1, 1), (123, 457), (1600, 2400)])
+@pytest.mark.parametrize("image_format, options", formats)
+def test_image_size(image_format, options, size):
+    data = io.BytesIO()
+    Image.new("RGB", size).save(data, image_format, **options)
+    assert image_size(data.getvalue()) == size
+
+
+def test_image_size_partial():
+    data = io.BytesIO()
+    Image.new("RGB", (300, 200)).save(data, "JPEG")
+    assert image_size(data.getvalue()[:20]) is None
+    assert image_size(b"not an image") is None
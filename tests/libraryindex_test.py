@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import zipfile
+
+import comicapi.comicarchive
+import comicapi.genericmetadata
+import comicapi.libraryindex
+
+
+def test_library_index(tmp_path):
+    comic = tmp_path / "comic.cbz"
+    with zipfile.ZipFile(comic, "w") as zf:
+        zf.writestr("page2.jpg", b"jpg")
+        zf.writestr("page1.jpg", b"jpg")
+        zf.writestr("ComicInfo.xml", "<ComicInfo><Series>Test</Series></ComicInfo>")
+
+    index = comicapi.libraryindex.LibraryIndex(tmp_path / "index.db")
+    ca = comicapi.comicarchive.ComicArchive(comic, index=index)
+    assert ca.read_cix().series == "Test"
+    ca.update_index()
+
+    # The unchanged archive is not read again
+    ca = comicapi.comicarchive.ComicArchive(comic, index=index)
+    ca.archiver.read_file = None
+    ca.archiver.get_filename_list = None
+    assert ca.get_page_name_list() == ["page1.jpg", "page2.jpg"]
+    assert ca.has_cix()
+    assert ca.read_cix().series == "Test"
+
+    with zipfile.ZipFile(comic, "a") as zf:
+        zf.writestr("page3.jpg", b"jpg")
+    assert index.get(comic) is None
+
+
+def test_library_index_page_sizes(tmp_path):
+    comic = tmp_path / "comic.cbz"
+    with zipfile.ZipFile(comic, "w") as zf:
+        # PNG header for a 2x3 image
+        zf.writestr("page1.png", b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x02\x00\x00\x00\x03")
+
+    index = comicapi.libraryindex.LibraryIndex(tmp_path / "index.db")
+    ca = comicapi.comicarchive.ComicArchive(comic, index=index)
+    assert ca.get_page_sizes(["page1.png"]) == {"page1.png": (24, 2, 3)}
+    ca.update_index()
+
+    ca = comicapi.comicarchive.ComicArchive(comic, index=index)
+    ca._probe_zip_page_sizes = None
+    md = comicapi.genericmetadata.GenericMetadata()
+    md.set_default_page_list(1)
+    ca.apply_archive_info_to_metadata(md, calc_page_sizes=True)
+    assert md.pages[0]["ImageSize"] == "24"
+    assert md.pages[0]["ImageWidth"] == "2"
+    assert md.pages[0]["ImageHeight"] == "3"
+
+
+def test_library_index_sorted_page_list(tmp_path):
+    comic = tmp_path / "comic.cbz"
+    with zipfile.ZipFile(comic, "w") as zf:
+        zf.writestr("page10.jpg", b"jpg")
+        zf.writestr("page2.jpg", b"jpg")
+        zf.writestr(".hidden.jpg", b"jpg")
+
+    index = comicapi.libraryindex.LibraryIndex(tmp_path / "index.db")
+    ca = comicapi.comicarchive.ComicArchive(comic, index=index)
+    assert ca.get_page_name_list(sort_list=False) == ["page10.jpg", "page2.jpg"]
+    assert ca.get_page_name_list() == ["page2.jpg", "page10.jpg"]
+    ca.update_index()
+
+    ca = comicapi.comicarchive.ComicArchive(comic, index=index)
+    ca.archiver.get_filename_list = None
+    assert ca.get_page_name_list() == ["page2.jpg", "page10.jpg"]
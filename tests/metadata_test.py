@@ -62,3 +62,34 @@ def test_comet():
         issue_count=None,
     )
     assert md == md_test
+
+
+def test_cix_read():
+    CIX = comicapi.comicinfoxml.ComicInfoXml()
+    xml = b"""<?xml version="1.0"?>
+<ComicInfo>
+  <Series>first</Series>
+  <Unknown>kept</Unknown>
+  <Series>second</Series>
+  <Writer>a, b</Writer>
+  <CoverArtist>c</CoverArtist>
+  <BlackAndWhite>Yes</BlackAndWhite>
+  <Count>12</Count>
+  <Pages><Page Image="0" Type="FrontCover" DoublePage="True"/><Page Image="1"/></Pages>
+</ComicInfo>"""
+    md = CIX.metadata_from_string(xml)
+    assert md.series == "first"
+    assert md.issue_count == 12
+    assert md.black_and_white is True
+    assert md.credits == [
+        comicapi.genericmetadata.CreditMetadata(person="a", role="Writer", primary=False),
+        comicapi.genericmetadata.CreditMetadata(person="b", role="Writer", primary=False),
+        comicapi.genericmetadata.CreditMetadata(person="c", role="Cover", primary=False),
+    ]
+    assert md.pages == [{"Image": 0, "Type": "FrontCover", "DoublePage": True}, {"Image": 1}]
+
+    md.add_credit("d", "artist")
+    string = CIX.string_from_metadata(md, xml=xml)
+    assert "<Unknown>kept</Unknown>" in string
+    assert "<Penciller>d</Penciller>" in string
+    assert "<Inker>d</Inker>" in string
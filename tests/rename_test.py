@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import copy
 import pathlib
 
 import pytest
 
+import comicapi.genericmetadata
 from comicapi.genericmetadata import md_test
 from comictaggerlib import filerenamer
 from testing.filenames import rfnames, rnames
@@ -21,3 +23,27 @@ def test_rename(template, platform, move, expected, exception):
 @pytest.mark.parametrize("inp, result", rfnames)
 def test_get_rename_dir(inp, result, cbz):
     assert result(cbz) == filerenamer.get_rename_dir(cbz, inp)
+
+
+def test_rename_reuse():
+    md = copy.copy(md_test)
+    md.issue = "2"
+    md.credits = [
+        *md_test.credits,
+        comicapi.genericmetadata.CreditMetadata(person="Other", role="Writer", primary=True),
+    ]
+
+    fr = filerenamer.FileRenamer(md_test, platform="universal")
+    fr.set_template("{series} #{issue} - {writer} ({year})")
+    assert (
+        fr.determine_name(".cbz")
+        == "Cory Doctorow's Futuristic Tales of the Here and Now #001 - Dara Naraghi (2007).cbz"
+    )
+
+    fr.set_metadata(md)
+    assert fr.determine_name(".cbz") == "Cory Doctorow's Futuristic Tales of the Here and Now #002 - Other (2007).cbz"
+    # The metadata is not modified
+    assert md.issue == "2"
+
+    fr.set_template("{series} #{issue}")
+    assert fr.determine_name(".cbz") == "Cory Doctorow's Futuristic Tales of the Here and Now #002.cbz"
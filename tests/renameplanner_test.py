@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+
+import comicapi.libraryindex
+from comictaggerlib.renameplanner import RenamePlan
+
+
+def make_files(tmp_path, names):
+    for name in names:
+        (tmp_path / name).write_text(name, encoding="utf-8")
+
+
+def test_rename_plan_collisions(tmp_path):
+    make_files(tmp_path, ["a.cbz", "b.cbz", "taken.cbz"])
+
+    plan = RenamePlan()
+    plan.add(tmp_path / "a.cbz", tmp_path / "new" / "same.cbz", "new/same.cbz")
+    plan.add(tmp_path / "b.cbz", tmp_path / "new" / "same.cbz", "new/same.cbz")
+    plan.add(tmp_path / "taken.cbz", tmp_path / "taken.cbz")
+    plan.plan()
+
+    assert [op.target.name for op in plan.operations] == ["same.cbz", "same (1).cbz"]
+    assert [op.label for op in plan.operations] == ["new/same.cbz", os.path.join("new", "same (1).cbz")]
+    assert json.loads(plan.as_json())[1]["target"] == str(tmp_path / "new" / "same (1).cbz")
+
+    assert plan.execute()
+    assert (tmp_path / "new" / "same.cbz").read_text(encoding="utf-8") == "a.cbz"
+    assert (tmp_path / "new" / "same (1).cbz").read_text(encoding="utf-8") == "b.cbz"
+
+
+def test_rename_plan_existing_file(tmp_path):
+    make_files(tmp_path, ["a.cbz", "existing.cbz"])
+
+    plan = RenamePlan()
+    plan.add(tmp_path / "a.cbz", tmp_path / "existing.cbz")
+    plan.plan()
+    assert plan.operations[0].target == tmp_path / "existing (1).cbz"
+
+
+def test_rename_plan_cycle(tmp_path):
+    make_files(tmp_path, ["a.cbz", "b.cbz", "c.cbz"])
+    index = comicapi.libraryindex.LibraryIndex(tmp_path / "index.db")
+    entry = comicapi.libraryindex.IndexEntry(comicapi.libraryindex.Fingerprint.of(tmp_path / "a.cbz"))
+    index.add(tmp_path / "a.cbz", entry)
+
+    plan = RenamePlan()
+    # a and b swap, c takes the name a had
+    plan.add(tmp_path / "a.cbz", tmp_path / "b.cbz")
+    plan.add(tmp_path / "b.cbz", tmp_path / "a.cbz")
+    plan.add(tmp_path / "c.cbz", tmp_path / "d.cbz")
+    plan.plan()
+    assert [op.target.name for op in plan.operations] == ["b.cbz", "a.cbz", "d.cbz"]
+
+    assert plan.execute(index=index)
+    assert (tmp_path / "b.cbz").read_text(encoding="utf-8") == "a.cbz"
+    assert (tmp_path / "a.cbz").read_text(encoding="utf-8") == "b.cbz"
+    assert (tmp_path / "d.cbz").read_text(encoding="utf-8") == "c.cbz"
+    assert sorted(os.listdir(tmp_path)) == ["a.cbz", "b.cbz", "d.cbz", "index.db"]
+    assert index.get(tmp_path / "b.cbz") is not None
+
+
+def test_rename_plan_rollback(tmp_path):
+    make_files(tmp_path, ["a.cbz", "b.cbz"])
+
+    plan = RenamePlan()
+    plan.add(tmp_path / "a.cbz", tmp_path / "b.cbz")
+    plan.add(tmp_path / "b.cbz", tmp_path / "c.cbz")
+    plan.plan()
+
+    # The file disappears between planning and renaming
+    (tmp_path / "b.cbz").unlink()
+    assert not plan.execute()
+    assert sorted(os.listdir(tmp_path)) == ["a.cbz"]
+    assert (tmp_path / "a.cbz").read_text(encoding="utf-8") == "a.cbz"
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import comictalker.talker_utils
+
+
+def test_single_flight_threads():
+    single_flight = comictalker.talker_utils.SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch(value: int) -> list[int]:
+        calls.append(value)
+        release.wait(5)
+        return [value]
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(single_flight.do, "key", fetch, 1) for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == [[1]] * 4
+    assert calls == [1]
+    # Every caller gets its own list
+    assert len({id(r) for r in results}) == 4
+    # Nothing is left in flight, the next call runs again
+    assert single_flight.do("key", fetch, 2) == [2]
+
+
+def test_single_flight_async():
+    single_flight = comictalker.talker_utils.SingleFlight()
+    calls = []
+
+    async def fetch(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def run() -> list[int]:
+        return await asyncio.gather(
+            single_flight.async_do("a", fetch, 1),
+            single_flight.async_do("a", fetch, 1),
+            single_flight.async_do("b", fetch, 2),
+        )
+
+    assert asyncio.run(run()) == [1, 1, 2]
+    assert calls == [1, 2]
+
+
+def test_single_flight_async_exception():
+    single_flight = comictalker.talker_utils.SingleFlight()
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def run() -> list[BaseException | None]:
+        return await asyncio.gather(
+            single_flight.async_do("a", fail), single_flight.async_do("a", fail), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    with pytest.raises(ValueError):
+        asyncio.run(single_flight.async_do("a", fail))
+
+
+def test_single_flight_async_copies():
+    single_flight = comictalker.talker_utils.SingleFlight()
+
+    async def fetch() -> list[int]:
+        await asyncio.sleep(0.01)
+        return [1]
+
+    async def run() -> list[list[int]]:
+        return await asyncio.gather(*(single_flight.async_do("a", fetch) for _ in range(3)))
+
+    results = asyncio.run(run())
+    results[0].append(2)
+    assert results == [[1, 2], [1], [1]]
+
+
+def test_single_flight_async_leader_cancelled():
+    single_flight = comictalker.talker_utils.SingleFlight()
+    calls = []
+
+    async def fetch(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+    async def run() -> int:
+        leader = asyncio.create_task(single_flight.async_do("a", fetch, 1))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.async_do("a", fetch, 1))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    # The follower makes the call itself instead of being cancelled with the leader
+    assert asyncio.run(run()) == 1
+    assert calls == [1, 1]
+
+
+def test_request_key():
+    assert comictalker.talker_utils.request_key("url", {"b": 1, "a": "2"}) == comictalker.talker_utils.request_key(
+        "url", {"a": "2", "b": "1"}
+    )
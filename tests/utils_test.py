@@ -6,6 +6,7 @@ import pytest
 
 import comicapi.utils
 import comictalker.talker_utils
+from comicapi.comicarchive import is_comic_candidate
 
 
 def test_os_sorted():
@@ -77,6 +78,22 @@ def test_recursive_list_with_file(tmp_path) -> None:
     assert result == expected_result
 
 
+def test_iter_recursive_filelist(tmp_path):
+    (tmp_path / "skip").mkdir()
+    (tmp_path / "skip" / "a.cbz").write_text("not a zip")
+    (tmp_path / "keep").mkdir()
+    (tmp_path / "keep" / "b.cbz").write_text("not a zip")
+    (tmp_path / "keep" / "c.cbr").write_text("not a rar")
+    (tmp_path / "keep" / "info.txt").write_text("this is here")
+    (tmp_path / "keep" / "no_extension").write_bytes(b"PK\x03\x04")
+
+    result = set(comicapi.utils.iter_recursive_filelist([tmp_path], exclude=["skip"], file_filter=is_comic_candidate))
+    assert result == {str(tmp_path / "keep" / x) for x in ("b.cbz", "c.cbr", "no_extension")}
+
+    result = set(comicapi.utils.iter_recursive_filelist([tmp_path], include=["*.cbz"]))
+    assert result == {str(tmp_path / "skip" / "a.cbz"), str(tmp_path / "keep" / "b.cbz")}
+
+
 xlate_values = [
     ("", None),
     (None, None),
@@ -159,6 +176,7 @@ def test_unique_file(tmp_path):
 
     file.mkdir()
     assert (tmp_path / "test (1).cbz") == comicapi.utils.unique_file(file)
+    assert (tmp_path / "test (2).cbz") == comicapi.utils.unique_file(file, {tmp_path / "test (1).cbz"})
 
 
 def test_add_to_path(monkeypatch):